@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.system_stats import run_system_cache_warmer
+
+class Command(BaseCommand):
+    help = "Keeps the public system stats and highlights cached until it is stopped. One warmer is enough for all backend processes."
+
+    def handle(self, *args, **kwargs):
+        if settings.SYSTEM_CACHE_TTL <= 0:
+            self.stdout.write(
+                self.style.NOTICE('The system stats cache is disabled (SYSTEM_CACHE_TTL), nothing to warm.')
+            )
+            return
+        self.stdout.write(
+            self.style.NOTICE('Starting the system stats cache warmer...')
+        )
+        run_system_cache_warmer()
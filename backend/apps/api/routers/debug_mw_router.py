@@ -329,7 +329,11 @@ def post_answer_group_test(request, study_id: int, codebook_id: int, row_id: int
     
     Studie = studie_ontology_node.node_class
     
-    current_study = Studie.nodes.first_or_none(hat_studieninformationen__hat_studienid__current_data__value = str(study_id))[0]
+    # StudienID stores its value inline, see knowledge.models.InlineData
+    studies = graph_functions.find_nodes_by_leaf_value(Studie, [("hat_studieninformationen", "Studieninformationen"), ("hat_studienid", "StudienID")], str(study_id))
+    if not studies:
+        raise HttpError(404, f"Knowledge node 'Studie' for study with id {study_id} not found")
+    current_study = studies[0]
     
     # get graph id of the study 
     graph_id = current_study.graph_id
@@ -387,7 +391,7 @@ def post_add_study_data_test(request, id: int, data: list[schema.StudyDataSubmis
 
     StudienID = studien_id_ontology_node.node_class
     
-    if not StudienID.nodes.first_or_none(current_data__value = str(id)):
+    if not graph_functions.find_nodes_by_leaf_value(StudienID, [], str(id)):
         raise HttpError(404, f"Knowledge node 'StudienID' with data node value {id} not found")
     
     graph_functions.add_study_data_to_knowledge_graph(study_id = id , data = data)
@@ -1,10 +1,12 @@
 from api.transactions import TransactionRouter
 
 from django.conf import settings
+from django.db import transaction as django_transaction
 from neomodel import db
 from ninja.errors import HttpError
 
 from knowledge import example_data
+from knowledge.batch import UnitOfWork
 from knowledge.graph_functions import set_is_verified_for_subgraph
 from knowledge.models import DataNode, load_all_knowledge_node_classes
 from ontology.models import OntologyNode
@@ -42,25 +44,27 @@ def post_knowledge_primitive(request):
     LeafNode1 = leaf_node_1.node_class
     LeafNode2 = leaf_node_2.node_class
 
-    patient = Patient.create({
+    uow = UnitOfWork()
+
+    patient = uow.create(Patient, {
         "stakeholder_id": str(uuid4())
-    })[0]
-    lab_result = LabResult.create({})[0]
-    leaf_0 = LeafNode0.create({})[0]
-    leaf_1 = LeafNode1.create({})[0]
-    leaf_2 = LeafNode2.create({})[0]
+    })
+    lab_result = uow.create(LabResult, {})
+    leaf_0 = uow.create(LeafNode0, {})
+    leaf_1 = uow.create(LeafNode1, {})
+    leaf_2 = uow.create(LeafNode2, {})
 
-    data_nodes = [{"value": str(i)} for i in range(3)]
-    data_nodes = DataNode.create(*data_nodes)
+    data_nodes = [uow.create(DataNode, {"value": str(i)}) for i in range(3)]
 
-    patient.has_labresult.connect(lab_result)
-    lab_result.contains_leafnode0.connect(leaf_0)
-    lab_result.contains_leafnode1.connect(leaf_1)
-    lab_result.contains_leafnode2.connect(leaf_2)
+    uow.connect(patient, "has_labresult", lab_result)
+    uow.connect(lab_result, "contains_leafnode0", leaf_0)
+    uow.connect(lab_result, "contains_leafnode1", leaf_1)
+    uow.connect(lab_result, "contains_leafnode2", leaf_2)
 
-    leaf_0.current_data.connect(data_nodes[0])
-    leaf_1.current_data.connect(data_nodes[1])
-    leaf_2.current_data.connect(data_nodes[2])
+    uow.connect(leaf_0, "current_data", data_nodes[0])
+    uow.connect(leaf_1, "current_data", data_nodes[1])
+    uow.connect(leaf_2, "current_data", data_nodes[2])
+    uow.commit()
 
     return 204, None
 
@@ -114,25 +118,27 @@ def post_knowledge(request):
     LeafNode1 = leaf_node_1.node_class
     LeafNode2 = leaf_node_2.node_class
 
-    patient = Patient.create({
+    uow = UnitOfWork()
+
+    patient = uow.create(Patient, {
         "stakeholder_id": str(uuid4())
-    })[0]
-    lab_result = LabResult.create({})[0]
-    leaf_0 = LeafNode0.create({})[0]
-    leaf_1 = LeafNode1.create({})[0]
-    leaf_2 = LeafNode2.create({})[0]
+    })
+    lab_result = uow.create(LabResult, {})
+    leaf_0 = uow.create(LeafNode0, {})
+    leaf_1 = uow.create(LeafNode1, {})
+    leaf_2 = uow.create(LeafNode2, {})
 
-    data_nodes = [{"value": str(i)} for i in range(3)]
-    data_nodes = DataNode.create(*data_nodes)
+    data_nodes = [uow.create(DataNode, {"value": str(i)}) for i in range(3)]
 
-    patient.has_labresult.connect(lab_result)
-    lab_result.contains_leafnode0.connect(leaf_0)
-    lab_result.contains_leafnode1.connect(leaf_1)
-    lab_result.contains_leafnode2.connect(leaf_2)
+    uow.connect(patient, "has_labresult", lab_result)
+    uow.connect(lab_result, "contains_leafnode0", leaf_0)
+    uow.connect(lab_result, "contains_leafnode1", leaf_1)
+    uow.connect(lab_result, "contains_leafnode2", leaf_2)
 
-    leaf_0.current_data.connect(data_nodes[0])
-    leaf_1.current_data.connect(data_nodes[1])
-    leaf_2.current_data.connect(data_nodes[2])
+    uow.connect(leaf_0, "current_data", data_nodes[0])
+    uow.connect(leaf_1, "current_data", data_nodes[1])
+    uow.connect(leaf_2, "current_data", data_nodes[2])
+    uow.commit()
 
     return 204, None
 
@@ -241,7 +247,8 @@ def test_graph_interaction(request, study_id: int):
     graph_id = study_id
     
     # filter leaf node
-    set_is_verified_for_subgraph(graph_id = graph_id)
+    # NOTE: the verification commits in batches and has to run after the request transaction
+    django_transaction.on_commit(lambda: set_is_verified_for_subgraph(graph_id = graph_id))
     
     
     
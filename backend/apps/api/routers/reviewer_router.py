@@ -3,14 +3,19 @@ from api.transactions import TransactionRouter
 from ninja import Body
 from ninja.errors import HttpError
 from neomodel import db
+from django.db import transaction as django_transaction
 from django.shortcuts import get_object_or_404
 
 from api import schema
 from api.permissions import PermissionChecker
+from api.system_stats import invalidate_system_cache
 from reviewer.models import Review, ReviewDetails, StatusChoices, Feedback, UploadTypeChoices
+from study.jobs import queue_materialization, queue_promotion
+from study.staging import discard_staged_data, has_staged_data
 from authentication.models import CustomUser
 from knowledge import graph_functions
 from knowledge.models import load_all_knowledge_node_classes
+from knowledge.statistics import clear_deleted_statistics
 from graph_migrations.studies import load_migrations
 from ontology.importer import import_rdf
 from ontology.data_requests import get_codebooks_for_rdf
@@ -127,10 +132,16 @@ def update_ontology_review(request, reviewID: int, payload: schema.ReviewUpdateS
         review_details.modified_ontology = entities_to_rdf(get_codebooks_for_rdf(review.study))
         review_details.save()
 
-        for migration in load_migrations(review.study):
+        migrations = load_migrations(review.study)
+        for migration in migrations:
             migration.apply()
 
+        # migrations can delete the counted nodes of every study graph, their statistics are cleared without recounting the graphs
+        clear_deleted_statistics([tag for migration in migrations for tag in migration.deleted_tags])
+
         load_all_knowledge_node_classes(force_reload=True)
+        # the accepted study is counted by the system stats
+        django_transaction.on_commit(invalidate_system_cache)
 
         # NOTE: Assuption: Neccesary changes to the ontology have been made and the assigned_meta_tag is added to the CodeBookColumn models
         graph_functions.build_study_codebook_knowledge_graph(review.study)
@@ -202,16 +213,20 @@ def update_data_review(request, reviewID: int, payload: schema.ReviewUpdateSchem
     review.save()
 
     if payload.submission_status == 'ACCEPTED' and review.study:
-        #TODO: set graph is_verified = true + data node connection -> current_data
-        # change the connection between leaf nodes and data nodes to current
-        graph_functions.set_in_review_data_to_current_for_subgraph(graph_id = review.study.id)
-        
+        # change the connection between leaf nodes and data nodes to current and
         # set is_verified = true for all KnowledgeNodes and edges between KnowledgeNodes with graph_id = review.study.id
-        graph_functions.set_is_verified_for_subgraph(graph_id = review.study.id, is_verified=True)
+        # NOTE: the promotion commits in batches, so it runs as job after the request transaction (see study.jobs). A failed job
+        # keeps its errors, it is continued with "manage.py materialize_staged_data <study id>" or "manage.py promote_study_data <study id>".
+        if has_staged_data(review.study):
+            # staged data is written to the graph first, see study.staging
+            queue_materialization(review.study, request.user)
+        else:
+            queue_promotion(review.study, request.user)
         
     elif (payload.submission_status == 'DECLINED' or payload.submission_status == 'MODIFICATION_NEEDED') and review.study:
-        #TODO: Discuss if delete would be needed here
-        pass
+        # staged data never reached the graph, so it is simply discarded
+        discard_staged_data(review.study)
+        #TODO: Discuss if delete would be needed here for data in the graph
     return 204, None
 
 @router.get(
@@ -3,20 +3,26 @@ from api.transactions import TransactionRouter
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from neomodel import db
+from ninja import File, Form
 from ninja.errors import HttpError
+from ninja.files import UploadedFile
+from pydantic import TypeAdapter, ValidationError
 
 from api import schema
 from api.permissions import PermissionChecker
 from graph_migrations.operations import GraphMigrationError
 from graph_migrations.studies import save_migrations
-from knowledge.graph_functions import add_study_data_to_knowledge_graph
+from knowledge.graph_functions import find_nodes_by_leaf_value, has_study_nodes
+from knowledge.ingestion import DataFileRows, DataFileSubmission, has_checkpoints
 from ontology.data_requests import get_codebooks_for_rdf
 from ontology.diff import entities_to_rdf
 from ontology.utils import get_all_outgoing_relationships
 from ontology.models import OntologyNode
+from reviewer.helper import create_data_upload_review
 from reviewer.models import Review, ReviewDetails, StatusChoices, UploadTypeChoices, Feedback
 from study.helper import get_study_from_knowledge_graph
-from study.models import CodeBook, CodeBookColumn, CodeBookRow, Study
+from study.models import CodeBook, CodeBookColumn, CodeBookRow, DataIngestionJob, JobStatus, Study, StudyStatistics
+from study.staging import has_staged_data, store_study_data
 from study.utils import calculate_string_distance
 
 import math
@@ -131,6 +137,8 @@ def submit_study(request, study: schema.StudySubmissionSchema):
         date_end=study.study_info.date_end,
         drks_id=study.study_info.drks_id
     )
+    # the statistics of the study graph are updated by its graph writes, see knowledge.statistics
+    StudyStatistics.objects.create(graph_id=study_instance.id)
     
     # Save the CodeBooks
     for codebook_data in study.codebooks:
@@ -237,15 +245,9 @@ def get_study_by_id(request, id: int):
     else:
         raise HttpError(404, f"Study with id {id} doesn't have any data yet")    
     
-@router.post(
-    "/{id}/data",
-    summary="Adds data to a study",
-    description="This endpoint adds data to a study",
-    response={201: None},
-)
-@PermissionChecker.has_permission(["DATA_UPLOAD"])
-def submit_data_to_study(request, id: int, data: list[schema.StudyDataSubmissionSchema]):
-    study = get_object_or_404(Study, id=id)  
+def check_data_submission(study: Study, code_book_ids: list[int], resume: bool, update: bool = False) -> bool:
+    """Validates a data upload for study and returns whether an interrupted upload is resumed. An update may target a study with data."""
+    id = study.id
     
     studien_id_ontology_node = OntologyNode.nodes.first_or_none(tag="StudienID")
     
@@ -253,18 +255,22 @@ def submit_data_to_study(request, id: int, data: list[schema.StudyDataSubmission
         raise HttpError(404, "Ontology node 'StudienID' not found")
 
     StudienID = studien_id_ontology_node.node_class
-    studien_id = StudienID.nodes.first_or_none(current_data__value = str(id))
-    graph_id = studien_id[0].graph_id
+    studien_id = find_nodes_by_leaf_value(StudienID, [], str(id))
     
     if not studien_id:
         raise HttpError(404, f"Knowledge node 'StudienID' with data node value {id} not found")
+    
+    graph_id = studien_id[0].graph_id
    
-    #Check if study graph has data already
-    answer_ontology_node = OntologyNode.nodes.first_or_none(tag="Antwort")
-    Answer = answer_ontology_node.node_class
+    # an interrupted upload leaves checkpoints behind and may be continued
+    resume = resume and has_checkpoints(graph_id)
     
-    if len(Answer.nodes.filter(graph_id=graph_id)) > 0:
+    #Check if study graph has data already
+    if not resume and not update and (has_study_nodes(graph_id, "Antwort") or has_staged_data(study)):
         raise HttpError(403, f"Study already has associated data")
+    
+    if study.ingestion_jobs.filter(status__in=[JobStatus.QUEUED, JobStatus.RUNNING]).exists():
+        raise HttpError(403, f"Study already has a data upload in progress")
         
     # Check if data for all codebooks is uploaded
     questionnaire_id_ontology_node = OntologyNode.nodes.first_or_none(tag="FragebogenID")
@@ -272,35 +278,103 @@ def submit_data_to_study(request, id: int, data: list[schema.StudyDataSubmission
     
     questionnaire_ids = Questionnaire_id.nodes.filter(graph_id=graph_id)
     
-    if(len(questionnaire_ids) != len(data)):
+    if(len(questionnaire_ids) != len(code_book_ids)):
         raise HttpError(400, f"Mismatch in amount of data uploaded and amount of questionnaires for this study")
         
-    wanted_questionnaire_ids = [d.code_book_id for d in data]
     mapped_questionnaire_ids = [q.current_data.get().value for q in questionnaire_ids]
-    for wanted_id in wanted_questionnaire_ids:
+    for wanted_id in code_book_ids:
         if str(wanted_id) not in mapped_questionnaire_ids:
             raise HttpError(400, f"Questionnaire {wanted_id} not found for study {id}")
+    
+    return resume
+
+@router.post(
+    "/{id}/data",
+    summary="Adds data to a study",
+    description="This endpoint adds data to a study. The data rows are committed in chunks; with resume=true an interrupted upload "
+                "is continued after the last committed chunk. With asynchronous=true the upload is queued as a job and its id is "
+                "returned immediately, the progress can be requested from /{id}/data/jobs/{job_id}. With update=true the rows are "
+                "upserted into a study that already has data: answer groups are matched by questionnaire, participant and row id "
+                "and only changed answers are written. Their old values stay current until the data review is accepted and are "
+                "kept as previous data afterwards.",
+    response={201: None, 202: schema.DataIngestionJobCreatedSchema},
+)
+@PermissionChecker.has_permission(["DATA_UPLOAD"])
+def submit_data_to_study(request, id: int, data: list[schema.StudyDataSubmissionSchema], resume: bool = False, asynchronous: bool = False,
+                         update: bool = False):
+    study = get_object_or_404(Study, id=id)  
+    
+    resume = check_data_submission(study, [d.code_book_id for d in data], resume, update)
             
-    # Add data to the graph
-    add_study_data_to_knowledge_graph(study_id = id , data = data)
+    if asynchronous:
+        job = DataIngestionJob.objects.create(
+            study=study,
+            submitter=request.user,
+            data=[codebook_data.dict() for codebook_data in data],
+            resume=resume,
+            update=update,
+            rows_total=sum(len(codebook_data.values) - 1 for codebook_data in data),
+        )
+        # run by the ingestion worker process once the request transaction is committed, see study.jobs
+        return 202, {"job_id": job.id}
+    
+    # Add data to the graph (or to the staging tables, see study.staging)
+    store_study_data(study, request.user, data, resume = resume, update = update)
     
     # Add review and feedback
-    review_instance = Review.objects.create(
-        submitter=request.user,
-        submission_date=timezone.now(),
-        study=study,
-        submission_status=StatusChoices.STATUS_OPEN.value,
-        upload_type=UploadTypeChoices.UPLOAD_DATA.value 
-    )
+    create_data_upload_review(study, request.user)
     
-    ReviewDetails.objects.create(
-        reviewer_details=review_instance,
-        status=None, 
-        comment=None,
-        modified_ontology="",
-    )
+    return 201, None
+    # raise HttpError(500, f"WANTED ERROR")
+
+
+@router.post(
+    "/{id}/data/files",
+    summary="Adds data files to a study",
+    description="This endpoint adds data to a study from one CSV or Parquet file per codebook. The first row (CSV) or the column names "
+                "(Parquet) are the field names. submission is a JSON list that assigns the codebook id and data quality check config to "
+                "each file by its file name. The files are read and committed in chunks, resume and update work like for /{id}/data.",
+    response={201: None},
+)
+@PermissionChecker.has_permission(["DATA_UPLOAD"])
+def submit_data_files_to_study(request, id: int, submission: Form[str], files: List[UploadedFile] = File(...), resume: bool = False,
+                               update: bool = False):
+    study = get_object_or_404(Study, id=id)
     
-    Feedback.objects.create(review=review_instance)
+    try:
+        entries = TypeAdapter(List[schema.StudyDataFileSubmissionSchema]).validate_json(submission)
+    except ValidationError as error:
+        raise HttpError(400, f"Invalid submission: {error}")
+    
+    files_by_name = {file.name: file for file in files}
+    data = []
+    for entry in entries:
+        if entry.file_name not in files_by_name:
+            raise HttpError(400, f"File {entry.file_name} for questionnaire {entry.code_book_id} not uploaded")
+        file_format = entry.file_name.rsplit(".", 1)[-1].lower()
+        data.append(DataFileSubmission(
+            code_book_id=entry.code_book_id,
+            data_quality_check_config=entry.data_quality_check_config,
+            values=DataFileRows(files_by_name[entry.file_name], file_format),
+        ))
+    
+    resume = check_data_submission(study, [d.code_book_id for d in data], resume, update)
+    
+    # Add data to the graph (or to the staging tables, see study.staging), the files are read chunk by chunk while writing
+    store_study_data(study, request.user, data, resume = resume, update = update)
+    
+    # Add review and feedback
+    create_data_upload_review(study, request.user)
     
     return 201, None
-    # raise HttpError(500, f"WANTED ERROR")
+
+
+@router.get(
+    "/{id}/data/jobs/{job_id}",
+    summary="Returns the status of a data upload job",
+    description="This endpoint returns the status, progress and errors of an asynchronous data upload",
+    response={200: schema.DataIngestionJobSchema},
+)
+@PermissionChecker.has_permission(["DATA_UPLOAD"])
+def get_data_ingestion_job(request, id: int, job_id: int):
+    return 200, get_object_or_404(DataIngestionJob, id=job_id, study_id=id)
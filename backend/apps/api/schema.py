@@ -9,7 +9,9 @@ from typing import Optional, List, Literal, Union, Any, Dict
 from ontology.models import OntologyNode, OntologyRelationship, OntologyNodeTypes
 from graph_migrations.studies import load_migrations, get_migration_steps
 from study.models import Purpose, CodeBook
-from study.helper import get_assigned_meta_field, get_code_books_for_study, get_column_idx_by_item, get_column_item_by_item, get_column_name_by_item, get_columns_for_code_book, get_data_quality_check_config_for_code_book, get_data_quality_check_config_values, get_id_of_code_book, get_linked_item_by_item, get_meta_for_code_book, get_name_of_code_book, get_row_cells_by_answer_group, get_row_idx_by_answer_group, get_rows, get_rows_for_code_book, get_study_from_knowledge_graph, get_tag_of_meta_field
+from study.helper import get_assigned_meta_field, get_rows, get_tag_of_meta_field
+from knowledge.statistics import get_study_statistics
+from study.documents import load_code_book_documents
 
 from ontology.data_requests import get_codebooks_for_rdf
 from ontology.diff import from_rdf, entities_to_rdf
@@ -501,39 +503,8 @@ class StudySchema(ninja.Schema):
     
     @staticmethod
     def resolve_amount_data(obj):
-        amount_data = 0
-        ontology_study = OntologyNode.nodes.first_or_none(tag="Studie")
-        knowledge_studies = ontology_study.node_class.nodes.all()
-        
-        found_study = None
-        
-        for study in knowledge_studies:
-            try:
-                study_info = study.hat_studieninformationen.get_or_none(tag="Studieninformationen")
-                
-                study_id_node = study_info.hat_studienid.get_or_none(tag="StudienID")
-                if study_id_node is None:
-                    continue  # Skip if there's no StudienID
-
-                study_id = study_id_node.current_data.get().value
-
-                if str(study_id) == str(obj.id):
-                    found_study = study
-                    break
-            except:
-                logger.exception(f"Error processing study with node UUI {study.uuid}")
-                continue
-        
-        if found_study is not None: 
-            participants = found_study.hat_teilnehmer.filter(tag="Teilnehmer")
-            
-            for participant in participants:
-                answer_groups = participant.gibt_antwortgruppe.filter(tag="Antwortgruppe")
-                
-                for group in answer_groups:
-                    amount_data += len(group.hat_antwort.filter(tag="Antwort"))
-        
-        return amount_data
+        # answers of the study graph, see knowledge.statistics
+        return get_study_statistics(obj.id).answers
     
     @staticmethod
     def resolve_study_info(obj):
@@ -575,39 +546,16 @@ class CodeBookMeta(ninja.Schema):
     def resolve_rows(obj):
         return get_rows(obj)
     
+# CodeBookColumn, CodeBookRow and CodeBook are read from the documents of study.documents.load_code_book_documents
 class CodeBookColumn(ninja.Schema):
     idx: int
     column_name: str
     item: Dict[str, Union[str, float, int, bool]]
     linked_item: Optional[Dict[str, Union[str, float, int, bool]]] = None
     
-    @staticmethod
-    def resolve_idx(obj):
-        return get_column_idx_by_item(obj)
-    
-    @staticmethod
-    def resolve_item(obj):
-        return get_column_item_by_item(obj)
-    
-    @staticmethod
-    def resolve_column_name(obj):
-        return get_column_name_by_item(obj)
-    
-    @staticmethod
-    def resolve_linked_item(obj):
-        return get_linked_item_by_item(obj)
-    
 class CodeBookRow(ninja.Schema):
     idx: int
     cells: List[str]
-    
-    @staticmethod
-    def resolve_idx(obj):
-        return get_row_idx_by_answer_group(obj)
-    
-    @staticmethod
-    def resolve_cells(obj):
-        return get_row_cells_by_answer_group(obj)
 
 class CodeBook(ninja.Schema):
     id: int
@@ -619,46 +567,16 @@ class CodeBook(ninja.Schema):
     columns: List[CodeBookColumn]
     rows: List[CodeBookRow]
     
-    @staticmethod
-    def resolve_id(obj):
-        return get_id_of_code_book(obj)
-    
-    @staticmethod
-    def resolve_name(obj):
-        return get_name_of_code_book(obj)
-    
     @staticmethod
     def resolve_data_quality_check_config(obj):
-        dqcc = get_data_quality_check_config_for_code_book(obj)
-        if dqcc is not None:
-            config_data = get_data_quality_check_config_values(dqcc) 
-            return DataQualityCheckConfig.model_validate(config_data, from_attributes=True)
+        if obj.data_quality_check_config is not None:
+            return DataQualityCheckConfig.model_validate(obj.data_quality_check_config)
         else:
             return None
-
-    @staticmethod
-    def resolve_meta(obj):
-        return get_meta_for_code_book(obj, get_id_of_code_book(obj))
-    
-    @staticmethod
-    def resolve_columns(obj):
-        columns = get_columns_for_code_book(obj)
-        
-        for column in columns:
-            column._study_id = obj._study_id
-            column._codebook_id = get_id_of_code_book(obj)
-
-        return columns
     
     @staticmethod
     def resolve_rows(obj):
-        rows = get_rows_for_code_book(obj)
-        
-        for row in rows:
-            row._study_id = obj._study_id
-            row._codebook_id = get_id_of_code_book(obj)
-
-        return rows
+        return obj.answers.rows()
     
 class DetailedStudySchema(ninja.Schema):
     id: int
@@ -673,11 +591,7 @@ class DetailedStudySchema(ninja.Schema):
     
     @staticmethod
     def resolve_code_books(obj):
-        code_books, study_id = get_code_books_for_study(*get_study_from_knowledge_graph(obj.id))
-        for cb in code_books:
-            cb._study_id = study_id
-            
-        return code_books
+        return load_code_book_documents(obj.id)
     
 class StudyDataSubmissionSchema(ninja.Schema):
     code_book_id: int
@@ -685,6 +599,29 @@ class StudyDataSubmissionSchema(ninja.Schema):
     values: List[List[str]]
 
 
+class StudyDataFileSubmissionSchema(ninja.Schema):
+    code_book_id: int
+    data_quality_check_config: DataQualityCheckConfig
+    file_name: str
+
+
+class DataIngestionJobCreatedSchema(ninja.Schema):
+    job_id: int
+
+
+class DataIngestionJobSchema(ninja.Schema):
+    id: int
+    kind: str
+    status: str
+    rows_total: int
+    rows_processed: int
+    rows_per_second: Optional[float]
+    errors: List[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
 class CodeBookDataDataSchema(Schema):
     id: int
     name: str
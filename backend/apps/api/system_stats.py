@@ -0,0 +1,133 @@
+"""
+Public system stats and highlighted studies of the /system endpoints.
+Both are served from the Django cache for settings.SYSTEM_CACHE_TTL seconds. The cache is shared by all backend processes (see
+settings.CACHES), so invalidate_system_cache, which is called when a study graph changes (see knowledge.statistics) or a review is
+accepted, is seen by all of them. A single warmer process (manage.py run_system_cache_warmer) recomputes the entries before they expire
+and soon after they were invalidated, requests only compute them on a miss.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from neomodel import db
+
+from authentication.models import CustomUser
+from knowledge.partitions import study_node_pattern
+from knowledge.statistics import get_total_statistics
+from reviewer.models import Review, UploadTypeChoices
+from study.models import StudyStatistics
+
+import time
+import logging
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = "system:stats"
+HIGHLIGHTS_CACHE_KEY = "system:highlights"
+# Seconds between two checks of the warmer whether the entries were invalidated
+WARMER_POLL_INTERVAL = 5
+
+def get_study_count():
+    # NOTE: Currently only studies with an accepted ontology review are counted.
+    accepted_study_reviews = Review.objects.filter(study__isnull = False, details__status = "ACCEPTED", upload_type = UploadTypeChoices.UPLOAD_ONTOLOGY.value)
+    return accepted_study_reviews.distinct("study").count()
+
+def get_datapoint_count():
+    # NOTE: Only answers are currently counted as data points.
+    # The counts are read from the statistics of the study graphs, see knowledge.statistics
+    return get_total_statistics()["verified_answers"]
+
+def get_participant_count():
+    return get_total_statistics()["participants"]
+
+def get_user_count():
+    active_users = CustomUser.objects.filter(is_active = True)
+    return active_users.count()
+
+def compute_system_stats() -> list[dict]:
+    return [
+        {"type": "AMOUNT_STUDIES", "amount": get_study_count()},
+        {"type": "AMOUNT_DATAPOINTS", "amount": get_datapoint_count()},
+        {"type": "AMOUNT_PARTICIPANTS", "amount": get_participant_count()},
+        {"type": "AMOUNT_USERS", "amount": get_user_count()},
+    ]
+
+
+def get_n_biggest_studies(n: int):
+    # Studies are ranked by their verified answers with data, see knowledge.statistics
+    statistics = StudyStatistics.objects.filter(verified_answers__gt = 0).order_by("-verified_answers")[:n]
+    return [
+        {
+            "id": study.graph_id,
+            "questionnaires": study.questionnaires,
+            "questions": study.items,
+            "participants": study.participants,
+            "datapoints": study.verified_answers,
+        }
+        for study in statistics
+    ]
+
+def evaluate_study_queries(study: dict):
+    # Only the name of the highlighted studies is queried, starting from the nodes of the study (see knowledge.partitions).
+    graph_id = study["id"]
+    # the name is stored inline or as current data node, see knowledge.models.InlineData
+    query = (
+        f"MATCH {study_node_pattern('n', 'Studienname', graph_id)} OPTIONAL MATCH (n)-[:CURRENT]->(data:DataNode) "
+        "WITH coalesce(n.value, data.value) AS name WHERE name IS NOT NULL RETURN name LIMIT 1"
+    )
+    query_result = db.cypher_query(query, {"graph_id": graph_id})[0]
+    if query_result:
+        study["name"] = query_result[0][0]
+
+def compute_highlights(n: int) -> list[dict]:
+    # The studies are ranked by their statistics, only the name is queried for the highlighted studies.
+    highlighted = get_n_biggest_studies(n)
+    for study in highlighted:
+        evaluate_study_queries(study)
+    return highlighted
+
+
+def get_system_stats() -> list[dict]:
+    if settings.SYSTEM_CACHE_TTL <= 0:
+        return compute_system_stats()
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_system_stats()
+        cache.set(STATS_CACHE_KEY, stats, settings.SYSTEM_CACHE_TTL)
+    return stats
+
+def get_highlights(amount: int) -> list[dict]:
+    """Returns the amount biggest studies, the first settings.SYSTEM_HIGHLIGHTS_CACHE_SIZE of them are cached together."""
+    if settings.SYSTEM_CACHE_TTL <= 0 or amount > settings.SYSTEM_HIGHLIGHTS_CACHE_SIZE:
+        return compute_highlights(amount)
+    highlights = cache.get(HIGHLIGHTS_CACHE_KEY)
+    if highlights is None:
+        highlights = compute_highlights(settings.SYSTEM_HIGHLIGHTS_CACHE_SIZE)
+        cache.set(HIGHLIGHTS_CACHE_KEY, highlights, settings.SYSTEM_CACHE_TTL)
+    return highlights[:amount]
+
+
+def warm_system_cache() -> None:
+    cache.set_many({
+        STATS_CACHE_KEY: compute_system_stats(),
+        HIGHLIGHTS_CACHE_KEY: compute_highlights(settings.SYSTEM_HIGHLIGHTS_CACHE_SIZE),
+    }, settings.SYSTEM_CACHE_TTL)
+
+def invalidate_system_cache() -> None:
+    """Drops the cached stats and highlights of all processes, the warmer recomputes them within WARMER_POLL_INTERVAL seconds."""
+    cache.delete_many([STATS_CACHE_KEY, HIGHLIGHTS_CACHE_KEY])
+
+
+def run_system_cache_warmer(poll_interval: float = WARMER_POLL_INTERVAL) -> None:
+    """Keeps the stats and highlights cached until it is stopped. Runs in its own process, see manage.py run_system_cache_warmer."""
+    # entries are refreshed at half of their TTL, so they never expire while the warmer is running
+    interval = settings.SYSTEM_CACHE_TTL / 2
+    while True:
+        try:
+            warm_system_cache()
+        except Exception:
+            logger.exception("Warming the system stats cache failed")
+        finally:
+            connections.close_all()
+        warmed_at = time.monotonic()
+        # invalidated entries are missing from the shared cache
+        while time.monotonic() - warmed_at < interval and cache.get(STATS_CACHE_KEY) is not None:
+            time.sleep(min(poll_interval, interval))
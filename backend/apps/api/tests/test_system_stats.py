@@ -0,0 +1,32 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from study.models import StudyStatistics
+from ..system_stats import HIGHLIGHTS_CACHE_KEY, STATS_CACHE_KEY, get_system_stats, invalidate_system_cache, warm_system_cache
+
+def datapoints(stats):
+    return next(stat["amount"] for stat in stats if stat["type"] == "AMOUNT_DATAPOINTS")
+
+@pytest.mark.django_db
+def test_invalidation_drops_the_shared_entries():
+    warm_system_cache()
+    assert cache.get(STATS_CACHE_KEY) is not None
+
+    invalidate_system_cache()
+
+    assert cache.get(STATS_CACHE_KEY) is None
+    assert cache.get(HIGHLIGHTS_CACHE_KEY) is None
+
+@pytest.mark.django_db
+@override_settings(SYSTEM_CACHE_TTL = 300)
+def test_system_stats_are_recomputed_after_an_invalidation(study):
+    StudyStatistics.objects.filter(graph_id = study.id).update(verified_answers = 5)
+    invalidate_system_cache()
+    assert datapoints(get_system_stats()) == 5
+
+    # cached until the next invalidation
+    StudyStatistics.objects.filter(graph_id = study.id).update(verified_answers = 7)
+    assert datapoints(get_system_stats()) == 5
+
+    invalidate_system_cache()
+    assert datapoints(get_system_stats()) == 7
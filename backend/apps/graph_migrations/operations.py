@@ -61,6 +61,11 @@ class GraphMigration(abc.ABC):
         """Returns the list of sub-steps this migration consists of. By default, this returns only one step, provided the self.target field is set."""
         return [GraphMigrationStep(migration = self, target = self.target)]
 
+    @property
+    def deleted_tags(self) -> list[str]:
+        """Returns the tags of the knowledge nodes that the migration deletes entirely (after validate). By default, it deletes none."""
+        return []
+
     # Methods for serializing and deserializing migrations.
     @abc.abstractmethod
     def to_settings(self) -> dict:
@@ -553,6 +558,10 @@ class PartialDeletionMigration(GraphMigration):
     def from_settings(cls, settings):
         return cls(settings["tag"])
 
+    @property
+    def deleted_tags(self):
+        return [self.tag]
+
 
 class FullDeletionMigration(GraphMigration):
     name = "DELETION_FULL"
@@ -580,12 +589,15 @@ class FullDeletionMigration(GraphMigration):
 
     def apply_to_knowledge_graph(self):
         # I'm sure this query can have no unintended side-effects like accidentally deleting the entire knowledge graph :-)
+        # Interned data nodes are shared with leaves outside of the deleted subgraph and are only deleted once they're unused.
         query = """
         MATCH (n:{tag})-[*0..]->(x)
+        WHERE NOT x:InternedDataNode
         WITH DISTINCT x
         DETACH DELETE x
         """.format(tag = self.tag)
         db.cypher_query(query)
+        db.cypher_query("MATCH (d:InternedDataNode) WHERE NOT ()-->(d) DELETE d")
 
     @property
     def steps(self):
@@ -593,6 +605,10 @@ class FullDeletionMigration(GraphMigration):
             GraphMigrationStep(migration = self, name = "DELETION", target = node)
             for node in self.affected_nodes
         ]
+
+    @property
+    def deleted_tags(self):
+        return [node.tag for node in self.affected_nodes]
     
     def to_settings(self):
         return {"tag": self.tag}
@@ -623,6 +639,9 @@ class LeafDeletionMigration(GraphMigration):
         parameters = { "tag": self.target.tag }
         db.cypher_query(query, parameters)
 
+    @property
+    def deleted_tags(self):
+        return [self.tag]
 
     def to_settings(self):
         return {"tag": self.tag}
@@ -0,0 +1,123 @@
+"""
+Anchors of the study graphs in Postgres: the uuid and element id of the Studie, Datenerhebung and Fragebogen nodes by Study and CodeBook id.
+The graph build records them, so the root nodes of a study graph are loaded with a single lookup instead of a search over the StudienID or
+FragebogenID leaves of all studies. Lookups only read, graphs that were built before the anchors existed are searched until they are
+anchored with manage.py anchor_study_graphs (see anchor_study_graphs).
+"""
+from django.db.models import Q
+from neomodel import db
+from ninja.errors import HttpError
+
+from knowledge.models import KnowledgeNode
+from ontology.models import OntologyNode
+from study.models import CodeBookGraphAnchor, Study, StudyGraphAnchor
+
+from typing import Callable
+
+def get_node_class(tag: str) -> type:
+    ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = tag)
+    if not ontology_node:
+        raise HttpError(404, f"Ontology node '{tag}' not found")
+    return ontology_node.node_class
+
+
+def get_element_ids(uuids: list[str]) -> dict[str, str]:
+    results, _ = db.cypher_query("UNWIND $uuids AS uuid MATCH (n:KnowledgeNode {uuid: uuid}) RETURN uuid, elementId(n)", {"uuids": uuids})
+    return {uuid: element_id for uuid, element_id in results}
+
+
+def record_graph_anchors(study: Study, studie: str, datenerhebung: str | None = None, fragebogen: dict[int, str] | None = None) -> None:
+    """Records the anchors of a study graph from the uuids of its Studie and Datenerhebung node and of its Fragebogen nodes by codebook id."""
+    fragebogen = fragebogen or {}
+    element_ids = get_element_ids([studie, *([datenerhebung] if datenerhebung else []), *fragebogen.values()])
+    StudyGraphAnchor.objects.update_or_create(study = study, defaults = {
+        "studie_uuid": studie,
+        "studie_element_id": element_ids[studie],
+        "datenerhebung_uuid": datenerhebung,
+        "datenerhebung_element_id": element_ids.get(datenerhebung),
+    })
+    for codebook_id, uuid in fragebogen.items():
+        CodeBookGraphAnchor.objects.update_or_create(codebook_id = codebook_id, defaults = {
+            "fragebogen_uuid": uuid,
+            "fragebogen_element_id": element_ids[uuid],
+        })
+
+
+def get_anchored_node(uuid: str, element_id: str | None) -> KnowledgeNode | None:
+    """Loads an anchored node by its element id. Element ids are reused after nodes are deleted, so the uuid has to match as well."""
+    if element_id:
+        results, _ = db.cypher_query("MATCH (n) WHERE elementId(n) = $element_id AND n.uuid = $uuid RETURN n",
+                                     {"element_id": element_id, "uuid": uuid}, resolve_objects = True)
+        if results:
+            return results[0][0]
+    results, _ = db.cypher_query("MATCH (n:KnowledgeNode {uuid: $uuid}) RETURN n", {"uuid": uuid}, resolve_objects = True)
+    return results[0][0] if results else None
+
+
+def find_study_node(study_id: int) -> KnowledgeNode | None:
+    """Searches the Studie node of a study by its StudienID."""
+    # NOTE: graph_functions imports this module, so it's imported here to avoid an import cycle
+    from knowledge.graph_functions import find_nodes_by_leaf_value
+    Studie = get_node_class("Studie")
+    studies = find_nodes_by_leaf_value(Studie, [("hat_studieninformationen", "Studieninformationen"), ("hat_studienid", "StudienID")], str(study_id))
+    return studies[0] if studies else None
+
+
+def find_fragebogen_node(codebook_id: int, graph_id: int | None = None) -> KnowledgeNode | None:
+    """Searches the Fragebogen node of a codebook (in the graph graph_id if given) by its FragebogenID."""
+    from knowledge.graph_functions import find_nodes_by_leaf_value
+    Fragebogen = get_node_class("Fragebogen")
+    fragebogen_nodes = find_nodes_by_leaf_value(Fragebogen, [("hat_fragebogenid", "FragebogenID")], str(codebook_id), graph_id = graph_id)
+    return fragebogen_nodes[0] if fragebogen_nodes else None
+
+
+def get_study_node(study_id: int) -> KnowledgeNode | None:
+    """Returns the Studie node of the graph of a study, or None if the study has no graph."""
+    anchor = StudyGraphAnchor.objects.filter(study_id = study_id).first()
+    if anchor:
+        studie = get_anchored_node(anchor.studie_uuid, anchor.studie_element_id)
+        if studie is not None:
+            return studie
+
+    # NOTE: graphs without anchor are searched by their StudienID
+    return find_study_node(study_id)
+
+
+def get_fragebogen_node(codebook_id: int, graph_id: int | None = None) -> KnowledgeNode | None:
+    """Returns the Fragebogen node of a codebook (in the graph graph_id if given), or None if it isn't in the graph."""
+    anchor = CodeBookGraphAnchor.objects.filter(codebook_id = codebook_id).first()
+    if anchor:
+        fragebogen = get_anchored_node(anchor.fragebogen_uuid, anchor.fragebogen_element_id)
+        # other graphs (e.g. the example graph) can contain a Fragebogen with the same codebook id
+        if fragebogen is not None and (graph_id is None or fragebogen.graph_id == graph_id):
+            return fragebogen
+
+    # NOTE: codebooks without anchor are searched by their FragebogenID
+    return find_fragebogen_node(codebook_id, graph_id)
+
+
+def anchor_study_graphs(progress: Callable[[Study], None] | None = None) -> int:
+    """
+    Records the anchors of the study graphs that were built before the anchors existed, including codebooks without anchor.
+    Studies without graph are skipped. Returns the number of anchored studies, progress is called with every anchored study.
+    """
+    studies = Study.objects.filter(
+        Q(graph_anchor__isnull = True) | Q(codebooks__isnull = False, codebooks__graph_anchor__isnull = True)
+    ).distinct().order_by("id")
+    anchored = 0
+    for study in studies:
+        studie = find_study_node(study.id)
+        if studie is None:
+            continue
+        datenerhebung = studie.hat_datenerhebung.single()
+        fragebogen = {}
+        for codebook in study.codebooks.all():
+            # the graph of a study has the graph_id of the study, other graphs can reuse its codebook ids
+            fragebogen_node = find_fragebogen_node(codebook.id, graph_id = study.id)
+            if fragebogen_node is not None:
+                fragebogen[codebook.id] = fragebogen_node.uuid
+        record_graph_anchors(study, studie.uuid, datenerhebung.uuid if datenerhebung else None, fragebogen)
+        anchored += 1
+        if progress:
+            progress(study)
+    return anchored
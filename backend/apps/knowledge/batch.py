@@ -0,0 +1,380 @@
+"""
+Helpers for writing many knowledge and data nodes with a few UNWIND statements instead of one neomodel call per element.
+The property maps are generated by neomodel itself, so batched nodes and relationships look exactly like ones created with create()/connect().
+"""
+import neomodel
+from django.conf import settings
+from neomodel import db
+from neomodel.util import _UnsavedNode
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Type
+import math
+
+from knowledge.blobs import blob_hash, is_blob_value, store_blob
+from knowledge.models import COMPACT_RELATIONSHIP_PROPERTIES, CompactRelationship, DataNode, InternedDataNode, LeafNode
+from knowledge.partitions import study_labels
+
+def node_properties(NodeClass: Type[neomodel.StructuredNode], properties: dict) -> dict:
+    """Returns the properties NodeClass.create() would store, including defaults like uuid, tag and timestamps."""
+    return NodeClass.deflate(properties, obj = _UnsavedNode(), skip_empty = True)
+
+def relationship_properties(RelationshipModel: Type[neomodel.StructuredRel], properties: dict | None) -> dict:
+    """
+    Returns the properties RelationshipManager.connect() would store for the given relationship model.
+    With settings.GRAPH_COMPACT_RELATIONSHIPS, the properties that a CompactRelationship derives from its start node are left out.
+    """
+    instance = RelationshipModel(**properties) if properties else RelationshipModel()
+    deflated = RelationshipModel.deflate(instance.__properties__)
+    if settings.GRAPH_COMPACT_RELATIONSHIPS and issubclass(RelationshipModel, CompactRelationship):
+        deflated = {key: value for key, value in deflated.items() if key not in COMPACT_RELATIONSHIP_PROPERTIES}
+    return {key: value for key, value in deflated.items() if value is not None}
+
+def relationship_definition(NodeClass: Type[neomodel.StructuredNode], field_name: str) -> dict:
+    """Returns the neomodel definition (relation_type, model, ...) of a relationship manager field, e.g. Item.hat_metadaten."""
+    return getattr(NodeClass, field_name).definition
+
+# Datentyp values (REDCap field and validation types and their German names) of numeric and date items, matched by prefix.
+NUMERIC_DATA_TYPES = ("integer", "number", "float", "decimal", "calc", "slider", "zahl", "ganzzahl", "dezimalzahl")
+DATE_DATA_TYPES = ("date", "datum")
+# Datentyp values of items whose answers are chosen from a few options, their answers are interned like categorical leaves.
+CATEGORICAL_DATA_TYPES = ("radio", "dropdown", "checkbox", "yesno", "truefalse", "auswahl", "einfachauswahl", "mehrfachauswahl", "janein", "ja/nein")
+# Date formats by the order of day, month and year, the suffix of REDCap date validation types like date_dmy.
+DATE_FORMATS = {
+    "dmy": ("%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y"),
+    "mdy": ("%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y"),
+    "ymd": ("%Y/%m/%d", "%Y.%m.%d"),
+}
+
+def parse_number(value: str) -> float | None:
+    try:
+        number = float(value.strip().replace(",", "."))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+def parse_date(value: str, data_type: str) -> date | None:
+    value = value.strip()
+    try:
+        # ISO dates are used by data exports independent of the validation type, a time part is ignored
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        pass
+    # without an order in the type, German day-month-year dates are expected
+    order = next((order for order in DATE_FORMATS if data_type.endswith(order)), "dmy")
+    for date_format in DATE_FORMATS[order]:
+        try:
+            return datetime.strptime(value.split(" ")[0], date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def typed_value_properties(value: str, data_type: str | None) -> dict:
+    """
+    Returns the typed shadow properties (num_value or date_value) of a data node holding value for an item with the given Datentyp.
+    Values that can't be parsed and items without a numeric or date type don't get any.
+    """
+    if not data_type or not value:
+        return {}
+    data_type = data_type.strip().lower()
+    if data_type.startswith(NUMERIC_DATA_TYPES):
+        number = parse_number(value)
+        return {"num_value": number} if number is not None else {}
+    if data_type.startswith(DATE_DATA_TYPES):
+        parsed = parse_date(value, data_type)
+        return {"date_value": parsed} if parsed is not None else {}
+    return {}
+
+def value_properties(value: str, interned: bool = False) -> dict:
+    """
+    Returns the value properties of a data node holding value. Values above settings.GRAPH_BLOB_THRESHOLD are written to the blob store
+    and only referenced by their hash and length, see knowledge.blobs. Interned values always carry their hash, since they are merged by it.
+    """
+    if is_blob_value(value):
+        return {"value_hash": store_blob(value), "value_length": len(value)}
+    if interned:
+        return {"value": value, "value_hash": blob_hash(value)}
+    return {"value": value}
+
+def is_categorical_data_type(data_type: str | None) -> bool:
+    return bool(data_type) and data_type.strip().lower().startswith(CATEGORICAL_DATA_TYPES)
+
+def interns_values(LeafClass: Type[neomodel.StructuredNode], data_type: str | None = None) -> bool:
+    """
+    Returns whether the data nodes of LeafClass are interned, i.e. shared per (graph_id, value_hash), see InternedDataNode.
+    That's the case for categorical leaf classes and for values of a categorical Datentyp (e.g. the answers of radio items),
+    free text answers keep data nodes of their own.
+    """
+    if not settings.GRAPH_INTERN_CATEGORICAL_VALUES:
+        return False
+    return getattr(LeafClass, "is_categorical", False) or is_categorical_data_type(data_type)
+
+def stores_inline(LeafClass: Type[neomodel.StructuredNode], field_name: str) -> bool:
+    """Returns whether current data of LeafClass is stored as value property of the leaf instead of a data node, see InlineData."""
+    return field_name == "current_data" and getattr(LeafClass, "is_inline", False)
+
+# Labels the uuid indexes are defined on, see knowledge.indexes
+BASE_LABELS = ("KnowledgeNode", "DataNode")
+
+def base_label(NodeClass: Type[neomodel.StructuredNode]) -> str:
+    """Returns the most general label of NodeClass (KnowledgeNode or DataNode), which is the one the uuid index is defined on."""
+    return NodeClass.inherited_labels()[-1]
+
+def escape_label(label: str) -> str:
+    """
+    Returns label quoted for use in the text of a Cypher query, e.g. `Item`. Neo4j can't use indexes for dynamic labels ($(...)) in MATCH,
+    so node patterns that should seek an index use literal labels. Labels of knowledge node classes come from the ontology, so they are escaped.
+    """
+    return "`" + label.replace("`", "``") + "`"
+
+def node_labels(NodeClass: Type[neomodel.StructuredNode], properties: dict) -> list[str]:
+    """Returns the labels of a new node of NodeClass, including its study label if enabled, see knowledge.partitions."""
+    return NodeClass.inherited_labels() + study_labels(properties.get("graph_id"))
+
+@dataclass
+class GraphLayer:
+    """
+    Collects nodes, relationships and data nodes of one layer of a subgraph in memory.
+    Nodes are referenced by their uuid, so relationships can point to nodes that haven't been written yet.
+    write() sends the whole layer to the database with a few UNWIND statements.
+    """
+    nodes: list[dict] = field(default_factory = list)
+    relationships: list[dict] = field(default_factory = list)
+    data: list[dict] = field(default_factory = list)
+    moves: list[dict] = field(default_factory = list)
+    values: list[dict] = field(default_factory = list)
+
+    def add_node(self, NodeClass: Type[neomodel.StructuredNode], properties: dict) -> str:
+        """Adds a knowledge node and returns its uuid."""
+        deflated = node_properties(NodeClass, properties)
+        self.nodes.append({"labels": node_labels(NodeClass, properties), "properties": deflated})
+        return deflated["uuid"]
+
+    def add_relationship(self, NodeClass: Type[neomodel.StructuredNode], field_name: str, start: str, end: str, properties: dict, end_label: str = "KnowledgeNode") -> None:
+        """Adds a relationship between two nodes, using the relationship manager field_name of NodeClass as template."""
+        definition = relationship_definition(NodeClass, field_name)
+        self.relationships.append({
+            "start": start,
+            "start_label": base_label(NodeClass),
+            "end": end,
+            "end_label": end_label,
+            "type": definition["relation_type"],
+            "properties": relationship_properties(definition["model"], properties),
+        })
+
+    def add_data(self, leaf: str, value: str, properties: dict, field_name: str = "current_data", interned: bool = False, data_type: str | None = None) -> None:
+        """
+        Adds a data node holding value and connects the leaf node with the given uuid to it.
+        With interned = True, the leaf is connected to the InternedDataNode of its graph_id and value hash, which is created if it doesn't exist.
+        data_type is the Datentyp of the value, which adds the typed shadow properties, see typed_value_properties.
+        """
+        definition = relationship_definition(LeafNode, field_name)
+        self.data.append({
+            "leaf": leaf,
+            "type": definition["relation_type"],
+            "node": node_properties(InternedDataNode if interned else DataNode, {**properties, **value_properties(value, interned), **typed_value_properties(value, data_type)}),
+            "labels": node_labels(DataNode, properties),
+            "properties": relationship_properties(definition["model"], properties),
+            "interned": interned,
+        })
+
+    def add_leaf(self, ParentClass: Type[neomodel.StructuredNode], field_name: str, parent: str, LeafClass: Type[LeafNode], value: str, properties: dict,
+                 data_field_name: str = "current_data", data_type: str | None = None) -> str:
+        """Adds a leaf node with its data node (or its inline value, see InlineData) below parent and returns the uuid of the leaf."""
+        if stores_inline(LeafClass, data_field_name):
+            leaf = self.add_node(LeafClass, {**properties, "value": value})
+            self.add_relationship(ParentClass, field_name, parent, leaf, properties)
+            return leaf
+        leaf = self.add_node(LeafClass, properties)
+        self.add_relationship(ParentClass, field_name, parent, leaf, properties)
+        self.add_data(leaf, value, properties, data_field_name, interns_values(LeafClass, data_type), data_type)
+        return leaf
+
+    def add_value(self, leaf: str, value: str) -> None:
+        """Stores value as inline value of the leaf node with the given uuid."""
+        self.values.append({"leaf": leaf, "value": value})
+
+    def add_move(self, leaf: str, field_names: list[str], target_field_name: str) -> None:
+        """Moves the data relationships field_names of the leaf node with the given uuid to target_field_name, e.g. CURRENT to PREVIOUS."""
+        self.moves.append({
+            "leaf": leaf,
+            "types": [relationship_definition(LeafNode, field_name)["relation_type"] for field_name in field_names],
+            "type": relationship_definition(LeafNode, target_field_name)["relation_type"],
+        })
+
+    def write(self) -> None:
+        # Labels and relationship types are passed as parameters (dynamic labels) to prevent Cypher injection.
+        # Moves run first, so data connected in the same layer isn't moved again.
+        if self.moves:
+            db.cypher_query(
+                "UNWIND $moves AS move "
+                "MATCH (leaf:KnowledgeNode {uuid: move.leaf})-[r]->(d:DataNode) WHERE type(r) IN move.types "
+                "CREATE (leaf)-[moved:$(move.type)]->(d) SET moved = properties(r) "
+                "DELETE r",
+                {"moves": self.moves}
+            )
+        if self.nodes:
+            db.cypher_query(
+                "UNWIND $nodes AS node CREATE (n:$(node.labels)) SET n = node.properties",
+                {"nodes": self.nodes}
+            )
+        # Relationships are grouped by the base labels of their start and end nodes. The labels are written into the query, because
+        # Neo4j can't use an index for dynamic labels in MATCH, so both MATCH clauses seek the uuid index of their base label.
+        groups: dict[tuple[str, str], list[dict]] = {}
+        for relationship in self.relationships:
+            groups.setdefault((relationship["start_label"], relationship["end_label"]), []).append(relationship)
+        for (start_label, end_label), relationships in groups.items():
+            if start_label not in BASE_LABELS or end_label not in BASE_LABELS:
+                raise ValueError(f"Relationships can only connect nodes with the base labels {BASE_LABELS}, not {start_label} and {end_label}")
+            db.cypher_query(
+                "UNWIND $relationships AS rel "
+                f"MATCH (source:{start_label} {{uuid: rel.start}}) "
+                f"MATCH (target:{end_label} {{uuid: rel.end}}) "
+                "CREATE (source)-[r:$(rel.type)]->(target) SET r = rel.properties",
+                {"relationships": relationships}
+            )
+        data = [entry for entry in self.data if not entry["interned"]]
+        if data:
+            db.cypher_query(
+                "UNWIND $data AS data "
+                "MATCH (leaf:KnowledgeNode {uuid: data.leaf}) "
+                "CREATE (leaf)-[r:$(data.type)]->(d:$(data.labels)) SET d = data.node, r = data.properties",
+                {"data": data}
+            )
+        if self.values:
+            db.cypher_query(
+                "UNWIND $values AS value MATCH (leaf:KnowledgeNode {uuid: value.leaf}) SET leaf.value = value.value",
+                {"values": self.values}
+            )
+        # The unique constraint on (graph_id, value_hash) makes MERGE safe for concurrent writers, see knowledge.indexes.
+        interned = [entry for entry in self.data if entry["interned"]]
+        if interned:
+            db.cypher_query(
+                "UNWIND $data AS data "
+                "MATCH (leaf:KnowledgeNode {uuid: data.leaf}) "
+                "MERGE (d:InternedDataNode {graph_id: data.node.graph_id, value_hash: data.node.value_hash}) "
+                "ON CREATE SET d = data.node, d:$(data.labels) "
+                # a value shared by items of different types gets the typed properties of every type
+                "SET d.num_value = coalesce(d.num_value, data.node.num_value), d.date_value = coalesce(d.date_value, data.node.date_value) "
+                "CREATE (leaf)-[r:$(data.type)]->(d) SET r = data.properties",
+                {"data": interned}
+            )
+
+
+class NodeHandle:
+    """
+    Reference to a node that is created by a UnitOfWork.
+    Handles can be connected like saved nodes before the unit of work is committed; node loads the stored node afterwards.
+    """
+    def __init__(self, node_class: Type[neomodel.StructuredNode], uuid: str):
+        self.node_class = node_class
+        self.uuid = uuid
+
+    @property
+    def node(self) -> neomodel.StructuredNode:
+        return self.node_class.nodes.get(uuid = self.uuid)
+
+    def __repr__(self) -> str:
+        return f"<NodeHandle {self.node_class.__name__} {self.uuid}>"
+
+
+class UnitOfWork:
+    """
+    Collects create() and connect() calls for knowledge and data nodes and writes them with a few UNWIND statements on commit().
+    Mirrors NodeClass.create(props)[0] and node.field.connect(other, props), but accepts the dynamically generated node classes
+    and field names as arguments:
+
+        with UnitOfWork() as uow:
+            item = uow.create(Item, {"graph_id": 1})
+            uow.connect(fragebogen, "hat_item", item, {"graph_id": 1})
+
+    Relationships may use saved nodes as well as handles of nodes created in the same unit of work.
+    Relationships are always created, never merged, like connect() on freshly created nodes.
+    """
+    def __init__(self):
+        self.layer = GraphLayer()
+
+    def create(self, NodeClass: Type[neomodel.StructuredNode], properties: dict | None = None) -> NodeHandle:
+        deflated = node_properties(NodeClass, properties or {})
+        self.layer.nodes.append({"labels": node_labels(NodeClass, properties or {}), "properties": deflated})
+        return NodeHandle(NodeClass, deflated["uuid"])
+
+    def connect(self, start: NodeHandle | neomodel.StructuredNode, field_name: str, end: NodeHandle | neomodel.StructuredNode, properties: dict | None = None) -> None:
+        self.layer.add_relationship(
+            self._node_class(start), field_name, start.uuid, end.uuid, properties or {}, end_label = base_label(self._node_class(end))
+        )
+
+    def add_data(self, leaf: NodeHandle | neomodel.StructuredNode, value: str, properties: dict | None = None, field_name: str = "current_data",
+                 data_type: str | None = None) -> None:
+        """
+        Connects leaf to a new data node holding value, like connecting it to uow.create(DataNode, {**properties, "value": value}).
+        Values of categorical leaf classes or of a categorical Datentyp are interned if settings.GRAPH_INTERN_CATEGORICAL_VALUES is enabled, see interns_values.
+        With the Datentyp data_type, numeric and date values also get typed shadow properties, see typed_value_properties.
+        Current data of inline leaf classes is stored as value property of the leaf, see InlineData.
+        """
+        LeafClass = self._node_class(leaf)
+        if stores_inline(LeafClass, field_name):
+            self.layer.add_value(leaf.uuid, value)
+        else:
+            self.layer.add_data(leaf.uuid, value, properties or {}, field_name, interns_values(LeafClass, data_type), data_type)
+
+    def move_data(self, leaf: NodeHandle | neomodel.StructuredNode, field_names: list[str], target_field_name: str = "previous_data") -> None:
+        """Moves the existing data nodes of leaf from the relationships field_names to target_field_name when the unit of work is committed."""
+        self.layer.add_move(leaf.uuid, field_names, target_field_name)
+
+    def commit(self) -> None:
+        """Writes all collected nodes and relationships and starts over with an empty unit of work."""
+        self.layer.write()
+        self.layer = GraphLayer()
+
+    @staticmethod
+    def _node_class(node: NodeHandle | neomodel.StructuredNode) -> Type[neomodel.StructuredNode]:
+        return node.node_class if isinstance(node, NodeHandle) else type(node)
+
+    def __len__(self) -> int:
+        return len(self.layer.nodes) + len(self.layer.relationships) + len(self.layer.data) + len(self.layer.moves) + len(self.layer.values)
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+
+
+def run_in_transactions(match: str, update: str, params: dict, batch_size: int | None = None, progress: Callable[[int], None] | None = None,
+                        sums: dict[str, str] | None = None, on_sums: Callable[[dict[str, int]], None] | None = None) -> int:
+    """
+    Runs update for every row of match with CALL { ... } IN TRANSACTIONS, so the database commits every batch_size rows
+    (default: settings.GRAPH_UPDATE_BATCH_SIZE) instead of holding the whole update in one transaction.
+    update must remove its rows from the result of match (e.g. delete the matched relationship or filter on the updated property),
+    which makes the update resumable: an interrupted run is continued by running it again.
+    The rows are processed in rounds of ten batches and progress is called with the number of rows of every round.
+    sums are integer expressions over the variables of match by name, which are evaluated before the update. on_sums is called with
+    their sums over the rows of every round. Returns the number of updated rows.
+
+    CALL { ... } IN TRANSACTIONS can only run in an implicit transaction, i.e. outside of db.transaction.
+    """
+    if db._active_transaction:
+        raise RuntimeError("run_in_transactions() can't be used inside an explicit transaction")
+    
+    batch_size = batch_size or settings.GRAPH_UPDATE_BATCH_SIZE
+    sums = sums or {}
+    query = (
+        f"{match} "
+        f"WITH *{''.join(f', {expression} AS sum_{i}' for i, expression in enumerate(sums.values()))} LIMIT $round_size "
+        f"CALL {{ WITH * {update} }} IN TRANSACTIONS OF $batch_size ROWS "
+        f"RETURN count(*){''.join(f', sum(sum_{i})' for i in range(len(sums)))}"
+    )
+    total = 0
+    while True:
+        results, _ = db.cypher_query(query, {**params, "batch_size": batch_size, "round_size": batch_size * 10})
+        rows = results[0][0]
+        total += rows
+        if progress and rows:
+            progress(rows)
+        if on_sums and rows:
+            on_sums(dict(zip(sums, results[0][1:])))
+        if rows < batch_size * 10:
+            return total
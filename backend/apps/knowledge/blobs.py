@@ -0,0 +1,45 @@
+"""
+Content addressed store for large data values outside of the graph.
+Values longer than settings.GRAPH_BLOB_THRESHOLD characters are written to settings.GRAPH_BLOB_DIRECTORY as a file named by the
+SHA-256 hash of the value, their DataNode only keeps value_hash and value_length (see DataNode.resolved_value).
+Equal values share one file, files are never modified once they are written.
+"""
+from django.conf import settings
+
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+import os
+import tempfile
+
+def blob_hash(value: str) -> str:
+    return sha256(value.encode("utf-8")).hexdigest()
+
+
+def blob_path(value_hash: str) -> Path:
+    # Files are spread over 256 sub directories by the first two characters of the hash.
+    return Path(settings.GRAPH_BLOB_DIRECTORY) / value_hash[:2] / value_hash
+
+
+def is_blob_value(value: str | None) -> bool:
+    """Returns whether value is stored in the blob store instead of the graph."""
+    return value is not None and settings.GRAPH_BLOB_THRESHOLD > 0 and len(value) > settings.GRAPH_BLOB_THRESHOLD
+
+
+def store_blob(value: str) -> str:
+    """Writes value to the blob store unless it's already stored and returns its hash."""
+    value_hash = blob_hash(value)
+    path = blob_path(value_hash)
+    if not path.exists():
+        path.parent.mkdir(parents = True, exist_ok = True)
+        # The value is written to a temporary file first and renamed atomically, so concurrent writers and readers never see a partial file.
+        with tempfile.NamedTemporaryFile("w", encoding = "utf-8", dir = path.parent, delete = False) as file:
+            file.write(value)
+        os.replace(file.name, path)
+    return value_hash
+
+
+@lru_cache(maxsize = 256)
+def load_blob(value_hash: str) -> str:
+    """Reads the value with value_hash from the blob store. Raises a FileNotFoundError if it doesn't exist."""
+    return blob_path(value_hash).read_text(encoding = "utf-8")
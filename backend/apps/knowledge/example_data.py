@@ -4,6 +4,7 @@ from django.conf import settings
 from uuid import uuid4
 from neomodel import db
 from ontology.models import OntologyNode
+from knowledge.batch import UnitOfWork
 from knowledge.models import DataNode
 from knowledge.models import load_all_knowledge_node_classes
 import logging
@@ -14,7 +15,7 @@ logger = logging.getLogger(__name__)
 def delete_all_knowledge_and_data_nodes(request) -> None:
     """Delete all knowledge and data graph nodes."""
     
-    db.cypher_query("MATCH (n:KnowledgeNode|DataNode) DETACH DELETE n")
+    db.cypher_query("MATCH (n:KnowledgeNode|DataNode|IngestionCheckpoint) DETACH DELETE n")
 
 
 
@@ -23,6 +24,9 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
 
     load_all_knowledge_node_classes()
     
+    # NOTE: all nodes and relationships are collected and written with a few UNWIND statements at the end
+    uow = UnitOfWork()
+    
     # NOTE: build dict to use for passing parameters in node/relationship creation
     # negative numbers used for hard coded dummy data. -1 for study 1
     study_1_id = 1
@@ -91,107 +95,107 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
     logger.debug("loaded ontology node classes")
     
     # Study 1
-    forschung = Forschung.create({
+    forschung = uow.create(Forschung, {
         **knowledge_graph_parameters_dict_1,
         "stakeholder_id": str(uuid4())
-    })[0]
-    studie0 = Studie.create(knowledge_graph_parameters_dict_1)[0]
-    
-    studieninformationen = Studieninformationen.create(knowledge_graph_parameters_dict_1)[0]
-    studienname = Studienname.create(knowledge_graph_parameters_dict_1)[0]
-    studienzweck = Studienzweck.create(knowledge_graph_parameters_dict_1)[0]
-    beschreibungstext = Beschreibungstext.create(knowledge_graph_parameters_dict_1)[0]
-    startdatum = Startdatum.create(knowledge_graph_parameters_dict_1)[0]
-    enddatum = Enddatum.create(knowledge_graph_parameters_dict_1)[0]
-    drks_id = DRKSID.create(knowledge_graph_parameters_dict_1)[0]
-    studien_id = StudienID.create(knowledge_graph_parameters_dict_1)[0]
-    
-    datenerhebung = Datenerhebung.create(knowledge_graph_parameters_dict_1)[0]
-    fragebogen0 = Fragebogen.create(knowledge_graph_parameters_dict_1)[0]
-    item0 = Item.create(knowledge_graph_parameters_dict_1)[0]
-    item1 = Item.create(knowledge_graph_parameters_dict_1)[0]
-    spalten_id0 = SpaltenID.create(knowledge_graph_parameters_dict_1)[0]
-    spalten_id1 = SpaltenID.create(knowledge_graph_parameters_dict_1)[0]
-    metadaten0 = Metadaten.create(knowledge_graph_parameters_dict_1)[0]
-    metadaten1 = Metadaten.create(knowledge_graph_parameters_dict_1)[0]
-    feldname0 = Feldname.create(knowledge_graph_parameters_dict_1)[0]
-    feldname1 = Feldname.create(knowledge_graph_parameters_dict_1)[0]
-    
-    fragebogenname = Fragebogenname.create(knowledge_graph_parameters_dict_1)[0]
-    fragebogen_id = FragebogenID.create(knowledge_graph_parameters_dict_1)[0]
+    })
+    studie0 = uow.create(Studie, knowledge_graph_parameters_dict_1)
+    
+    studieninformationen = uow.create(Studieninformationen, knowledge_graph_parameters_dict_1)
+    studienname = uow.create(Studienname, knowledge_graph_parameters_dict_1)
+    studienzweck = uow.create(Studienzweck, knowledge_graph_parameters_dict_1)
+    beschreibungstext = uow.create(Beschreibungstext, knowledge_graph_parameters_dict_1)
+    startdatum = uow.create(Startdatum, knowledge_graph_parameters_dict_1)
+    enddatum = uow.create(Enddatum, knowledge_graph_parameters_dict_1)
+    drks_id = uow.create(DRKSID, knowledge_graph_parameters_dict_1)
+    studien_id = uow.create(StudienID, knowledge_graph_parameters_dict_1)
+    
+    datenerhebung = uow.create(Datenerhebung, knowledge_graph_parameters_dict_1)
+    fragebogen0 = uow.create(Fragebogen, knowledge_graph_parameters_dict_1)
+    item0 = uow.create(Item, knowledge_graph_parameters_dict_1)
+    item1 = uow.create(Item, knowledge_graph_parameters_dict_1)
+    spalten_id0 = uow.create(SpaltenID, knowledge_graph_parameters_dict_1)
+    spalten_id1 = uow.create(SpaltenID, knowledge_graph_parameters_dict_1)
+    metadaten0 = uow.create(Metadaten, knowledge_graph_parameters_dict_1)
+    metadaten1 = uow.create(Metadaten, knowledge_graph_parameters_dict_1)
+    feldname0 = uow.create(Feldname, knowledge_graph_parameters_dict_1)
+    feldname1 = uow.create(Feldname, knowledge_graph_parameters_dict_1)
+    
+    fragebogenname = uow.create(Fragebogenname, knowledge_graph_parameters_dict_1)
+    fragebogen_id = uow.create(FragebogenID, knowledge_graph_parameters_dict_1)
     
     # study info data node creation
-    data_node_studienname = DataNode.create({"value": "First test Study"})
-    data_node_studienzweck = DataNode.create({"value": "FEASIBILITY_CHECK"})
-    data_node_beschreibungstext = DataNode.create({"value": "Simple test study to test knowledge graph creation"})
-    data_node_startdatum = DataNode.create({"value": "2025-04-20"})
-    data_node_enddatum = DataNode.create({"value": "2025-04-20"})
-    data_node_drksid = DataNode.create({"value": "DRKS000Test01"})
+    data_node_studienname = uow.create(DataNode, {"value": "First test Study"})
+    data_node_studienzweck = uow.create(DataNode, {"value": "FEASIBILITY_CHECK"})
+    data_node_beschreibungstext = uow.create(DataNode, {"value": "Simple test study to test knowledge graph creation"})
+    data_node_startdatum = uow.create(DataNode, {"value": "2025-04-20"})
+    data_node_enddatum = uow.create(DataNode, {"value": "2025-04-20"})
+    data_node_drksid = uow.create(DataNode, {"value": "DRKS000Test01"})
     
     
     #NOTE: how do we deal with studien-ID? -> just use id from the realtional study model
     #data_node_studienid = DataNode.create({"value": "1"})
-    data_node_studienid = DataNode.create({"value": str(study_1_id)})
+    data_node_studienid = uow.create(DataNode, {"value": str(study_1_id)})
     
     
-    data_node_spalten_id0 = DataNode.create({"value": "0"})
-    data_node_spalten_id1 = DataNode.create({"value": "1"})
-    data_node_feldname0 = DataNode.create({"value": "Trustcenter-ID"})
-    data_node_feldname1 = DataNode.create({"value": "Alter"})
+    data_node_spalten_id0 = uow.create(DataNode, {"value": "0"})
+    data_node_spalten_id1 = uow.create(DataNode, {"value": "1"})
+    data_node_feldname0 = uow.create(DataNode, {"value": "Trustcenter-ID"})
+    data_node_feldname1 = uow.create(DataNode, {"value": "Alter"})
     
-    data_node_fragebogenname = DataNode.create({"value": "Test_codebook_1"})
+    data_node_fragebogenname = uow.create(DataNode, {"value": "Test_codebook_1"})
     
     #NOTE: how do we deal with fragebogen-ID? -> just use id from the realtional codebook model
-    data_node_fragebogen_id = DataNode.create({"value": "1"})
-    fragebogen_id.current_data.connect(data_node_fragebogen_id[0])
+    data_node_fragebogen_id = uow.create(DataNode, {"value": "1"})
+    uow.connect(fragebogen_id, "current_data", data_node_fragebogen_id)
     
-    fragebogenname.current_data.connect(data_node_fragebogenname[0])
+    uow.connect(fragebogenname, "current_data", data_node_fragebogenname)
     
     
-    forschung.erstellt_studie.connect(studie0, knowledge_graph_parameters_dict_1)
-    studie0.hat_datenerhebung.connect(datenerhebung)
+    uow.connect(forschung, "erstellt_studie", studie0, knowledge_graph_parameters_dict_1)
+    uow.connect(studie0, "hat_datenerhebung", datenerhebung)
     
-    studie0.hat_studieninformationen.connect(studieninformationen, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_studienname.connect(studienname, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_studienzweck.connect(studienzweck, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_beschreibungstext.connect(beschreibungstext, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_startdatum.connect(startdatum, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_enddatum.connect(enddatum, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_drksid.connect(drks_id, knowledge_graph_parameters_dict_1)
-    studieninformationen.hat_studienid.connect(studien_id, knowledge_graph_parameters_dict_1)
+    uow.connect(studie0, "hat_studieninformationen", studieninformationen, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_studienname", studienname, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_studienzweck", studienzweck, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_beschreibungstext", beschreibungstext, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_startdatum", startdatum, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_enddatum", enddatum, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_drksid", drks_id, knowledge_graph_parameters_dict_1)
+    uow.connect(studieninformationen, "hat_studienid", studien_id, knowledge_graph_parameters_dict_1)
     
     # study information data node connection
-    studienname.current_data.connect(data_node_studienname[0])
-    studienzweck.current_data.connect(data_node_studienzweck[0])
-    beschreibungstext.current_data.connect(data_node_beschreibungstext[0])
-    startdatum.current_data.connect(data_node_startdatum[0])
-    enddatum.current_data.connect(data_node_enddatum[0])
-    drks_id.current_data.connect(data_node_drksid[0])
-    studien_id.current_data.connect(data_node_studienid[0])
+    uow.connect(studienname, "current_data", data_node_studienname)
+    uow.connect(studienzweck, "current_data", data_node_studienzweck)
+    uow.connect(beschreibungstext, "current_data", data_node_beschreibungstext)
+    uow.connect(startdatum, "current_data", data_node_startdatum)
+    uow.connect(enddatum, "current_data", data_node_enddatum)
+    uow.connect(drks_id, "current_data", data_node_drksid)
+    uow.connect(studien_id, "current_data", data_node_studienid)
     
     
-    datenerhebung.hat_fragebogen.connect(fragebogen0, knowledge_graph_parameters_dict_1)
+    uow.connect(datenerhebung, "hat_fragebogen", fragebogen0, knowledge_graph_parameters_dict_1)
     
-    fragebogen0.hat_fragebogenname.connect(fragebogenname, knowledge_graph_parameters_dict_1)
+    uow.connect(fragebogen0, "hat_fragebogenname", fragebogenname, knowledge_graph_parameters_dict_1)
     
     
-    fragebogen0.hat_fragebogenid.connect(fragebogen_id, knowledge_graph_parameters_dict_1)
+    uow.connect(fragebogen0, "hat_fragebogenid", fragebogen_id, knowledge_graph_parameters_dict_1)
     
-    fragebogen0.hat_item.connect(item0, knowledge_graph_parameters_dict_1)        
-    item0.hat_metadaten.connect(metadaten0, knowledge_graph_parameters_dict_1)
-    item0.hat_spaltenid.connect(spalten_id0, knowledge_graph_parameters_dict_1)
-    metadaten0.hat_feldname.connect(feldname0, knowledge_graph_parameters_dict_1)
+    uow.connect(fragebogen0, "hat_item", item0, knowledge_graph_parameters_dict_1)
+    uow.connect(item0, "hat_metadaten", metadaten0, knowledge_graph_parameters_dict_1)
+    uow.connect(item0, "hat_spaltenid", spalten_id0, knowledge_graph_parameters_dict_1)
+    uow.connect(metadaten0, "hat_feldname", feldname0, knowledge_graph_parameters_dict_1)
 
-    spalten_id0.current_data.connect(data_node_spalten_id0[0])
-    feldname0.current_data.connect(data_node_feldname0[0])
+    uow.connect(spalten_id0, "current_data", data_node_spalten_id0)
+    uow.connect(feldname0, "current_data", data_node_feldname0)
     
-    fragebogen0.hat_item.connect(item1, knowledge_graph_parameters_dict_1)
-    item1.hat_metadaten.connect(metadaten1, knowledge_graph_parameters_dict_1)
-    item1.hat_spaltenid.connect(spalten_id1, knowledge_graph_parameters_dict_1)
-    metadaten1.hat_feldname.connect(feldname1, knowledge_graph_parameters_dict_1)
+    uow.connect(fragebogen0, "hat_item", item1, knowledge_graph_parameters_dict_1)
+    uow.connect(item1, "hat_metadaten", metadaten1, knowledge_graph_parameters_dict_1)
+    uow.connect(item1, "hat_spaltenid", spalten_id1, knowledge_graph_parameters_dict_1)
+    uow.connect(metadaten1, "hat_feldname", feldname1, knowledge_graph_parameters_dict_1)
     
-    spalten_id1.current_data.connect(data_node_spalten_id1[0])
-    feldname1.current_data.connect(data_node_feldname1[0])
+    uow.connect(spalten_id1, "current_data", data_node_spalten_id1)
+    uow.connect(feldname1, "current_data", data_node_feldname1)
     
     # NOTE: Study 2
     # Study 2
@@ -200,111 +204,111 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
     # negative numbers used for hard coded dummy data. -2 for study 2
     knowledge_graph_parameters_dict_2 = {"graph_id": study_2_id, "is_verified": False}
     
-    forschung = Forschung.create({
+    forschung = uow.create(Forschung, {
         **knowledge_graph_parameters_dict_2,
         "stakeholder_id": str(uuid4())
-    })[0]
-    studie1 = Studie.create(knowledge_graph_parameters_dict_2)[0]
-    
-    studieninformationen = Studieninformationen.create(knowledge_graph_parameters_dict_2)[0]
-    studienname = Studienname.create(knowledge_graph_parameters_dict_2)[0]
-    studienzweck = Studienzweck.create(knowledge_graph_parameters_dict_2)[0]
-    beschreibungstext = Beschreibungstext.create(knowledge_graph_parameters_dict_2)[0]
-    startdatum = Startdatum.create(knowledge_graph_parameters_dict_2)[0]
-    enddatum = Enddatum.create(knowledge_graph_parameters_dict_2)[0]
-    drks_id = DRKSID.create(knowledge_graph_parameters_dict_2)[0]
-    studien_id = StudienID.create(knowledge_graph_parameters_dict_2)[0]
-    
-    datenerhebung = Datenerhebung.create(knowledge_graph_parameters_dict_2)[0]
-    fragebogen1 = Fragebogen.create(knowledge_graph_parameters_dict_2)[0]
-    item2 = Item.create(knowledge_graph_parameters_dict_2)[0]
-    item3 = Item.create(knowledge_graph_parameters_dict_2)[0]
-    spalten_id2 = SpaltenID.create(knowledge_graph_parameters_dict_2)[0]
-    spalten_id3 = SpaltenID.create(knowledge_graph_parameters_dict_2)[0]
-    metadaten2 = Metadaten.create(knowledge_graph_parameters_dict_2)[0]
-    metadaten3 = Metadaten.create(knowledge_graph_parameters_dict_2)[0]
-    feldname0 = Feldname.create(knowledge_graph_parameters_dict_2)[0]
-    feldname1 = Feldname.create(knowledge_graph_parameters_dict_2)[0]
-    
-    fragebogenname = Fragebogenname.create(knowledge_graph_parameters_dict_2)[0]
-    fragebogen_id = FragebogenID.create(knowledge_graph_parameters_dict_2)[0]
+    })
+    studie1 = uow.create(Studie, knowledge_graph_parameters_dict_2)
+    
+    studieninformationen = uow.create(Studieninformationen, knowledge_graph_parameters_dict_2)
+    studienname = uow.create(Studienname, knowledge_graph_parameters_dict_2)
+    studienzweck = uow.create(Studienzweck, knowledge_graph_parameters_dict_2)
+    beschreibungstext = uow.create(Beschreibungstext, knowledge_graph_parameters_dict_2)
+    startdatum = uow.create(Startdatum, knowledge_graph_parameters_dict_2)
+    enddatum = uow.create(Enddatum, knowledge_graph_parameters_dict_2)
+    drks_id = uow.create(DRKSID, knowledge_graph_parameters_dict_2)
+    studien_id = uow.create(StudienID, knowledge_graph_parameters_dict_2)
+    
+    datenerhebung = uow.create(Datenerhebung, knowledge_graph_parameters_dict_2)
+    fragebogen1 = uow.create(Fragebogen, knowledge_graph_parameters_dict_2)
+    item2 = uow.create(Item, knowledge_graph_parameters_dict_2)
+    item3 = uow.create(Item, knowledge_graph_parameters_dict_2)
+    spalten_id2 = uow.create(SpaltenID, knowledge_graph_parameters_dict_2)
+    spalten_id3 = uow.create(SpaltenID, knowledge_graph_parameters_dict_2)
+    metadaten2 = uow.create(Metadaten, knowledge_graph_parameters_dict_2)
+    metadaten3 = uow.create(Metadaten, knowledge_graph_parameters_dict_2)
+    feldname0 = uow.create(Feldname, knowledge_graph_parameters_dict_2)
+    feldname1 = uow.create(Feldname, knowledge_graph_parameters_dict_2)
+    
+    fragebogenname = uow.create(Fragebogenname, knowledge_graph_parameters_dict_2)
+    fragebogen_id = uow.create(FragebogenID, knowledge_graph_parameters_dict_2)
     
     # study info data node creation
-    data_node_studienname = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "Second test Study"})
-    data_node_studienzweck = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "FEASIBILITY_CHECK"})
-    data_node_beschreibungstext = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "Simple test study to test knowledge graph creation"})
-    data_node_startdatum = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "2025-04-20"})
-    data_node_enddatum = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "2025-04-20"})
-    data_node_drksid = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "DRKS000Test2"})
+    data_node_studienname = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "Second test Study"})
+    data_node_studienzweck = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "FEASIBILITY_CHECK"})
+    data_node_beschreibungstext = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "Simple test study to test knowledge graph creation"})
+    data_node_startdatum = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "2025-04-20"})
+    data_node_enddatum = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "2025-04-20"})
+    data_node_drksid = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "DRKS000Test2"})
     
     
     #NOTE: how do we deal with studien-ID? -> just use id from the realtional study model
-    data_node_studienid = DataNode.create({**knowledge_graph_parameters_dict_2, "value": str(study_2_id)})
-    data_node_feldname0 = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "Trustcenter-ID"})
-    data_node_feldname1 = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "Alter"})
-    data_node_spalten_id2 = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "0"})
-    data_node_spalten_id3 = DataNode.create({**knowledge_graph_parameters_dict_2, "value": "1"})
+    data_node_studienid = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": str(study_2_id)})
+    data_node_feldname0 = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "Trustcenter-ID"})
+    data_node_feldname1 = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "Alter"})
+    data_node_spalten_id2 = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "0"})
+    data_node_spalten_id3 = uow.create(DataNode, {**knowledge_graph_parameters_dict_2, "value": "1"})
     
     
-    data_node_fragebogenname = DataNode.create({**knowledge_graph_parameters_dict_2,"value": "Test_codebook_1"})
+    data_node_fragebogenname = uow.create(DataNode, {**knowledge_graph_parameters_dict_2,"value": "Test_codebook_1"})
     
     #NOTE: how do we deal with fragebogen-ID? -> just use id from the realtional codebook model
-    data_node_fragebogen_id = DataNode.create({**knowledge_graph_parameters_dict_2,"value": "1"})
-    fragebogen_id.current_data.connect(data_node_fragebogen_id[0], knowledge_graph_parameters_dict_2)
+    data_node_fragebogen_id = uow.create(DataNode, {**knowledge_graph_parameters_dict_2,"value": "1"})
+    uow.connect(fragebogen_id, "current_data", data_node_fragebogen_id, knowledge_graph_parameters_dict_2)
     
-    fragebogenname.current_data.connect(data_node_fragebogenname[0], knowledge_graph_parameters_dict_2)
+    uow.connect(fragebogenname, "current_data", data_node_fragebogenname, knowledge_graph_parameters_dict_2)
     
     
-    forschung.erstellt_studie.connect(studie1, knowledge_graph_parameters_dict_2)
-    studie1.hat_datenerhebung.connect(datenerhebung, knowledge_graph_parameters_dict_2)
+    uow.connect(forschung, "erstellt_studie", studie1, knowledge_graph_parameters_dict_2)
+    uow.connect(studie1, "hat_datenerhebung", datenerhebung, knowledge_graph_parameters_dict_2)
     
-    studie1.hat_studieninformationen.connect(studieninformationen, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_studienname.connect(studienname, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_studienzweck.connect(studienzweck, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_beschreibungstext.connect(beschreibungstext, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_startdatum.connect(startdatum, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_enddatum.connect(enddatum, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_drksid.connect(drks_id, knowledge_graph_parameters_dict_2)
-    studieninformationen.hat_studienid.connect(studien_id, knowledge_graph_parameters_dict_2)
+    uow.connect(studie1, "hat_studieninformationen", studieninformationen, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_studienname", studienname, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_studienzweck", studienzweck, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_beschreibungstext", beschreibungstext, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_startdatum", startdatum, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_enddatum", enddatum, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_drksid", drks_id, knowledge_graph_parameters_dict_2)
+    uow.connect(studieninformationen, "hat_studienid", studien_id, knowledge_graph_parameters_dict_2)
     
     # study information data node connection
-    studienname.current_data.connect(data_node_studienname[0], knowledge_graph_parameters_dict_2)
-    studienzweck.current_data.connect(data_node_studienzweck[0], knowledge_graph_parameters_dict_2)
-    beschreibungstext.current_data.connect(data_node_beschreibungstext[0], knowledge_graph_parameters_dict_2)
-    startdatum.current_data.connect(data_node_startdatum[0], knowledge_graph_parameters_dict_2)
-    enddatum.current_data.connect(data_node_enddatum[0], knowledge_graph_parameters_dict_2)
-    drks_id.current_data.connect(data_node_drksid[0], knowledge_graph_parameters_dict_2)
-    studien_id.current_data.connect(data_node_studienid[0], knowledge_graph_parameters_dict_2)
-    
-    
-    datenerhebung.hat_fragebogen.connect(fragebogen1, knowledge_graph_parameters_dict_2)
-    fragebogen1.hat_fragebogenname.connect(fragebogenname, knowledge_graph_parameters_dict_2)
-    fragebogen1.hat_fragebogenid.connect(fragebogen_id, knowledge_graph_parameters_dict_2)
+    uow.connect(studienname, "current_data", data_node_studienname, knowledge_graph_parameters_dict_2)
+    uow.connect(studienzweck, "current_data", data_node_studienzweck, knowledge_graph_parameters_dict_2)
+    uow.connect(beschreibungstext, "current_data", data_node_beschreibungstext, knowledge_graph_parameters_dict_2)
+    uow.connect(startdatum, "current_data", data_node_startdatum, knowledge_graph_parameters_dict_2)
+    uow.connect(enddatum, "current_data", data_node_enddatum, knowledge_graph_parameters_dict_2)
+    uow.connect(drks_id, "current_data", data_node_drksid, knowledge_graph_parameters_dict_2)
+    uow.connect(studien_id, "current_data", data_node_studienid, knowledge_graph_parameters_dict_2)
+    
+    
+    uow.connect(datenerhebung, "hat_fragebogen", fragebogen1, knowledge_graph_parameters_dict_2)
+    uow.connect(fragebogen1, "hat_fragebogenname", fragebogenname, knowledge_graph_parameters_dict_2)
+    uow.connect(fragebogen1, "hat_fragebogenid", fragebogen_id, knowledge_graph_parameters_dict_2)
    
     
-    fragebogen1.hat_item.connect(item2, knowledge_graph_parameters_dict_2)        
-    item2.hat_metadaten.connect(metadaten2, knowledge_graph_parameters_dict_2)
-    item2.hat_spaltenid.connect(spalten_id2, knowledge_graph_parameters_dict_2)
-    metadaten2.hat_feldname.connect(feldname0, knowledge_graph_parameters_dict_2)
+    uow.connect(fragebogen1, "hat_item", item2, knowledge_graph_parameters_dict_2)
+    uow.connect(item2, "hat_metadaten", metadaten2, knowledge_graph_parameters_dict_2)
+    uow.connect(item2, "hat_spaltenid", spalten_id2, knowledge_graph_parameters_dict_2)
+    uow.connect(metadaten2, "hat_feldname", feldname0, knowledge_graph_parameters_dict_2)
 
-    spalten_id2.current_data.connect(data_node_spalten_id2[0], knowledge_graph_parameters_dict_2)
-    feldname0.current_data.connect(data_node_feldname0[0], knowledge_graph_parameters_dict_2)
+    uow.connect(spalten_id2, "current_data", data_node_spalten_id2, knowledge_graph_parameters_dict_2)
+    uow.connect(feldname0, "current_data", data_node_feldname0, knowledge_graph_parameters_dict_2)
     
     
-    fragebogen1.hat_item.connect(item3, knowledge_graph_parameters_dict_2)
-    item3.hat_metadaten.connect(metadaten3, knowledge_graph_parameters_dict_2)
-    item3.hat_spaltenid.connect(spalten_id3, knowledge_graph_parameters_dict_2)
-    metadaten3.hat_feldname.connect(feldname1, knowledge_graph_parameters_dict_2)    
+    uow.connect(fragebogen1, "hat_item", item3, knowledge_graph_parameters_dict_2)
+    uow.connect(item3, "hat_metadaten", metadaten3, knowledge_graph_parameters_dict_2)
+    uow.connect(item3, "hat_spaltenid", spalten_id3, knowledge_graph_parameters_dict_2)
+    uow.connect(metadaten3, "hat_feldname", feldname1, knowledge_graph_parameters_dict_2)
     
-    spalten_id3.current_data.connect(data_node_spalten_id3[0], knowledge_graph_parameters_dict_2)
-    feldname1.current_data.connect(data_node_feldname1[0], knowledge_graph_parameters_dict_2)
+    uow.connect(spalten_id3, "current_data", data_node_spalten_id3, knowledge_graph_parameters_dict_2)
+    uow.connect(feldname1, "current_data", data_node_feldname1, knowledge_graph_parameters_dict_2)
     
     
     # Study 1 linked item
-    linked_item1 = LinkedItem.create(knowledge_graph_parameters_dict_1)[0]
-    data_node_linked_item1 = DataNode.create({**knowledge_graph_parameters_dict_1, "value": item3.uuid})
-    metadaten1.hat_verknuepftesitemid.connect(linked_item1, knowledge_graph_parameters_dict_1)
-    linked_item1.current_data.connect(data_node_linked_item1[0], knowledge_graph_parameters_dict_1)
+    linked_item1 = uow.create(LinkedItem, knowledge_graph_parameters_dict_1)
+    data_node_linked_item1 = uow.create(DataNode, {**knowledge_graph_parameters_dict_1, "value": item3.uuid})
+    uow.connect(metadaten1, "hat_verknuepftesitemid", linked_item1, knowledge_graph_parameters_dict_1)
+    uow.connect(linked_item1, "current_data", data_node_linked_item1, knowledge_graph_parameters_dict_1)
     
     
     #logger.debug("###################################################################")
@@ -337,53 +341,53 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
     patient_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Patient")
     Patient = patient_node.node_class
     
-    patient1 = Patient.create({**parameter_dict, "stakeholder_id": "0001"})[0]
-    patient2 = Patient.create({**parameter_dict, "stakeholder_id": "0002"})[0]
-    patient3 = Patient.create({**parameter_dict, "stakeholder_id": "0003"})[0]
-    patient4 = Patient.create({**parameter_dict, "stakeholder_id": "0004"})[0]
-    patient5 = Patient.create({**parameter_dict, "stakeholder_id": "0005"})[0]
-    patient6 = Patient.create({**parameter_dict, "stakeholder_id": "0006"})[0]
-    patient7 = Patient.create({**parameter_dict, "stakeholder_id": "0007"})[0]
-    patient8 = Patient.create({**parameter_dict, "stakeholder_id": "0008"})[0]
-    patient9 = Patient.create({**parameter_dict, "stakeholder_id": "0009"})[0]
-    patient10 = Patient.create({**parameter_dict, "stakeholder_id": "00010"})[0]
+    patient1 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0001"})
+    patient2 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0002"})
+    patient3 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0003"})
+    patient4 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0004"})
+    patient5 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0005"})
+    patient6 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0006"})
+    patient7 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0007"})
+    patient8 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0008"})
+    patient9 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "0009"})
+    patient10 = uow.create(Patient, {**parameter_dict, "stakeholder_id": "00010"})
     
     participant_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Teilnehmer")
     Participant = participant_node.node_class
     
-    participant1 = Participant.create({**parameter_dict})[0]
-    participant2 = Participant.create({**parameter_dict})[0]
-    participant3 = Participant.create({**parameter_dict})[0]
-    participant4 = Participant.create({**parameter_dict})[0]
-    participant5 = Participant.create({**parameter_dict})[0]
-    participant6 = Participant.create({**parameter_dict})[0]
-    participant7 = Participant.create({**parameter_dict})[0]
-    participant8 = Participant.create({**parameter_dict})[0]
-    participant9 = Participant.create({**parameter_dict})[0]
-    participant10 = Participant.create({**parameter_dict})[0]
+    participant1 = uow.create(Participant, {**parameter_dict})
+    participant2 = uow.create(Participant, {**parameter_dict})
+    participant3 = uow.create(Participant, {**parameter_dict})
+    participant4 = uow.create(Participant, {**parameter_dict})
+    participant5 = uow.create(Participant, {**parameter_dict})
+    participant6 = uow.create(Participant, {**parameter_dict})
+    participant7 = uow.create(Participant, {**parameter_dict})
+    participant8 = uow.create(Participant, {**parameter_dict})
+    participant9 = uow.create(Participant, {**parameter_dict})
+    participant10 = uow.create(Participant, {**parameter_dict})
     
     # Link patients to participants and link participants to study
-    patient1.ist_teilnehmer.connect(participant1, parameter_dict)
-    patient2.ist_teilnehmer.connect(participant2, parameter_dict)
-    patient3.ist_teilnehmer.connect(participant3, parameter_dict)
-    patient4.ist_teilnehmer.connect(participant4, parameter_dict)
-    patient5.ist_teilnehmer.connect(participant5, parameter_dict)
-    patient6.ist_teilnehmer.connect(participant6, parameter_dict)
-    patient7.ist_teilnehmer.connect(participant7, parameter_dict)
-    patient8.ist_teilnehmer.connect(participant8, parameter_dict)
-    patient9.ist_teilnehmer.connect(participant9, parameter_dict)
-    patient10.ist_teilnehmer.connect(participant10, parameter_dict)
-    
-    studie0.hat_teilnehmer.connect(participant1, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant2, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant3, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant4, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant5, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant6, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant7, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant8, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant9, parameter_dict)
-    studie0.hat_teilnehmer.connect(participant10, parameter_dict)
+    uow.connect(patient1, "ist_teilnehmer", participant1, parameter_dict)
+    uow.connect(patient2, "ist_teilnehmer", participant2, parameter_dict)
+    uow.connect(patient3, "ist_teilnehmer", participant3, parameter_dict)
+    uow.connect(patient4, "ist_teilnehmer", participant4, parameter_dict)
+    uow.connect(patient5, "ist_teilnehmer", participant5, parameter_dict)
+    uow.connect(patient6, "ist_teilnehmer", participant6, parameter_dict)
+    uow.connect(patient7, "ist_teilnehmer", participant7, parameter_dict)
+    uow.connect(patient8, "ist_teilnehmer", participant8, parameter_dict)
+    uow.connect(patient9, "ist_teilnehmer", participant9, parameter_dict)
+    uow.connect(patient10, "ist_teilnehmer", participant10, parameter_dict)
+    
+    uow.connect(studie0, "hat_teilnehmer", participant1, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant2, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant3, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant4, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant5, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant6, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant7, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant8, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant9, parameter_dict)
+    uow.connect(studie0, "hat_teilnehmer", participant10, parameter_dict)
     
     # Create patient ids
     patient_idat_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "PatientIDAT")
@@ -392,112 +396,112 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
     patient_id_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "PatientID")
     PatientID = patient_id_node.node_class
     
-    patient1_node_id = PatientID.create({**parameter_dict})[0]
-    patient1_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient2_node_id = PatientID.create({**parameter_dict})[0]
-    patient2_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient3_node_id = PatientID.create({**parameter_dict})[0]
-    patient3_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient4_node_id = PatientID.create({**parameter_dict})[0]
-    patient4_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient5_node_id = PatientID.create({**parameter_dict})[0]
-    patient5_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient6_node_id = PatientID.create({**parameter_dict})[0]
-    patient6_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient7_node_id = PatientID.create({**parameter_dict})[0]
-    patient7_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient8_node_id = PatientID.create({**parameter_dict})[0]
-    patient8_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient9_node_id = PatientID.create({**parameter_dict})[0]
-    patient9_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    patient10_node_id = PatientID.create({**parameter_dict})[0]
-    patient10_node_idat = PatientIDAT.create({**parameter_dict})[0]
-    
-    patient1_idat = DataNode.create({**parameter_dict, "value": "1"})[0]
-    patient1_id = DataNode.create({**parameter_dict, "value": "1"})[0]
-    patient2_idat = DataNode.create({**parameter_dict, "value": "2"})[0]
-    patient2_id = DataNode.create({**parameter_dict, "value": "2"})[0]
-    patient3_idat = DataNode.create({**parameter_dict, "value": "3"})[0]
-    patient3_id = DataNode.create({**parameter_dict, "value": "3"})[0]
-    patient4_idat = DataNode.create({**parameter_dict, "value": "4"})[0]
-    patient4_id = DataNode.create({**parameter_dict, "value": "4"})[0]
-    patient5_idat = DataNode.create({**parameter_dict, "value": "5"})[0]
-    patient5_id = DataNode.create({**parameter_dict, "value": "5"})[0]
-    patient6_idat = DataNode.create({**parameter_dict, "value": "6"})[0]
-    patient6_id = DataNode.create({**parameter_dict, "value": "6"})[0]
-    patient7_idat = DataNode.create({**parameter_dict, "value": "7"})[0]
-    patient7_id = DataNode.create({**parameter_dict, "value": "7"})[0]
-    patient8_idat = DataNode.create({**parameter_dict, "value": "8"})[0]
-    patient8_id = DataNode.create({**parameter_dict, "value": "8"})[0]
-    patient9_idat = DataNode.create({**parameter_dict, "value": "9"})[0]
-    patient9_id = DataNode.create({**parameter_dict, "value": "9"})[0]
-    patient10_idat = DataNode.create({**parameter_dict, "value": "10"})[0]
-    patient10_id = DataNode.create({**parameter_dict, "value": "10"})[0]
+    patient1_node_id = uow.create(PatientID, {**parameter_dict})
+    patient1_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient2_node_id = uow.create(PatientID, {**parameter_dict})
+    patient2_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient3_node_id = uow.create(PatientID, {**parameter_dict})
+    patient3_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient4_node_id = uow.create(PatientID, {**parameter_dict})
+    patient4_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient5_node_id = uow.create(PatientID, {**parameter_dict})
+    patient5_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient6_node_id = uow.create(PatientID, {**parameter_dict})
+    patient6_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient7_node_id = uow.create(PatientID, {**parameter_dict})
+    patient7_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient8_node_id = uow.create(PatientID, {**parameter_dict})
+    patient8_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient9_node_id = uow.create(PatientID, {**parameter_dict})
+    patient9_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    patient10_node_id = uow.create(PatientID, {**parameter_dict})
+    patient10_node_idat = uow.create(PatientIDAT, {**parameter_dict})
+    
+    patient1_idat = uow.create(DataNode, {**parameter_dict, "value": "1"})
+    patient1_id = uow.create(DataNode, {**parameter_dict, "value": "1"})
+    patient2_idat = uow.create(DataNode, {**parameter_dict, "value": "2"})
+    patient2_id = uow.create(DataNode, {**parameter_dict, "value": "2"})
+    patient3_idat = uow.create(DataNode, {**parameter_dict, "value": "3"})
+    patient3_id = uow.create(DataNode, {**parameter_dict, "value": "3"})
+    patient4_idat = uow.create(DataNode, {**parameter_dict, "value": "4"})
+    patient4_id = uow.create(DataNode, {**parameter_dict, "value": "4"})
+    patient5_idat = uow.create(DataNode, {**parameter_dict, "value": "5"})
+    patient5_id = uow.create(DataNode, {**parameter_dict, "value": "5"})
+    patient6_idat = uow.create(DataNode, {**parameter_dict, "value": "6"})
+    patient6_id = uow.create(DataNode, {**parameter_dict, "value": "6"})
+    patient7_idat = uow.create(DataNode, {**parameter_dict, "value": "7"})
+    patient7_id = uow.create(DataNode, {**parameter_dict, "value": "7"})
+    patient8_idat = uow.create(DataNode, {**parameter_dict, "value": "8"})
+    patient8_id = uow.create(DataNode, {**parameter_dict, "value": "8"})
+    patient9_idat = uow.create(DataNode, {**parameter_dict, "value": "9"})
+    patient9_id = uow.create(DataNode, {**parameter_dict, "value": "9"})
+    patient10_idat = uow.create(DataNode, {**parameter_dict, "value": "10"})
+    patient10_id = uow.create(DataNode, {**parameter_dict, "value": "10"})
     
     # Connect patient ids
-    patient1.hat_patientid.connect(patient1_node_id, parameter_dict)
-    patient1.hat_patientidat.connect(patient1_node_idat, parameter_dict)
-    patient2.hat_patientid.connect(patient2_node_id, parameter_dict)
-    patient2.hat_patientidat.connect(patient2_node_idat, parameter_dict)
-    patient3.hat_patientid.connect(patient3_node_id, parameter_dict)
-    patient3.hat_patientidat.connect(patient3_node_idat, parameter_dict)
-    patient4.hat_patientid.connect(patient4_node_id, parameter_dict)
-    patient4.hat_patientidat.connect(patient4_node_idat, parameter_dict)
-    patient5.hat_patientid.connect(patient5_node_id, parameter_dict)
-    patient5.hat_patientidat.connect(patient5_node_idat, parameter_dict)
-    patient6.hat_patientid.connect(patient6_node_id, parameter_dict)
-    patient6.hat_patientidat.connect(patient6_node_idat, parameter_dict)
-    patient7.hat_patientid.connect(patient7_node_id, parameter_dict)
-    patient7.hat_patientidat.connect(patient7_node_idat, parameter_dict)
-    patient8.hat_patientid.connect(patient8_node_id, parameter_dict)
-    patient8.hat_patientidat.connect(patient8_node_idat, parameter_dict)
-    patient9.hat_patientid.connect(patient9_node_id, parameter_dict)
-    patient9.hat_patientidat.connect(patient9_node_idat, parameter_dict)
-    patient10.hat_patientid.connect(patient10_node_id, parameter_dict)
-    patient10.hat_patientidat.connect(patient10_node_idat, parameter_dict)
+    uow.connect(patient1, "hat_patientid", patient1_node_id, parameter_dict)
+    uow.connect(patient1, "hat_patientidat", patient1_node_idat, parameter_dict)
+    uow.connect(patient2, "hat_patientid", patient2_node_id, parameter_dict)
+    uow.connect(patient2, "hat_patientidat", patient2_node_idat, parameter_dict)
+    uow.connect(patient3, "hat_patientid", patient3_node_id, parameter_dict)
+    uow.connect(patient3, "hat_patientidat", patient3_node_idat, parameter_dict)
+    uow.connect(patient4, "hat_patientid", patient4_node_id, parameter_dict)
+    uow.connect(patient4, "hat_patientidat", patient4_node_idat, parameter_dict)
+    uow.connect(patient5, "hat_patientid", patient5_node_id, parameter_dict)
+    uow.connect(patient5, "hat_patientidat", patient5_node_idat, parameter_dict)
+    uow.connect(patient6, "hat_patientid", patient6_node_id, parameter_dict)
+    uow.connect(patient6, "hat_patientidat", patient6_node_idat, parameter_dict)
+    uow.connect(patient7, "hat_patientid", patient7_node_id, parameter_dict)
+    uow.connect(patient7, "hat_patientidat", patient7_node_idat, parameter_dict)
+    uow.connect(patient8, "hat_patientid", patient8_node_id, parameter_dict)
+    uow.connect(patient8, "hat_patientidat", patient8_node_idat, parameter_dict)
+    uow.connect(patient9, "hat_patientid", patient9_node_id, parameter_dict)
+    uow.connect(patient9, "hat_patientidat", patient9_node_idat, parameter_dict)
+    uow.connect(patient10, "hat_patientid", patient10_node_id, parameter_dict)
+    uow.connect(patient10, "hat_patientidat", patient10_node_idat, parameter_dict)
     
     if SET_DATA_UNVERIFIED:
-        patient1_node_id.in_review.connect(patient1_idat, parameter_dict)
-        patient1_node_idat.in_review.connect(patient1_id, parameter_dict)
-        patient2_node_id.in_review.connect(patient2_idat, parameter_dict)
-        patient2_node_idat.in_review.connect(patient2_id, parameter_dict)
-        patient3_node_id.in_review.connect(patient3_idat, parameter_dict)
-        patient3_node_idat.in_review.connect(patient3_id, parameter_dict)
-        patient4_node_id.in_review.connect(patient4_idat, parameter_dict)
-        patient4_node_idat.in_review.connect(patient4_id, parameter_dict)
-        patient5_node_id.in_review.connect(patient5_idat, parameter_dict)
-        patient5_node_idat.in_review.connect(patient5_id, parameter_dict)
-        patient6_node_id.in_review.connect(patient6_idat, parameter_dict)
-        patient6_node_idat.in_review.connect(patient6_id, parameter_dict)
-        patient7_node_id.in_review.connect(patient7_idat, parameter_dict)
-        patient7_node_idat.in_review.connect(patient7_id, parameter_dict)
-        patient8_node_id.in_review.connect(patient8_idat, parameter_dict)
-        patient8_node_idat.in_review.connect(patient8_id, parameter_dict)
-        patient9_node_id.in_review.connect(patient9_idat, parameter_dict)
-        patient9_node_idat.in_review.connect(patient9_id, parameter_dict)
-        patient10_node_id.in_review.connect(patient10_idat, parameter_dict)
-        patient10_node_idat.in_review.connect(patient10_id, parameter_dict)
+        uow.connect(patient1_node_id, "in_review", patient1_idat, parameter_dict)
+        uow.connect(patient1_node_idat, "in_review", patient1_id, parameter_dict)
+        uow.connect(patient2_node_id, "in_review", patient2_idat, parameter_dict)
+        uow.connect(patient2_node_idat, "in_review", patient2_id, parameter_dict)
+        uow.connect(patient3_node_id, "in_review", patient3_idat, parameter_dict)
+        uow.connect(patient3_node_idat, "in_review", patient3_id, parameter_dict)
+        uow.connect(patient4_node_id, "in_review", patient4_idat, parameter_dict)
+        uow.connect(patient4_node_idat, "in_review", patient4_id, parameter_dict)
+        uow.connect(patient5_node_id, "in_review", patient5_idat, parameter_dict)
+        uow.connect(patient5_node_idat, "in_review", patient5_id, parameter_dict)
+        uow.connect(patient6_node_id, "in_review", patient6_idat, parameter_dict)
+        uow.connect(patient6_node_idat, "in_review", patient6_id, parameter_dict)
+        uow.connect(patient7_node_id, "in_review", patient7_idat, parameter_dict)
+        uow.connect(patient7_node_idat, "in_review", patient7_id, parameter_dict)
+        uow.connect(patient8_node_id, "in_review", patient8_idat, parameter_dict)
+        uow.connect(patient8_node_idat, "in_review", patient8_id, parameter_dict)
+        uow.connect(patient9_node_id, "in_review", patient9_idat, parameter_dict)
+        uow.connect(patient9_node_idat, "in_review", patient9_id, parameter_dict)
+        uow.connect(patient10_node_id, "in_review", patient10_idat, parameter_dict)
+        uow.connect(patient10_node_idat, "in_review", patient10_id, parameter_dict)
     else:
-        patient1_node_id.current_data.connect(patient1_idat, parameter_dict)
-        patient1_node_idat.current_data.connect(patient1_id, parameter_dict)
-        patient2_node_id.current_data.connect(patient2_idat, parameter_dict)
-        patient2_node_idat.current_data.connect(patient2_id, parameter_dict)
-        patient3_node_id.current_data.connect(patient3_idat, parameter_dict)
-        patient3_node_idat.current_data.connect(patient3_id, parameter_dict)
-        patient4_node_id.current_data.connect(patient4_idat, parameter_dict)
-        patient4_node_idat.current_data.connect(patient4_id, parameter_dict)
-        patient5_node_id.current_data.connect(patient5_idat, parameter_dict)
-        patient5_node_idat.current_data.connect(patient5_id, parameter_dict)
-        patient6_node_id.current_data.connect(patient6_idat, parameter_dict)
-        patient6_node_idat.current_data.connect(patient6_id, parameter_dict)
-        patient7_node_id.current_data.connect(patient7_idat, parameter_dict)
-        patient7_node_idat.current_data.connect(patient7_id, parameter_dict)
-        patient8_node_id.current_data.connect(patient8_idat, parameter_dict)
-        patient8_node_idat.current_data.connect(patient8_id, parameter_dict)
-        patient9_node_id.current_data.connect(patient9_idat, parameter_dict)
-        patient9_node_idat.current_data.connect(patient9_id, parameter_dict)
-        patient10_node_id.current_data.connect(patient10_idat, parameter_dict)
-        patient10_node_idat.current_data.connect(patient10_id, parameter_dict)
+        uow.connect(patient1_node_id, "current_data", patient1_idat, parameter_dict)
+        uow.connect(patient1_node_idat, "current_data", patient1_id, parameter_dict)
+        uow.connect(patient2_node_id, "current_data", patient2_idat, parameter_dict)
+        uow.connect(patient2_node_idat, "current_data", patient2_id, parameter_dict)
+        uow.connect(patient3_node_id, "current_data", patient3_idat, parameter_dict)
+        uow.connect(patient3_node_idat, "current_data", patient3_id, parameter_dict)
+        uow.connect(patient4_node_id, "current_data", patient4_idat, parameter_dict)
+        uow.connect(patient4_node_idat, "current_data", patient4_id, parameter_dict)
+        uow.connect(patient5_node_id, "current_data", patient5_idat, parameter_dict)
+        uow.connect(patient5_node_idat, "current_data", patient5_id, parameter_dict)
+        uow.connect(patient6_node_id, "current_data", patient6_idat, parameter_dict)
+        uow.connect(patient6_node_idat, "current_data", patient6_id, parameter_dict)
+        uow.connect(patient7_node_id, "current_data", patient7_idat, parameter_dict)
+        uow.connect(patient7_node_idat, "current_data", patient7_id, parameter_dict)
+        uow.connect(patient8_node_id, "current_data", patient8_idat, parameter_dict)
+        uow.connect(patient8_node_idat, "current_data", patient8_id, parameter_dict)
+        uow.connect(patient9_node_id, "current_data", patient9_idat, parameter_dict)
+        uow.connect(patient9_node_idat, "current_data", patient9_id, parameter_dict)
+        uow.connect(patient10_node_id, "current_data", patient10_idat, parameter_dict)
+        uow.connect(patient10_node_idat, "current_data", patient10_id, parameter_dict)
         
     # Create answers, answer groups and rowIDs
     answer_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Antwort")
@@ -509,310 +513,312 @@ def create_example_knowledge_graph_for_study_codebook(request) -> None:
     answer_group_id_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "ReihenID")
     AnswerGroupID = answer_group_id_node.node_class
     
-    patient1_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient2_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient3_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient4_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient5_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient6_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient7_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient8_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient9_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    patient10_answer_group = AnswerGroup.create({**parameter_dict})[0]
-    
-    patient1_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient2_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient3_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient4_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient5_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient6_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient7_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient8_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient9_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    patient10_answer_group_id = AnswerGroupID.create({**parameter_dict})[0]
-    
-    patient1_answer1 = Answer.create({**parameter_dict})[0]
-    patient1_answer2 = Answer.create({**parameter_dict})[0]
-    patient2_answer1 = Answer.create({**parameter_dict})[0]
-    patient2_answer2 = Answer.create({**parameter_dict})[0]
-    patient3_answer1 = Answer.create({**parameter_dict})[0]
-    patient3_answer2 = Answer.create({**parameter_dict})[0]
-    patient4_answer1 = Answer.create({**parameter_dict})[0]
-    patient4_answer2 = Answer.create({**parameter_dict})[0]
-    patient5_answer1 = Answer.create({**parameter_dict})[0]
-    patient5_answer2 = Answer.create({**parameter_dict})[0]
-    patient6_answer1 = Answer.create({**parameter_dict})[0]
-    patient6_answer2 = Answer.create({**parameter_dict})[0]
-    patient7_answer1 = Answer.create({**parameter_dict})[0]
-    patient7_answer2 = Answer.create({**parameter_dict})[0]
-    patient8_answer1 = Answer.create({**parameter_dict})[0]
-    patient8_answer2 = Answer.create({**parameter_dict})[0]
-    patient9_answer1 = Answer.create({**parameter_dict})[0]
-    patient9_answer2 = Answer.create({**parameter_dict})[0]
-    patient10_answer1 = Answer.create({**parameter_dict})[0]
-    patient10_answer2 = Answer.create({**parameter_dict})[0]
+    patient1_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient2_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient3_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient4_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient5_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient6_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient7_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient8_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient9_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    patient10_answer_group = uow.create(AnswerGroup, {**parameter_dict})
+    
+    patient1_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient2_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient3_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient4_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient5_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient6_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient7_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient8_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient9_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    patient10_answer_group_id = uow.create(AnswerGroupID, {**parameter_dict})
+    
+    patient1_answer1 = uow.create(Answer, {**parameter_dict})
+    patient1_answer2 = uow.create(Answer, {**parameter_dict})
+    patient2_answer1 = uow.create(Answer, {**parameter_dict})
+    patient2_answer2 = uow.create(Answer, {**parameter_dict})
+    patient3_answer1 = uow.create(Answer, {**parameter_dict})
+    patient3_answer2 = uow.create(Answer, {**parameter_dict})
+    patient4_answer1 = uow.create(Answer, {**parameter_dict})
+    patient4_answer2 = uow.create(Answer, {**parameter_dict})
+    patient5_answer1 = uow.create(Answer, {**parameter_dict})
+    patient5_answer2 = uow.create(Answer, {**parameter_dict})
+    patient6_answer1 = uow.create(Answer, {**parameter_dict})
+    patient6_answer2 = uow.create(Answer, {**parameter_dict})
+    patient7_answer1 = uow.create(Answer, {**parameter_dict})
+    patient7_answer2 = uow.create(Answer, {**parameter_dict})
+    patient8_answer1 = uow.create(Answer, {**parameter_dict})
+    patient8_answer2 = uow.create(Answer, {**parameter_dict})
+    patient9_answer1 = uow.create(Answer, {**parameter_dict})
+    patient9_answer2 = uow.create(Answer, {**parameter_dict})
+    patient10_answer1 = uow.create(Answer, {**parameter_dict})
+    patient10_answer2 = uow.create(Answer, {**parameter_dict})
     
     # Connect answers, answer groups and rowIDs
-    participant1.gibt_antwortgruppe.connect(patient1_answer_group, parameter_dict)
-    participant2.gibt_antwortgruppe.connect(patient2_answer_group, parameter_dict)
-    participant3.gibt_antwortgruppe.connect(patient3_answer_group, parameter_dict)
-    participant4.gibt_antwortgruppe.connect(patient4_answer_group, parameter_dict)
-    participant5.gibt_antwortgruppe.connect(patient5_answer_group, parameter_dict)
-    participant6.gibt_antwortgruppe.connect(patient6_answer_group, parameter_dict)
-    participant7.gibt_antwortgruppe.connect(patient7_answer_group, parameter_dict)
-    participant8.gibt_antwortgruppe.connect(patient8_answer_group, parameter_dict)
-    participant9.gibt_antwortgruppe.connect(patient9_answer_group, parameter_dict)
-    participant10.gibt_antwortgruppe.connect(patient10_answer_group, parameter_dict)
-    
-    patient1_answer_group.hat_reihenid.connect(patient1_answer_group_id, parameter_dict)
-    patient2_answer_group.hat_reihenid.connect(patient2_answer_group_id, parameter_dict)
-    patient3_answer_group.hat_reihenid.connect(patient3_answer_group_id, parameter_dict)
-    patient4_answer_group.hat_reihenid.connect(patient4_answer_group_id, parameter_dict)
-    patient5_answer_group.hat_reihenid.connect(patient5_answer_group_id, parameter_dict)
-    patient6_answer_group.hat_reihenid.connect(patient6_answer_group_id, parameter_dict)
-    patient7_answer_group.hat_reihenid.connect(patient7_answer_group_id, parameter_dict)
-    patient8_answer_group.hat_reihenid.connect(patient8_answer_group_id, parameter_dict)
-    patient9_answer_group.hat_reihenid.connect(patient9_answer_group_id, parameter_dict)
-    patient10_answer_group.hat_reihenid.connect(patient10_answer_group_id, parameter_dict)
+    uow.connect(participant1, "gibt_antwortgruppe", patient1_answer_group, parameter_dict)
+    uow.connect(participant2, "gibt_antwortgruppe", patient2_answer_group, parameter_dict)
+    uow.connect(participant3, "gibt_antwortgruppe", patient3_answer_group, parameter_dict)
+    uow.connect(participant4, "gibt_antwortgruppe", patient4_answer_group, parameter_dict)
+    uow.connect(participant5, "gibt_antwortgruppe", patient5_answer_group, parameter_dict)
+    uow.connect(participant6, "gibt_antwortgruppe", patient6_answer_group, parameter_dict)
+    uow.connect(participant7, "gibt_antwortgruppe", patient7_answer_group, parameter_dict)
+    uow.connect(participant8, "gibt_antwortgruppe", patient8_answer_group, parameter_dict)
+    uow.connect(participant9, "gibt_antwortgruppe", patient9_answer_group, parameter_dict)
+    uow.connect(participant10, "gibt_antwortgruppe", patient10_answer_group, parameter_dict)
+    
+    uow.connect(patient1_answer_group, "hat_reihenid", patient1_answer_group_id, parameter_dict)
+    uow.connect(patient2_answer_group, "hat_reihenid", patient2_answer_group_id, parameter_dict)
+    uow.connect(patient3_answer_group, "hat_reihenid", patient3_answer_group_id, parameter_dict)
+    uow.connect(patient4_answer_group, "hat_reihenid", patient4_answer_group_id, parameter_dict)
+    uow.connect(patient5_answer_group, "hat_reihenid", patient5_answer_group_id, parameter_dict)
+    uow.connect(patient6_answer_group, "hat_reihenid", patient6_answer_group_id, parameter_dict)
+    uow.connect(patient7_answer_group, "hat_reihenid", patient7_answer_group_id, parameter_dict)
+    uow.connect(patient8_answer_group, "hat_reihenid", patient8_answer_group_id, parameter_dict)
+    uow.connect(patient9_answer_group, "hat_reihenid", patient9_answer_group_id, parameter_dict)
+    uow.connect(patient10_answer_group, "hat_reihenid", patient10_answer_group_id, parameter_dict)
 
-    patient1_answer_group.hat_antwort.connect(patient1_answer1, parameter_dict)
-    patient1_answer_group.hat_antwort.connect(patient1_answer2, parameter_dict)
-    patient2_answer_group.hat_antwort.connect(patient2_answer1, parameter_dict)
-    patient2_answer_group.hat_antwort.connect(patient2_answer2, parameter_dict)
-    patient3_answer_group.hat_antwort.connect(patient3_answer1, parameter_dict)
-    patient3_answer_group.hat_antwort.connect(patient3_answer2, parameter_dict)
-    patient4_answer_group.hat_antwort.connect(patient4_answer1, parameter_dict)
-    patient4_answer_group.hat_antwort.connect(patient4_answer2, parameter_dict)
-    patient5_answer_group.hat_antwort.connect(patient5_answer1, parameter_dict)
-    patient5_answer_group.hat_antwort.connect(patient5_answer2, parameter_dict)
-    patient6_answer_group.hat_antwort.connect(patient6_answer1, parameter_dict)
-    patient6_answer_group.hat_antwort.connect(patient6_answer2, parameter_dict)
-    patient7_answer_group.hat_antwort.connect(patient7_answer1, parameter_dict)
-    patient7_answer_group.hat_antwort.connect(patient7_answer2, parameter_dict)
-    patient8_answer_group.hat_antwort.connect(patient8_answer1, parameter_dict)
-    patient8_answer_group.hat_antwort.connect(patient8_answer2, parameter_dict)
-    patient9_answer_group.hat_antwort.connect(patient9_answer1, parameter_dict)
-    patient9_answer_group.hat_antwort.connect(patient9_answer2, parameter_dict)
-    patient10_answer_group.hat_antwort.connect(patient10_answer1, parameter_dict)
-    patient10_answer_group.hat_antwort.connect(patient10_answer2, parameter_dict)
-    
-    item0.hat_antwort.connect(patient1_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient1_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient2_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient2_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient3_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient3_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient4_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient4_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient5_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient5_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient6_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient6_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient7_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient7_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient8_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient8_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient9_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient9_answer2, parameter_dict)
-    item0.hat_antwort.connect(patient10_answer1, parameter_dict)
-    item1.hat_antwort.connect(patient10_answer2, parameter_dict)
+    uow.connect(patient1_answer_group, "hat_antwort", patient1_answer1, parameter_dict)
+    uow.connect(patient1_answer_group, "hat_antwort", patient1_answer2, parameter_dict)
+    uow.connect(patient2_answer_group, "hat_antwort", patient2_answer1, parameter_dict)
+    uow.connect(patient2_answer_group, "hat_antwort", patient2_answer2, parameter_dict)
+    uow.connect(patient3_answer_group, "hat_antwort", patient3_answer1, parameter_dict)
+    uow.connect(patient3_answer_group, "hat_antwort", patient3_answer2, parameter_dict)
+    uow.connect(patient4_answer_group, "hat_antwort", patient4_answer1, parameter_dict)
+    uow.connect(patient4_answer_group, "hat_antwort", patient4_answer2, parameter_dict)
+    uow.connect(patient5_answer_group, "hat_antwort", patient5_answer1, parameter_dict)
+    uow.connect(patient5_answer_group, "hat_antwort", patient5_answer2, parameter_dict)
+    uow.connect(patient6_answer_group, "hat_antwort", patient6_answer1, parameter_dict)
+    uow.connect(patient6_answer_group, "hat_antwort", patient6_answer2, parameter_dict)
+    uow.connect(patient7_answer_group, "hat_antwort", patient7_answer1, parameter_dict)
+    uow.connect(patient7_answer_group, "hat_antwort", patient7_answer2, parameter_dict)
+    uow.connect(patient8_answer_group, "hat_antwort", patient8_answer1, parameter_dict)
+    uow.connect(patient8_answer_group, "hat_antwort", patient8_answer2, parameter_dict)
+    uow.connect(patient9_answer_group, "hat_antwort", patient9_answer1, parameter_dict)
+    uow.connect(patient9_answer_group, "hat_antwort", patient9_answer2, parameter_dict)
+    uow.connect(patient10_answer_group, "hat_antwort", patient10_answer1, parameter_dict)
+    uow.connect(patient10_answer_group, "hat_antwort", patient10_answer2, parameter_dict)
+    
+    uow.connect(item0, "hat_antwort", patient1_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient1_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient2_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient2_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient3_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient3_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient4_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient4_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient5_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient5_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient6_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient6_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient7_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient7_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient8_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient8_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient9_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient9_answer2, parameter_dict)
+    uow.connect(item0, "hat_antwort", patient10_answer1, parameter_dict)
+    uow.connect(item1, "hat_antwort", patient10_answer2, parameter_dict)
     
     # Add data quality check config and answer groups to questionnaire
     data_quality_check_config_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Qualitaetspruefung")
     DataQualityCheckConfig = data_quality_check_config_node.node_class
-    data_quality_check_config = DataQualityCheckConfig.create({**parameter_dict})[0]
+    data_quality_check_config = uow.create(DataQualityCheckConfig, {**parameter_dict})
     
     empty_columns_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "LeereSpalten")
     EmptyColumns = empty_columns_node.node_class
-    empty_columns = EmptyColumns.create({**parameter_dict})[0]
+    empty_columns = uow.create(EmptyColumns, {**parameter_dict})
     
     empty_rows_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "LeereZeilen")
     EmptyRows = empty_rows_node.node_class
-    empty_rows = EmptyRows.create({**parameter_dict})[0]
+    empty_rows = uow.create(EmptyRows, {**parameter_dict})
     
     empty_cells_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "LeereWerte")
     EmptyCells = empty_cells_node.node_class
-    empty_cells = EmptyCells.create({**parameter_dict})[0]
+    empty_cells = uow.create(EmptyCells, {**parameter_dict})
     
     value_type_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Datentyp")
     ValueType = value_type_node.node_class
-    value_type = ValueType.create({**parameter_dict})[0]
+    value_type = uow.create(ValueType, {**parameter_dict})
     
     value_range_min_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Minimum")
     ValueRangeMin = value_range_min_node.node_class
-    value_range_min = ValueRangeMin.create({**parameter_dict})[0]
+    value_range_min = uow.create(ValueRangeMin, {**parameter_dict})
     
     value_range_max_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Maximum")
     ValueRangeMax = value_range_max_node.node_class
-    value_range_max = ValueRangeMax.create({**parameter_dict})[0]
+    value_range_max = uow.create(ValueRangeMax, {**parameter_dict})
     
     value_required_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "BenoetigtQualitaetspruefung")
     ValueRequired = value_required_node.node_class
-    value_required = ValueRequired.create({**parameter_dict})[0]
+    value_required = uow.create(ValueRequired, {**parameter_dict})
     
     value_mapping_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Auswahlmoeglichkeiten")
     ValueMapping = value_mapping_node.node_class
-    value_mapping = ValueMapping.create({**parameter_dict})[0]
+    value_mapping = uow.create(ValueMapping, {**parameter_dict})
     
     mapping_separator_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "TrennzeichenAuswahlmoeglichkeiten")
     MappingSeparator = mapping_separator_node.node_class
-    mapping_separator = MappingSeparator.create({**parameter_dict})[0]
+    mapping_separator = uow.create(MappingSeparator, {**parameter_dict})
     
     answer_separator_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "TrennzeichenAntworten")
     AnswerSeparator = answer_separator_node.node_class
-    answer_separator = AnswerSeparator.create({**parameter_dict})[0]
-    
-    fragebogen0.hat_qualitaetspruefung.connect(data_quality_check_config, parameter_dict)
-    data_quality_check_config.hat_leerespalten.connect(empty_columns, parameter_dict)
-    data_quality_check_config.hat_leerezeilen.connect(empty_rows, parameter_dict)
-    data_quality_check_config.hat_leerewerte.connect(empty_cells, parameter_dict)
-    data_quality_check_config.hat_datentyp.connect(value_type, parameter_dict)
-    data_quality_check_config.hat_minimum.connect(value_range_min, parameter_dict)
-    data_quality_check_config.hat_maximum.connect(value_range_max, parameter_dict)
-    data_quality_check_config.hat_benoetigtqualitaetspruefung.connect(value_required, parameter_dict)
-    data_quality_check_config.hat_auswahlmoeglichkeiten.connect(value_mapping, parameter_dict)
-    data_quality_check_config.hat_trennzeichenauswahlmoeglichkeiten.connect(mapping_separator, parameter_dict)
-    data_quality_check_config.hat_trennzeichenantworten.connect(answer_separator, parameter_dict)
-    
-    empty_columns_data = DataNode.create({**parameter_dict, "value": "True"})[0]
-    empty_rows_data = DataNode.create({**parameter_dict, "value": "True"})[0]
-    empty_cells_data = DataNode.create({**parameter_dict, "value": "False"})[0]
-    value_type_data = DataNode.create({**parameter_dict, "value": "Datentyp"})[0]
-    value_range_min_data = DataNode.create({**parameter_dict, "value": "Minimum"})[0]
-    value_range_max_data = DataNode.create({**parameter_dict, "value": "Maximum"})[0]
-    value_required_data = DataNode.create({**parameter_dict, "value": "Benoetigt"})[0]
-    value_mapping_data = DataNode.create({**parameter_dict, "value": "Antwortmoeglichkeiten"})[0]
-    mapping_separator_data = DataNode.create({**parameter_dict, "value": "SEMICOLON"})[0]
-    answer_separator_data = DataNode.create({**parameter_dict, "value": "COMMA"})[0]
+    answer_separator = uow.create(AnswerSeparator, {**parameter_dict})
+    
+    uow.connect(fragebogen0, "hat_qualitaetspruefung", data_quality_check_config, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_leerespalten", empty_columns, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_leerezeilen", empty_rows, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_leerewerte", empty_cells, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_datentyp", value_type, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_minimum", value_range_min, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_maximum", value_range_max, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_benoetigtqualitaetspruefung", value_required, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_auswahlmoeglichkeiten", value_mapping, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_trennzeichenauswahlmoeglichkeiten", mapping_separator, parameter_dict)
+    uow.connect(data_quality_check_config, "hat_trennzeichenantworten", answer_separator, parameter_dict)
+    
+    empty_columns_data = uow.create(DataNode, {**parameter_dict, "value": "True"})
+    empty_rows_data = uow.create(DataNode, {**parameter_dict, "value": "True"})
+    empty_cells_data = uow.create(DataNode, {**parameter_dict, "value": "False"})
+    value_type_data = uow.create(DataNode, {**parameter_dict, "value": "Datentyp"})
+    value_range_min_data = uow.create(DataNode, {**parameter_dict, "value": "Minimum"})
+    value_range_max_data = uow.create(DataNode, {**parameter_dict, "value": "Maximum"})
+    value_required_data = uow.create(DataNode, {**parameter_dict, "value": "Benoetigt"})
+    value_mapping_data = uow.create(DataNode, {**parameter_dict, "value": "Antwortmoeglichkeiten"})
+    mapping_separator_data = uow.create(DataNode, {**parameter_dict, "value": "SEMICOLON"})
+    answer_separator_data = uow.create(DataNode, {**parameter_dict, "value": "COMMA"})
     
     if SET_DATA_UNVERIFIED:
-        empty_columns.in_review.connect(empty_columns_data, parameter_dict)
-        empty_rows.in_review.connect(empty_rows_data, parameter_dict)
-        empty_cells.in_review.connect(empty_cells_data, parameter_dict)
-        value_type.in_review.connect(value_type_data, parameter_dict)
-        value_range_min.in_review.connect(value_range_min_data, parameter_dict)
-        value_range_max.in_review.connect(value_range_max_data, parameter_dict)
-        value_required.in_review.connect(value_required_data, parameter_dict)
-        value_mapping.in_review.connect(value_mapping_data, parameter_dict)
-        mapping_separator.in_review.connect(mapping_separator_data, parameter_dict)
-        answer_separator.in_review.connect(answer_separator_data, parameter_dict)
+        uow.connect(empty_columns, "in_review", empty_columns_data, parameter_dict)
+        uow.connect(empty_rows, "in_review", empty_rows_data, parameter_dict)
+        uow.connect(empty_cells, "in_review", empty_cells_data, parameter_dict)
+        uow.connect(value_type, "in_review", value_type_data, parameter_dict)
+        uow.connect(value_range_min, "in_review", value_range_min_data, parameter_dict)
+        uow.connect(value_range_max, "in_review", value_range_max_data, parameter_dict)
+        uow.connect(value_required, "in_review", value_required_data, parameter_dict)
+        uow.connect(value_mapping, "in_review", value_mapping_data, parameter_dict)
+        uow.connect(mapping_separator, "in_review", mapping_separator_data, parameter_dict)
+        uow.connect(answer_separator, "in_review", answer_separator_data, parameter_dict)
     else:
-        empty_columns.current_data.connect(empty_columns_data, parameter_dict)
-        empty_rows.current_data.connect(empty_rows_data, parameter_dict)
-        empty_cells.current_data.connect(empty_cells_data, parameter_dict)
-        value_type.current_data.connect(value_type_data, parameter_dict)
-        value_range_min.current_data.connect(value_range_min_data, parameter_dict)
-        value_range_max.current_data.connect(value_range_max_data, parameter_dict)
-        value_required.current_data.connect(value_required_data, parameter_dict)
-        value_mapping.current_data.connect(value_mapping_data, parameter_dict)
-        mapping_separator.current_data.connect(mapping_separator_data, parameter_dict)
-        answer_separator.current_data.connect(answer_separator_data, parameter_dict)
-    
-    fragebogen0.hat_antwortgruppe.connect(patient1_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient2_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient3_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient4_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient5_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient6_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient7_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient8_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient9_answer_group, parameter_dict)
-    fragebogen0.hat_antwortgruppe.connect(patient10_answer_group, parameter_dict)
+        uow.connect(empty_columns, "current_data", empty_columns_data, parameter_dict)
+        uow.connect(empty_rows, "current_data", empty_rows_data, parameter_dict)
+        uow.connect(empty_cells, "current_data", empty_cells_data, parameter_dict)
+        uow.connect(value_type, "current_data", value_type_data, parameter_dict)
+        uow.connect(value_range_min, "current_data", value_range_min_data, parameter_dict)
+        uow.connect(value_range_max, "current_data", value_range_max_data, parameter_dict)
+        uow.connect(value_required, "current_data", value_required_data, parameter_dict)
+        uow.connect(value_mapping, "current_data", value_mapping_data, parameter_dict)
+        uow.connect(mapping_separator, "current_data", mapping_separator_data, parameter_dict)
+        uow.connect(answer_separator, "current_data", answer_separator_data, parameter_dict)
+    
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient1_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient2_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient3_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient4_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient5_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient6_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient7_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient8_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient9_answer_group, parameter_dict)
+    uow.connect(fragebogen0, "hat_antwortgruppe", patient10_answer_group, parameter_dict)
     
     # Create and connect data nodes for answer and rowID
-    patient1_answer_group_id_data = DataNode.create({**parameter_dict, "value": "1"})[0]
-    patient2_answer_group_id_data = DataNode.create({**parameter_dict, "value": "2"})[0]
-    patient3_answer_group_id_data = DataNode.create({**parameter_dict, "value": "3"})[0]
-    patient4_answer_group_id_data = DataNode.create({**parameter_dict, "value": "4"})[0]
-    patient5_answer_group_id_data = DataNode.create({**parameter_dict, "value": "5"})[0]
-    patient6_answer_group_id_data = DataNode.create({**parameter_dict, "value": "6"})[0]
-    patient7_answer_group_id_data = DataNode.create({**parameter_dict, "value": "7"})[0]
-    patient8_answer_group_id_data = DataNode.create({**parameter_dict, "value": "8"})[0]
-    patient9_answer_group_id_data = DataNode.create({**parameter_dict, "value": "9"})[0]
-    patient10_answer_group_id_data = DataNode.create({**parameter_dict, "value": "10"})[0]
-    
-    patient1_answer1_data= DataNode.create({**parameter_dict, "value": "1"})[0]
-    patient1_answer2_data= DataNode.create({**parameter_dict, "value": "19"})[0]
-    patient2_answer1_data= DataNode.create({**parameter_dict, "value": "2"})[0]
-    patient2_answer2_data= DataNode.create({**parameter_dict, "value": "54"})[0]
-    patient3_answer1_data= DataNode.create({**parameter_dict, "value": "3"})[0]
-    patient3_answer2_data= DataNode.create({**parameter_dict, "value": "34"})[0]
-    patient4_answer1_data= DataNode.create({**parameter_dict, "value": "4"})[0]
-    patient4_answer2_data= DataNode.create({**parameter_dict, "value": "75"})[0]
-    patient5_answer1_data= DataNode.create({**parameter_dict, "value": "5"})[0]
-    patient5_answer2_data= DataNode.create({**parameter_dict, "value": "64"})[0]
-    patient6_answer1_data= DataNode.create({**parameter_dict, "value": "6"})[0]
-    patient6_answer2_data= DataNode.create({**parameter_dict, "value": "34"})[0]
-    patient7_answer1_data= DataNode.create({**parameter_dict, "value": "7"})[0]
-    patient7_answer2_data= DataNode.create({**parameter_dict, "value": "44"})[0]
-    patient8_answer1_data= DataNode.create({**parameter_dict, "value": "8"})[0]
-    patient8_answer2_data= DataNode.create({**parameter_dict, "value": "92"})[0]
-    patient9_answer1_data= DataNode.create({**parameter_dict, "value": "9"})[0]
-    patient9_answer2_data= DataNode.create({**parameter_dict, "value": "18"})[0]
-    patient10_answer1_data = DataNode.create({**parameter_dict, "value": "10"})[0]
-    patient10_answer2_data = DataNode.create({**parameter_dict, "value": "78"})[0]
+    patient1_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "1"})
+    patient2_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "2"})
+    patient3_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "3"})
+    patient4_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "4"})
+    patient5_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "5"})
+    patient6_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "6"})
+    patient7_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "7"})
+    patient8_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "8"})
+    patient9_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "9"})
+    patient10_answer_group_id_data = uow.create(DataNode, {**parameter_dict, "value": "10"})
+    
+    patient1_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "1"})
+    patient1_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "19"})
+    patient2_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "2"})
+    patient2_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "54"})
+    patient3_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "3"})
+    patient3_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "34"})
+    patient4_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "4"})
+    patient4_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "75"})
+    patient5_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "5"})
+    patient5_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "64"})
+    patient6_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "6"})
+    patient6_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "34"})
+    patient7_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "7"})
+    patient7_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "44"})
+    patient8_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "8"})
+    patient8_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "92"})
+    patient9_answer1_data= uow.create(DataNode, {**parameter_dict, "value": "9"})
+    patient9_answer2_data= uow.create(DataNode, {**parameter_dict, "value": "18"})
+    patient10_answer1_data = uow.create(DataNode, {**parameter_dict, "value": "10"})
+    patient10_answer2_data = uow.create(DataNode, {**parameter_dict, "value": "78"})
     
     if SET_DATA_UNVERIFIED:
-        patient1_answer_group_id.in_review.connect(patient1_answer_group_id_data, parameter_dict)
-        patient2_answer_group_id.in_review.connect(patient2_answer_group_id_data, parameter_dict)
-        patient3_answer_group_id.in_review.connect(patient3_answer_group_id_data, parameter_dict)
-        patient4_answer_group_id.in_review.connect(patient4_answer_group_id_data, parameter_dict)
-        patient5_answer_group_id.in_review.connect(patient5_answer_group_id_data, parameter_dict)
-        patient6_answer_group_id.in_review.connect(patient6_answer_group_id_data, parameter_dict)
-        patient7_answer_group_id.in_review.connect(patient7_answer_group_id_data, parameter_dict)
-        patient8_answer_group_id.in_review.connect(patient8_answer_group_id_data, parameter_dict)
-        patient9_answer_group_id.in_review.connect(patient9_answer_group_id_data, parameter_dict)
-        patient10_answer_group_id.in_review.connect(patient10_answer_group_id_data, parameter_dict)
+        uow.connect(patient1_answer_group_id, "in_review", patient1_answer_group_id_data, parameter_dict)
+        uow.connect(patient2_answer_group_id, "in_review", patient2_answer_group_id_data, parameter_dict)
+        uow.connect(patient3_answer_group_id, "in_review", patient3_answer_group_id_data, parameter_dict)
+        uow.connect(patient4_answer_group_id, "in_review", patient4_answer_group_id_data, parameter_dict)
+        uow.connect(patient5_answer_group_id, "in_review", patient5_answer_group_id_data, parameter_dict)
+        uow.connect(patient6_answer_group_id, "in_review", patient6_answer_group_id_data, parameter_dict)
+        uow.connect(patient7_answer_group_id, "in_review", patient7_answer_group_id_data, parameter_dict)
+        uow.connect(patient8_answer_group_id, "in_review", patient8_answer_group_id_data, parameter_dict)
+        uow.connect(patient9_answer_group_id, "in_review", patient9_answer_group_id_data, parameter_dict)
+        uow.connect(patient10_answer_group_id, "in_review", patient10_answer_group_id_data, parameter_dict)
         
-        patient1_answer1.in_review.connect(patient1_answer1_data, parameter_dict)
-        patient1_answer2.in_review.connect(patient1_answer2_data, parameter_dict)
-        patient2_answer1.in_review.connect(patient2_answer1_data, parameter_dict)
-        patient2_answer2.in_review.connect(patient2_answer2_data, parameter_dict)
-        patient3_answer1.in_review.connect(patient3_answer1_data, parameter_dict)
-        patient3_answer2.in_review.connect(patient3_answer2_data, parameter_dict)
-        patient4_answer1.in_review.connect(patient4_answer1_data, parameter_dict)
-        patient4_answer2.in_review.connect(patient4_answer2_data, parameter_dict)
-        patient5_answer1.in_review.connect(patient5_answer1_data, parameter_dict)
-        patient5_answer2.in_review.connect(patient5_answer2_data, parameter_dict)
-        patient6_answer1.in_review.connect(patient6_answer1_data, parameter_dict)
-        patient6_answer2.in_review.connect(patient6_answer2_data, parameter_dict)
-        patient7_answer1.in_review.connect(patient7_answer1_data, parameter_dict)
-        patient7_answer2.in_review.connect(patient7_answer2_data, parameter_dict)
-        patient8_answer1.in_review.connect(patient8_answer1_data, parameter_dict)
-        patient8_answer2.in_review.connect(patient8_answer2_data, parameter_dict)
-        patient9_answer1.in_review.connect(patient9_answer1_data, parameter_dict)
-        patient9_answer2.in_review.connect(patient9_answer2_data, parameter_dict)
-        patient10_answer1.in_review.connect(patient10_answer1_data, parameter_dict)
-        patient10_answer2.in_review.connect(patient10_answer2_data, parameter_dict)
+        uow.connect(patient1_answer1, "in_review", patient1_answer1_data, parameter_dict)
+        uow.connect(patient1_answer2, "in_review", patient1_answer2_data, parameter_dict)
+        uow.connect(patient2_answer1, "in_review", patient2_answer1_data, parameter_dict)
+        uow.connect(patient2_answer2, "in_review", patient2_answer2_data, parameter_dict)
+        uow.connect(patient3_answer1, "in_review", patient3_answer1_data, parameter_dict)
+        uow.connect(patient3_answer2, "in_review", patient3_answer2_data, parameter_dict)
+        uow.connect(patient4_answer1, "in_review", patient4_answer1_data, parameter_dict)
+        uow.connect(patient4_answer2, "in_review", patient4_answer2_data, parameter_dict)
+        uow.connect(patient5_answer1, "in_review", patient5_answer1_data, parameter_dict)
+        uow.connect(patient5_answer2, "in_review", patient5_answer2_data, parameter_dict)
+        uow.connect(patient6_answer1, "in_review", patient6_answer1_data, parameter_dict)
+        uow.connect(patient6_answer2, "in_review", patient6_answer2_data, parameter_dict)
+        uow.connect(patient7_answer1, "in_review", patient7_answer1_data, parameter_dict)
+        uow.connect(patient7_answer2, "in_review", patient7_answer2_data, parameter_dict)
+        uow.connect(patient8_answer1, "in_review", patient8_answer1_data, parameter_dict)
+        uow.connect(patient8_answer2, "in_review", patient8_answer2_data, parameter_dict)
+        uow.connect(patient9_answer1, "in_review", patient9_answer1_data, parameter_dict)
+        uow.connect(patient9_answer2, "in_review", patient9_answer2_data, parameter_dict)
+        uow.connect(patient10_answer1, "in_review", patient10_answer1_data, parameter_dict)
+        uow.connect(patient10_answer2, "in_review", patient10_answer2_data, parameter_dict)
     else:
-        patient1_answer_group_id.current_data.connect(patient1_answer_group_id_data, parameter_dict)
-        patient2_answer_group_id.current_data.connect(patient2_answer_group_id_data, parameter_dict)
-        patient3_answer_group_id.current_data.connect(patient3_answer_group_id_data, parameter_dict)
-        patient4_answer_group_id.current_data.connect(patient4_answer_group_id_data, parameter_dict)
-        patient5_answer_group_id.current_data.connect(patient5_answer_group_id_data, parameter_dict)
-        patient6_answer_group_id.current_data.connect(patient6_answer_group_id_data, parameter_dict)
-        patient7_answer_group_id.current_data.connect(patient7_answer_group_id_data, parameter_dict)
-        patient8_answer_group_id.current_data.connect(patient8_answer_group_id_data, parameter_dict)
-        patient9_answer_group_id.current_data.connect(patient9_answer_group_id_data, parameter_dict)
-        patient10_answer_group_id.current_data.connect(patient10_answer_group_id_data, parameter_dict)
+        uow.connect(patient1_answer_group_id, "current_data", patient1_answer_group_id_data, parameter_dict)
+        uow.connect(patient2_answer_group_id, "current_data", patient2_answer_group_id_data, parameter_dict)
+        uow.connect(patient3_answer_group_id, "current_data", patient3_answer_group_id_data, parameter_dict)
+        uow.connect(patient4_answer_group_id, "current_data", patient4_answer_group_id_data, parameter_dict)
+        uow.connect(patient5_answer_group_id, "current_data", patient5_answer_group_id_data, parameter_dict)
+        uow.connect(patient6_answer_group_id, "current_data", patient6_answer_group_id_data, parameter_dict)
+        uow.connect(patient7_answer_group_id, "current_data", patient7_answer_group_id_data, parameter_dict)
+        uow.connect(patient8_answer_group_id, "current_data", patient8_answer_group_id_data, parameter_dict)
+        uow.connect(patient9_answer_group_id, "current_data", patient9_answer_group_id_data, parameter_dict)
+        uow.connect(patient10_answer_group_id, "current_data", patient10_answer_group_id_data, parameter_dict)
         
-        patient1_answer1.current_data.connect(patient1_answer1_data, parameter_dict)
-        patient1_answer2.current_data.connect(patient1_answer2_data, parameter_dict)
-        patient2_answer1.current_data.connect(patient2_answer1_data, parameter_dict)
-        patient2_answer2.current_data.connect(patient2_answer2_data, parameter_dict)
-        patient3_answer1.current_data.connect(patient3_answer1_data, parameter_dict)
-        patient3_answer2.current_data.connect(patient3_answer2_data, parameter_dict)
-        patient4_answer1.current_data.connect(patient4_answer1_data, parameter_dict)
-        patient4_answer2.current_data.connect(patient4_answer2_data, parameter_dict)
-        patient5_answer1.current_data.connect(patient5_answer1_data, parameter_dict)
-        patient5_answer2.current_data.connect(patient5_answer2_data, parameter_dict)
-        patient6_answer1.current_data.connect(patient6_answer1_data, parameter_dict)
-        patient6_answer2.current_data.connect(patient6_answer2_data, parameter_dict)
-        patient7_answer1.current_data.connect(patient7_answer1_data, parameter_dict)
-        patient7_answer2.current_data.connect(patient7_answer2_data, parameter_dict)
-        patient8_answer1.current_data.connect(patient8_answer1_data, parameter_dict)
-        patient8_answer2.current_data.connect(patient8_answer2_data, parameter_dict)
-        patient9_answer1.current_data.connect(patient9_answer1_data, parameter_dict)
-        patient9_answer2.current_data.connect(patient9_answer2_data, parameter_dict)
-        patient10_answer1.current_data.connect(patient10_answer1_data, parameter_dict)
-        patient10_answer2.current_data.connect(patient10_answer2_data, parameter_dict)
\ No newline at end of file
+        uow.connect(patient1_answer1, "current_data", patient1_answer1_data, parameter_dict)
+        uow.connect(patient1_answer2, "current_data", patient1_answer2_data, parameter_dict)
+        uow.connect(patient2_answer1, "current_data", patient2_answer1_data, parameter_dict)
+        uow.connect(patient2_answer2, "current_data", patient2_answer2_data, parameter_dict)
+        uow.connect(patient3_answer1, "current_data", patient3_answer1_data, parameter_dict)
+        uow.connect(patient3_answer2, "current_data", patient3_answer2_data, parameter_dict)
+        uow.connect(patient4_answer1, "current_data", patient4_answer1_data, parameter_dict)
+        uow.connect(patient4_answer2, "current_data", patient4_answer2_data, parameter_dict)
+        uow.connect(patient5_answer1, "current_data", patient5_answer1_data, parameter_dict)
+        uow.connect(patient5_answer2, "current_data", patient5_answer2_data, parameter_dict)
+        uow.connect(patient6_answer1, "current_data", patient6_answer1_data, parameter_dict)
+        uow.connect(patient6_answer2, "current_data", patient6_answer2_data, parameter_dict)
+        uow.connect(patient7_answer1, "current_data", patient7_answer1_data, parameter_dict)
+        uow.connect(patient7_answer2, "current_data", patient7_answer2_data, parameter_dict)
+        uow.connect(patient8_answer1, "current_data", patient8_answer1_data, parameter_dict)
+        uow.connect(patient8_answer2, "current_data", patient8_answer2_data, parameter_dict)
+        uow.connect(patient9_answer1, "current_data", patient9_answer1_data, parameter_dict)
+        uow.connect(patient9_answer2, "current_data", patient9_answer2_data, parameter_dict)
+        uow.connect(patient10_answer1, "current_data", patient10_answer1_data, parameter_dict)
+        uow.connect(patient10_answer2, "current_data", patient10_answer2_data, parameter_dict)
+    
+    uow.commit()
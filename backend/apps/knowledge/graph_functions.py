@@ -1,12 +1,25 @@
+from django.conf import settings
 from ninja.errors import HttpError
 from neomodel import db, Q
 
 from api import schema
 from graph_migrations.studies import generate_tag_name
 from ontology.models import OntologyNode
-from knowledge.models import DataNode, KnowledgeNode
+from knowledge.anchors import get_fragebogen_node, get_study_node, record_graph_anchors
+from knowledge.batch import GraphLayer, NodeHandle, UnitOfWork, escape_label, relationship_definition, run_in_transactions
+from knowledge.blobs import blob_hash
+from knowledge.ingestion import (
+    IngestionIndex, Partition, build_ingestion_index, chunk_transaction, chunked, delete_checkpoints, get_checkpoint, get_item_data_types, iter_data_rows,
+    run_partitions, save_checkpoint
+)
+from knowledge.models import COMPACT_RELATIONSHIP_PROPERTIES, ORDINAL_PROPERTIES, DataNode, KnowledgeNode, LeafNode
+from knowledge.partitions import study_label, study_node_pattern
+from knowledge.statistics import PREVIOUS_SUMS, PROMOTED_SUMS, VERIFIED_SUMS, add_study_statistics, commit_with_statistics, created_statistics
 from study.models import Study, CodeBook
 
+from dataclasses import dataclass
+import functools
+from typing import Callable
 from uuid import uuid4
 import logging
 
@@ -16,6 +29,8 @@ logger = logging.getLogger(__name__)
 def build_study_codebook_knowledge_graph(study: Study) -> None:
     """
     Build a knowledge graph for a study and its codebook based on a Study object.
+    The whole graph is collected in memory first and then written layer by layer with a few UNWIND statements
+    (study information, Fragebogen, Item/Metadaten/SpaltenID, metadata leaves with their DataNodes).
     
     Args:
         study (Study): The realtional Study model for the study.
@@ -35,10 +50,10 @@ def build_study_codebook_knowledge_graph(study: Study) -> None:
     DRKSID = drks_id_ontology_node.node_class
     StudienID = studien_id_ontology_node.node_class
     
-    if StudienID.nodes.filter(current_data__value = str(study.id)).all() :
+    if find_nodes_by_leaf_value(StudienID, [], str(study.id)) :
         raise HttpError(404, f"KnowledgeGraph for this study already exists (id: {study.id}).")
     
-    if DRKSID.nodes.filter(current_data__value = str(study.drks_id)).all() :
+    if find_nodes_by_leaf_value(DRKSID, [], str(study.drks_id)) :
         raise HttpError(404, f"KnowledgeGraph for study with this DRKS-ID ({study.drks_id}) already exists.")
     
     
@@ -52,35 +67,56 @@ def build_study_codebook_knowledge_graph(study: Study) -> None:
     Forschung = forschung_ontology_node.node_class
     Studie = studie_ontology_node.node_class
     Datenerhebung = datenerhebung_ontology_node.node_class
-        
     
-    forschung = Forschung.create({
+    # Every layer is written on its own so that the parameter arrays of one statement stay reasonably small.
+    study_layer = GraphLayer()
+    
+    forschung = study_layer.add_node(Forschung, {
         **knowledge_graph_parameters_dict,
         "stakeholder_id": str(uuid4()),
-    })[0]
-    studie = Studie.create(knowledge_graph_parameters_dict)[0]
-    datenerhebung = Datenerhebung.create(knowledge_graph_parameters_dict)[0]
+    })
+    studie = study_layer.add_node(Studie, knowledge_graph_parameters_dict)
+    datenerhebung = study_layer.add_node(Datenerhebung, knowledge_graph_parameters_dict)
     
     # build subgraph for the study information
-    studieninformationen = build_study_information_subgraph(study, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
+    studieninformationen = build_study_information_subgraph(study, study_layer, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
     
-    forschung.erstellt_studie.connect(studie, knowledge_graph_parameters_dict)
-    studie.hat_studieninformationen.connect(studieninformationen, knowledge_graph_parameters_dict)
-    studie.hat_datenerhebung.connect(datenerhebung, knowledge_graph_parameters_dict)
+    study_layer.add_relationship(Forschung, "erstellt_studie", forschung, studie, knowledge_graph_parameters_dict)
+    study_layer.add_relationship(Studie, "hat_studieninformationen", studie, studieninformationen, knowledge_graph_parameters_dict)
+    study_layer.add_relationship(Studie, "hat_datenerhebung", studie, datenerhebung, knowledge_graph_parameters_dict)
+    study_layer.write()
     
+    fragebogen_layer = GraphLayer()
+    item_layer = GraphLayer()
+    leaf_layer = GraphLayer()
+    fragebogen_by_codebook = {}
     
     for codebook in study.codebooks.all():
         # build subgraph for the codebook
-        fragebogen = build_study_codebook_fragebogen_subgraph(codebook, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
+        fragebogen = build_study_codebook_fragebogen_subgraph(codebook, fragebogen_layer, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
+        fragebogen_by_codebook[codebook.id] = fragebogen
         
         # connect the codebook to the datenerhebung node
-        datenerhebung.hat_fragebogen.connect(fragebogen, knowledge_graph_parameters_dict)
+        fragebogen_layer.add_relationship(Datenerhebung, "hat_fragebogen", datenerhebung, fragebogen, knowledge_graph_parameters_dict)
+        
+        # loops over the rows of the codebook and creates item subgraphs for each row and connects them to the fragebogen node
+        build_study_codebook_items_subgraphs_and_connect(codebook, fragebogen, item_layer, leaf_layer, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
+    
+    # the codebook side is verified from the start, so its questionnaires and items are counted, see knowledge.statistics
+    changes = created_statistics(fragebogen_layer, item_layer, leaf_layer)
+    fragebogen_layer.write()
+    item_layer.write()
+    leaf_layer.write()
+    add_study_statistics(study.id, changes)
+    
+    # the root nodes are recorded in Postgres, so lookups by study and codebook id don't have to search the graph (see knowledge.anchors)
+    record_graph_anchors(study, studie, datenerhebung, fragebogen_by_codebook)
 
 
 
 # NOTE: creates the Fragebogen subgraph for one codebook of a study
-# Returns the Fragebogen node of the codebook subgraph.
-def build_study_codebook_fragebogen_subgraph(codebook: CodeBook, knowledge_graph_parameters_dict: dict) -> KnowledgeNode:
+# Returns the uuid of the Fragebogen node of the codebook subgraph.
+def build_study_codebook_fragebogen_subgraph(codebook: CodeBook, layer: GraphLayer, knowledge_graph_parameters_dict: dict) -> str:
     
     # NOTE: Assumption: These are the only nodes related general codebook information. 
     # If the ontology is extended and new parameters are added to the CodeBook model they need to be added here.
@@ -98,31 +134,15 @@ def build_study_codebook_fragebogen_subgraph(codebook: CodeBook, knowledge_graph
     Fragebogenname = fragebogen_name_ontology_node.node_class
     FragebogenID = fragebogen_id_ontology_node.node_class
     
-    # create the Knowledge nodes for the fragebogen, fragebogenname and fragebogenid
-    fragebogen = Fragebogen.create(knowledge_graph_parameters_dict)[0]
-    fragebogenname = Fragebogenname.create(knowledge_graph_parameters_dict)[0]
-    fragebogen_id = FragebogenID.create(knowledge_graph_parameters_dict)[0]
-    
-    # create the DataNodes for the fragebogen information
-    data_node_fragebogenname = DataNode.create({**knowledge_graph_parameters_dict, "value": codebook.name})[0]
-    data_node_fragebogen_id = DataNode.create({**knowledge_graph_parameters_dict, "value": str(codebook.id)})[0]
-    
-    # connect leaf nodes to connective node (fragebogen)
-    fragebogen.hat_fragebogenname.connect(fragebogenname, knowledge_graph_parameters_dict)
-    fragebogen.hat_fragebogenid.connect(fragebogen_id, knowledge_graph_parameters_dict)
-    
-    # connect data nodes to leaf nodes
-    fragebogen_id.current_data.connect(data_node_fragebogen_id, knowledge_graph_parameters_dict)
-    fragebogenname.current_data.connect(data_node_fragebogenname, knowledge_graph_parameters_dict)
-    
-    
-    # loops over the rows of the codebook and creates item sungraphs for each row and connects them to the fragebogen node
-    build_study_codebook_items_subgraphs_and_connect(codebook, fragebogen, knowledge_graph_parameters_dict = knowledge_graph_parameters_dict)
+    # create the Knowledge node for the fragebogen and the leaf nodes (with their DataNodes) for fragebogenname and fragebogenid
+    fragebogen = layer.add_node(Fragebogen, knowledge_graph_parameters_dict)
+    layer.add_leaf(Fragebogen, "hat_fragebogenname", fragebogen, Fragebogenname, codebook.name, knowledge_graph_parameters_dict)
+    layer.add_leaf(Fragebogen, "hat_fragebogenid", fragebogen, FragebogenID, str(codebook.id), knowledge_graph_parameters_dict)
     
     return fragebogen
      
     
-def build_study_codebook_items_subgraphs_and_connect(codebook: CodeBook, fragebogen:KnowledgeNode, knowledge_graph_parameters_dict: dict) -> None: 
+def build_study_codebook_items_subgraphs_and_connect(codebook: CodeBook, fragebogen: str, item_layer: GraphLayer, leaf_layer: GraphLayer, knowledge_graph_parameters_dict: dict) -> None: 
     
     # get the list of codebook column assigned meta item tags 
     # NOTE: If idx of CodeBookColumn starts at 0/1 for every codebook this step xould be skipped and the respective CodeBookColumn instance could be used directly by idx.
@@ -130,92 +150,111 @@ def build_study_codebook_items_subgraphs_and_connect(codebook: CodeBook, fragebo
         col.assigned_meta_tag if col.assigned_meta_tag is not None else generate_tag_name(col.header)
         for col in codebook.columns.all()
     ]
-    # grab the study.id for the current study
     
     # grab ontology nodes for the item subgraph
     item_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Item")
     spalten_id_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "SpaltenID")
     metadaten_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Metadaten")
     verknuepftes_item_id_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "VerknuepftesItemID")
+    fragebogen_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Fragebogen")
     
     # 
     Item = item_ontology_node.node_class
     SpaltenID = spalten_id_ontology_node.node_class
     Metadaten = metadaten_ontology_node.node_class
     Verknuepftes_item_id = verknuepftes_item_id_ontology_node.node_class
+    Fragebogen = fragebogen_ontology_node.node_class
+    
+    # The leaf class and relationship field are resolved once per column instead of once per cell.
+    meta_leaves: dict[int, tuple] = {}
+    
+    def get_meta_leaf(index: int) -> tuple:
+        if index not in meta_leaves:
+            # search for ontology node with the assigned_meta_tag as tag
+            current_leaf_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = assigned_meta_tags_list[index])
+            if not current_leaf_ontology_node:
+                raise HttpError(404, f"Ontology node for tag {assigned_meta_tags_list[index]} not found.")
+            
+            current_relationship = metadaten_ontology_node.children.relationship(current_leaf_ontology_node)
+            current_relationship_name = f"{current_relationship.name}_{current_leaf_ontology_node.tag}".lower()
+            meta_leaves[index] = (current_leaf_ontology_node.node_class, current_relationship_name)
+        return meta_leaves[index]
+    
+    rows = list(codebook.rows.all())
+    linked_item_ids = get_linked_item_ids([row.assigned_item_id for row in rows if row.assigned_item_id])
                 
-    for row in codebook.rows.all():
-        item = Item.create(knowledge_graph_parameters_dict)[0]
-        metadaten = Metadaten.create(knowledge_graph_parameters_dict)[0]
+    for row in rows:
+        item = item_layer.add_node(Item, {**knowledge_graph_parameters_dict, "col_idx": row.row_id})
+        metadaten = item_layer.add_node(Metadaten, knowledge_graph_parameters_dict)
         
-        fragebogen.hat_item.connect(item, knowledge_graph_parameters_dict)
-        item.hat_metadaten.connect(metadaten, knowledge_graph_parameters_dict)
+        item_layer.add_relationship(Fragebogen, "hat_item", fragebogen, item, knowledge_graph_parameters_dict)
+        item_layer.add_relationship(Item, "hat_metadaten", item, metadaten, knowledge_graph_parameters_dict)
         
         # Add column id for ordering of the items
-        spalten_id = SpaltenID.create(knowledge_graph_parameters_dict)[0]
-        item.hat_spaltenid.connect(spalten_id, knowledge_graph_parameters_dict)
-        spalten_id_data_node = DataNode.create({**knowledge_graph_parameters_dict, "value": str(row.row_id)})[0]
-        spalten_id.current_data.connect(spalten_id_data_node, knowledge_graph_parameters_dict)
+        item_layer.add_leaf(Item, "hat_spaltenid", item, SpaltenID, str(row.row_id), knowledge_graph_parameters_dict, data_type = "integer")
         
         # Create and connect node for linked item if present in the model
         if row.assigned_item_id:
-            
-            matched_item = Item.nodes.first_or_none(uuid=row.assigned_item_id)
-            if matched_item is None:
-                raise HttpError(400, "Invalid linked item")
-            
-            matched_item_meta = matched_item.hat_metadaten.get_or_none(tag="Metadaten")
-            if matched_item_meta is None:
-                raise HttpError(400, "Invalid linked item meta")
-            
-            matched_item_meta_id = matched_item_meta.hat_verknuepftesitemid.get_or_none(tag="VerknuepftesItemID")
-            
-            id =  row.assigned_item_id
-            if matched_item_meta_id is not None:
-                id = matched_item_meta_id.current_data.get().value 
-                        
-            verknuepftes_item_id = Verknuepftes_item_id.create(knowledge_graph_parameters_dict)[0]
-            verknuepftes_item_id_data_node = DataNode.create({**knowledge_graph_parameters_dict, "value": str(id)})[0]
-            
-            metadaten.hat_verknuepftesitemid.connect(verknuepftes_item_id, knowledge_graph_parameters_dict)
-            verknuepftes_item_id.current_data.connect(verknuepftes_item_id_data_node, knowledge_graph_parameters_dict)
+            id = linked_item_ids[row.assigned_item_id]
+            leaf_layer.add_leaf(Metadaten, "hat_verknuepftesitemid", metadaten, Verknuepftes_item_id, str(id), knowledge_graph_parameters_dict)
             
         # enmuerate over the cells for the current row/item and create/attach the respective nodes
         for index, cell in enumerate(row.cells):
                            
             # second part catches newline artifacts
             if cell and not (cell == "\r" or cell == "\n" or cell == "\r\n"):
+                Current_leaf_node, current_relationship_name = get_meta_leaf(index)
                 
-                # search for ontology node with the assigned_meta_tag as tag
-                current_leaf_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = assigned_meta_tags_list[index])
-                if not current_leaf_ontology_node:
-                    raise HttpError(404, f"Ontology node for tag {assigned_meta_tags_list[index]} not found.")
-                
-                Current_leaf_node = current_leaf_ontology_node.node_class
-                current_leaf = Current_leaf_node.create(knowledge_graph_parameters_dict)[0]
-                
-                # connect the current leaf node to the metadaten node       
-                current_relationship = metadaten_ontology_node.children.relationship(current_leaf_ontology_node)
-                current_relationship_name = f"{current_relationship.name}_{current_leaf_ontology_node.tag}".lower()
-                relationship_manager = getattr(metadaten, current_relationship_name)
-                relationship_manager.connect(current_leaf, knowledge_graph_parameters_dict)
-                
-                # Create and connect DataNode for the current cell value
-                current_data_node = DataNode.create({**knowledge_graph_parameters_dict, "value": cell})[0]
-                current_leaf.current_data.connect(current_data_node, knowledge_graph_parameters_dict)
+                # Create the leaf node with the DataNode for the current cell value and connect it to the metadaten node
+                leaf_layer.add_leaf(Metadaten, current_relationship_name, metadaten, Current_leaf_node, cell, knowledge_graph_parameters_dict)
                     
     return
+
+
+def get_linked_item_ids(assigned_item_ids: list[str]) -> dict[str, str]:
+    """
+    Resolves the ids of the linked items of a codebook with a single query.
+    If a linked item is itself linked to another item, the id of that item is used instead.
+    
+    Args:
+        assigned_item_ids (list[str]): The uuids of the items assigned to the codebook rows.
+    
+    Returns:
+        dict[str, str]: The id to store in the VerknuepftesItemID leaf for every assigned item id.
+    """
+    if not assigned_item_ids:
+        return {}
+    
+    query = """
+        UNWIND $item_ids AS item_id
+        OPTIONAL MATCH (item:Item {uuid: item_id})
+        OPTIONAL MATCH (item)-->(meta:Metadaten)
+        OPTIONAL MATCH (meta)-->(:VerknuepftesItemID)-[:CURRENT]->(linked:DataNode)
+        RETURN item_id, item IS NOT NULL, meta IS NOT NULL, head(collect(linked.value))
+    """
+    results, _ = db.cypher_query(query, {"item_ids": list(set(assigned_item_ids))})
+    
+    linked_item_ids = {}
+    for item_id, item_exists, meta_exists, linked_item_id in results:
+        if not item_exists:
+            raise HttpError(400, "Invalid linked item")
+        if not meta_exists:
+            raise HttpError(400, "Invalid linked item meta")
+        linked_item_ids[item_id] = linked_item_id if linked_item_id is not None else item_id
+    
+    return linked_item_ids
     
 
-def build_study_information_subgraph(study: Study, knowledge_graph_parameters_dict: dict) -> KnowledgeNode:
+def build_study_information_subgraph(study: Study, layer: GraphLayer, knowledge_graph_parameters_dict: dict) -> str:
     """
     Build a knowledge graph for the study information subgraph based on a Study object.
     
     Args:
         study (Study): The realtional Study model for the study.
+        layer (GraphLayer): The layer the nodes of the subgraph are added to.
     
     Returns:
-        studieninformationen (KnowledgeNode): The central knowledge node for the study information subgraph.
+        studieninformationen (str): The uuid of the central knowledge node for the study information subgraph.
     """
     
     # NOTE: Assumption: These are the only nodes related to study information. 
@@ -247,45 +286,18 @@ def build_study_information_subgraph(study: Study, knowledge_graph_parameters_di
     DRKSID = drks_id_ontology_node.node_class
     StudienID = studien_id_ontology_node.node_class
     
-    # create the Knowledge nodes for the study information subgraph
-    studieninformationen = Studieninformationen.create(knowledge_graph_parameters_dict)[0]
-    studienname = Studienname.create(knowledge_graph_parameters_dict)[0]
-    studienzweck = Studienzweck.create(knowledge_graph_parameters_dict)[0]
-    beschreibungstext = Beschreibungstext.create(knowledge_graph_parameters_dict)[0]
-    startdatum = Startdatum.create(knowledge_graph_parameters_dict)[0]
-    enddatum = Enddatum.create(knowledge_graph_parameters_dict)[0]
-    drks_id = DRKSID.create(knowledge_graph_parameters_dict)[0]
-    studien_id = StudienID.create(knowledge_graph_parameters_dict)[0]
-    
-    # create the DataNodes for the study information
-    data_node_studienname = DataNode.create({**knowledge_graph_parameters_dict, "value": study.name})[0]
-    data_node_studienzweck = DataNode.create({**knowledge_graph_parameters_dict, "value": study.purpose})[0]
-    data_node_beschreibungstext = DataNode.create({**knowledge_graph_parameters_dict, "value": study.description})[0]
+    # create the Knowledge node for the study information subgraph
+    studieninformationen = layer.add_node(Studieninformationen, knowledge_graph_parameters_dict)
     
+    # create the leaf nodes with their DataNodes and connect them to the connective node (studieninformationen)
     # NOTE: Dates have to be converted to string for the DataNode.
-    data_node_startdatum = DataNode.create({**knowledge_graph_parameters_dict, "value": str(study.date_start)})[0]
-    data_node_enddatum = DataNode.create({**knowledge_graph_parameters_dict, "value": str(study.date_end)})[0]
-    
-    data_node_drksid = DataNode.create({**knowledge_graph_parameters_dict, "value": study.drks_id})[0]
-    data_node_studien_id = DataNode.create({**knowledge_graph_parameters_dict, "value": str(study.id)})[0]
-    
-    # connect leaf nodes to connective node (studieninformationen)
-    studieninformationen.hat_studienname.connect(studienname, knowledge_graph_parameters_dict)
-    studieninformationen.hat_studienzweck.connect(studienzweck, knowledge_graph_parameters_dict)
-    studieninformationen.hat_beschreibungstext.connect(beschreibungstext, knowledge_graph_parameters_dict)
-    studieninformationen.hat_startdatum.connect(startdatum, knowledge_graph_parameters_dict)
-    studieninformationen.hat_enddatum.connect(enddatum, knowledge_graph_parameters_dict)
-    studieninformationen.hat_drksid.connect(drks_id, knowledge_graph_parameters_dict)
-    studieninformationen.hat_studienid.connect(studien_id, knowledge_graph_parameters_dict)
-    
-    # connect data nodes to leaf nodes
-    studienname.current_data.connect(data_node_studienname, knowledge_graph_parameters_dict)
-    studienzweck.current_data.connect(data_node_studienzweck, knowledge_graph_parameters_dict)
-    beschreibungstext.current_data.connect(data_node_beschreibungstext, knowledge_graph_parameters_dict)
-    startdatum.current_data.connect(data_node_startdatum, knowledge_graph_parameters_dict)
-    enddatum.current_data.connect(data_node_enddatum, knowledge_graph_parameters_dict)
-    drks_id.current_data.connect(data_node_drksid, knowledge_graph_parameters_dict)
-    studien_id.current_data.connect(data_node_studien_id, knowledge_graph_parameters_dict)
+    layer.add_leaf(Studieninformationen, "hat_studienname", studieninformationen, Studienname, study.name, knowledge_graph_parameters_dict)
+    layer.add_leaf(Studieninformationen, "hat_studienzweck", studieninformationen, Studienzweck, study.purpose, knowledge_graph_parameters_dict)
+    layer.add_leaf(Studieninformationen, "hat_beschreibungstext", studieninformationen, Beschreibungstext, study.description, knowledge_graph_parameters_dict)
+    layer.add_leaf(Studieninformationen, "hat_startdatum", studieninformationen, Startdatum, str(study.date_start), knowledge_graph_parameters_dict, data_type = "date")
+    layer.add_leaf(Studieninformationen, "hat_enddatum", studieninformationen, Enddatum, str(study.date_end), knowledge_graph_parameters_dict, data_type = "date")
+    layer.add_leaf(Studieninformationen, "hat_drksid", studieninformationen, DRKSID, study.drks_id, knowledge_graph_parameters_dict)
+    layer.add_leaf(Studieninformationen, "hat_studienid", studieninformationen, StudienID, str(study.id), knowledge_graph_parameters_dict, data_type = "integer")
     
     return studieninformationen
 
@@ -296,25 +308,30 @@ def build_study_information_subgraph(study: Study, knowledge_graph_parameters_di
 # TODO: functions for data upload into existing (coodebook-)study graph below here
 
 # TODO: add , data: [schema.StudyDataSubmissionSchema] to function signature
-def add_study_data_to_knowledge_graph(study_id: int, data: list[schema.StudyDataSubmissionSchema]) -> None:
+def add_study_data_to_knowledge_graph(study_id: int, data: list[schema.StudyDataSubmissionSchema], resume: bool = False, chunk_size: int | None = None,
+                                      progress: Callable[[int], None] | None = None, update: bool = False) -> None:
+    """
+    Streams the uploaded data rows into the study graph.
+    The rows are written in chunks of chunk_size (default: settings.DATA_INGESTION_CHUNK_SIZE) answer groups and every chunk is committed
+    together with an IngestionCheckpoint. With resume = True, codebooks are continued after their last committed row.
+    With update = True, existing answer groups (same Fragebogen, participant and ReihenID) are updated and only changed answers are written.
+    A resumed upload always runs in update mode: the workers of the process pool commit their partitions in any order, so rows after
+    the checkpoint can already be in the graph and are upserted instead of being written twice.
+    progress is called with the number of rows of every committed chunk.
+    """
     # TODO: Check only needed once (in endpoint or here?)
     # check if the study exists in the graph database
-    studie_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag="Studie")
-    if not studie_ontology_node:
-        raise HttpError(404, "Ontology node 'Studie' not found")
-    
-    Studie = studie_ontology_node.node_class
+    current_study = get_study_node(study_id)
     
-    current_study_list = Studie.nodes.first_or_none(hat_studieninformationen__hat_studienid__current_data__value = str(study_id))
-    
-    if not current_study_list:
+    if current_study is None:
         raise HttpError(404, f"Knowledge node 'Studien' for study with id {study_id} not found")
     
-    current_study = current_study_list[0]
-    
     # get graph id of the study 
     graph_id = current_study.graph_id
     data_graph_parameters_dict = {"graph_id": graph_id}
+    
+    # Items by Feldname and Fragebogen nodes by codebook id are loaded once for the whole upload
+    index = build_ingestion_index(graph_id)
 
     # TODO: first implementation only adding unverfified data with in_review relationship to DataNodes
     # TODO: later check if there is already present for a specific codebook and if so, update the data
@@ -322,65 +339,163 @@ def add_study_data_to_knowledge_graph(study_id: int, data: list[schema.StudyData
     # loop over the codebooks
     
     
+    codebooks = []
+    resumed = False
     for codebook_data in data:
         codebook_id = codebook_data.code_book_id
-        build_and_attach_quality_check_subgraph(graph_id = graph_id, codebook_id = codebook_id, data_qualitycheck_config = codebook_data.data_quality_check_config)
+        checkpoint = get_checkpoint(graph_id, codebook_id) if resume else None
+        
+        if checkpoint:
+            rows_done = checkpoint.rows_done
+            resumed = True
+        else:
+            rows_done = 0
+            # the quality check is committed together with the start checkpoint, so a resume won't create it again
+            with chunk_transaction():
+                # an update keeps the quality check of the first upload
+                if not (update and index.questionnaire(codebook_id).hat_qualitaetspruefung.single()):
+                    build_and_attach_quality_check_subgraph(graph_id = graph_id, codebook_id = codebook_id, data_qualitycheck_config = codebook_data.data_quality_check_config)
+                save_checkpoint(graph_id, codebook_id, rows_done)
+        
         # separate the mapping row from the data rows
-        mapping_row = codebook_data.values.pop(0)
+        mapping_row = codebook_data.values[0]
         #trust_center_id_index = mapping_row.index("TrustCenterID")
         
-        # rows are antwortgruppen of patients
-        for idx, row in enumerate(codebook_data.values):
-            current_patient_id = row[0]
-            
-            # TODO: check if patient is already present for the current study if not create patient subgraph up to Teilnehmer node
-            participant_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Teilnehmer")
-            Participant = participant_node.node_class                      
-            
-            patient_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Patient")
-            Patient = patient_node.node_class
-
-            # NOTE: What happens if patient has different IDs for current_data and in_review?
-            
-            # maybe combine with or in the filtering
-            current_patient_current = Patient.nodes.first_or_none(hat_patientid__current_data__value = current_patient_id, graph_id = graph_id)
-            current_patient_in_review = Patient.nodes.first_or_none(hat_patientid__in_review__value = current_patient_id, graph_id = graph_id)
-
-            if current_patient_current:
-                current_participant = current_patient_current[0].ist_teilnehmer.single()
+        # Datentyp of every column, used for the typed shadow properties of the answers
+        data_types = get_item_data_types(codebook_id, codebook_data.data_quality_check_config.VALUE_TYPE)
+        column_types = [data_types.get(field_name) for field_name in mapping_row]
+        codebooks.append((codebook_data, codebook_id, mapping_row, column_types, rows_done))
+    
+    # the checkpoint only covers the contiguous rows before the first unfinished partition
+    update = update or resumed
+    
+    # Large uploads are written by a process pool, small ones aren't worth starting the workers
+    chunk_size = chunk_size or settings.DATA_INGESTION_CHUNK_SIZE
+    total_rows = sum(len(codebook_data.values) - 1 - rows_done for codebook_data, _, _, _, rows_done in codebooks)
+    if settings.DATA_INGESTION_WORKERS > 1 and total_rows > chunk_size:
+        add_study_data_with_process_pool(current_study, codebooks, index, chunk_size, progress, update)
+    
+    else:
+        for codebook_data, codebook_id, mapping_row, column_types, rows_done in codebooks:
+            # rows are antwortgruppen of patients, every chunk is written with one unit of work and committed with its checkpoint
+            for chunk in chunked(iter_data_rows(codebook_data, start = rows_done), chunk_size):
+                with chunk_transaction():
+                    uow = UnitOfWork()
                 
-            if current_patient_in_review:
-                current_participant = current_patient_in_review[0].ist_teilnehmer.single()
-            
-            
-            # TODO: assumption: all in review data of this study for the current study graph was deleted
-            if not (current_patient_current or current_patient_in_review):
-                current_participant = add_new_patient_to_study(patient_id = current_patient_id, graph_id = graph_id)        
-                current_study.hat_teilnehmer.connect(current_participant, data_graph_parameters_dict)
+                    # Teilnehmer of all patients in the chunk, missing patients are created within the same unit of work
+                    participants = resolve_participants(current_study, [row[0] for _, row in chunk], graph_id, uow)
                 
+                    # the stored answer groups of the chunk are compared with the uploaded rows in an update
+                    stored_answer_groups = {}
+                    if update:
+                        stored_answer_groups = load_stored_answer_groups(index.questionnaire(codebook_id), [(participants[str(row[0])], idx) for idx, row in chunk])
                 
-                # NOTE: build Antwortgruppen from scratch or update existing one with new values  
-                build_or_update_answer_group_from_data(current_participant = current_participant, 
-                                                       mapping_row = mapping_row, 
-                                                       row_id = idx, 
-                                                       data_row = row, 
-                                                       graph_id = graph_id, 
-                                                       codebook_id = codebook_id
-                                                       )
-            else: 
-                build_or_update_answer_group_from_data(current_participant = current_participant, 
-                                                       mapping_row = mapping_row, 
-                                                       row_id = idx, 
-                                                       data_row = row, 
-                                                       graph_id = graph_id, 
-                                                       codebook_id = codebook_id
-                                                       )
+                    for idx, row in chunk:
+                        current_participant = participants[str(row[0])]
+                    
+                        # NOTE: build Antwortgruppen from scratch or update existing one with new values  
+                        build_or_update_answer_group_from_data(current_participant = current_participant, 
+                                                               mapping_row = mapping_row, 
+                                                               row_id = idx, 
+                                                               data_row = row, 
+                                                               graph_id = graph_id, 
+                                                               codebook_id = codebook_id,
+                                                               uow = uow,
+                                                               index = index,
+                                                               stored_answer_group = stored_answer_groups.get((current_participant.uuid, idx)),
+                                                               column_types = column_types
+                                                               )
+                
+                    commit_with_statistics(uow, graph_id)
+                    rows_done += len(chunk)
+                    save_checkpoint(graph_id, codebook_id, rows_done)
+                logger.info(f"Committed {rows_done} data rows of codebook {codebook_id} for study graph {graph_id}")
+                if progress:
+                    progress(len(chunk))
+    
+    delete_checkpoints(graph_id)
 
     
     
+def add_study_data_with_process_pool(current_study: KnowledgeNode, codebooks: list[tuple], index: IngestionIndex, chunk_size: int,
+                                     progress: Callable[[int], None] | None = None, update: bool = False) -> None:
+    """
+    Writes the data rows of all codebooks with a pool of settings.DATA_INGESTION_WORKERS processes.
+    The patients of the whole upload are resolved and committed first, because rows of different partitions can share a patient.
+    Afterwards every chunk of rows is a partition that a worker writes in its own transaction. Partitions are created lazily,
+    so streamed uploads (DataFileRows) are read a second time instead of being held in memory.
+    """
+    graph_id = current_study.graph_id
+    
+    uow = UnitOfWork()
+    patient_ids = list({row[0] for codebook_data, _, _, _, rows_done in codebooks for _, row in iter_data_rows(codebook_data, start = rows_done)})
+    participants = {patient_id: participant.uuid for patient_id, participant in resolve_participants(current_study, patient_ids, graph_id, uow).items()}
+    with chunk_transaction():
+        commit_with_statistics(uow, graph_id)
+    
+    partitions = (
+        Partition(
+            graph_id = graph_id,
+            codebook_id = codebook_id,
+            mapping_row = mapping_row,
+            rows = chunk,
+            participants = {str(row[0]): participants[str(row[0])] for _, row in chunk},
+            fragebogen = index.questionnaire(codebook_id).uuid,
+            items = {field_name: index.item(field_name).uuid for field_name in mapping_row},
+            update = update,
+            column_types = column_types,
+        )
+        for codebook_data, codebook_id, mapping_row, column_types, rows_done in codebooks
+        for chunk in chunked(iter_data_rows(codebook_data, start = rows_done), chunk_size)
+    )
+    
+    # partitions finish in any order, the checkpoint of a codebook only advances over contiguous finished partitions
+    # and rows of partitions after it are upserted on resume (see add_study_data_to_knowledge_graph)
+    rows_done = {codebook_id: rows_done for _, codebook_id, _, _, rows_done in codebooks}
+    finished = {codebook_id: {} for _, codebook_id, _, _, _ in codebooks}
+    
+    def on_done(partition: Partition) -> None:
+        if progress:
+            progress(len(partition.rows))
+        finished[partition.codebook_id][partition.start] = len(partition.rows)
+        if partition.start != rows_done[partition.codebook_id]:
+            return
+        while rows_done[partition.codebook_id] in finished[partition.codebook_id]:
+            rows_done[partition.codebook_id] += finished[partition.codebook_id].pop(rows_done[partition.codebook_id])
+        with chunk_transaction():
+            save_checkpoint(graph_id, partition.codebook_id, rows_done[partition.codebook_id])
+        logger.info(f"Committed {rows_done[partition.codebook_id]} data rows of codebook {partition.codebook_id} for study graph {graph_id}")
+    
+    run_partitions(partitions, settings.DATA_INGESTION_WORKERS, on_done)
+
+
+@dataclass
+class StoredAnswer:
+    uuid: str
+    value: str | None
+    # hash of the value if it's in the blob store, see knowledge.blobs
+    value_hash: str | None = None
+
+    def matches(self, value: str) -> bool:
+        if self.value_hash:
+            return self.value_hash == blob_hash(value)
+        return self.value == value
+
+@dataclass
+class StoredAnswerGroup:
+    """Answer group of a participant that is already in the graph with its answers by Item uuid."""
+    uuid: str
+    answers: dict[str, StoredAnswer]
+
+
 # TODO: build a new answer group from scratch
 # Note the creeation from scatch seems to work
-def build_or_update_answer_group_from_data(current_participant: OntologyNode, mapping_row: list[str], row_id: int, data_row: list[str], graph_id: int, codebook_id: int):
+def build_or_update_answer_group_from_data(current_participant: OntologyNode, mapping_row: list[str], row_id: int, data_row: list[str], graph_id: int, codebook_id: int, 
+                                           uow: UnitOfWork | None = None, index: IngestionIndex | None = None, stored_answer_group: StoredAnswerGroup | None = None,
+                                           column_types: list[str | None] | None = None):
+    
+    # Datentyp of the item of every column, numeric and date answers get typed shadow properties
+    column_types = column_types or [None] * len(mapping_row)
     
     data_graph_parameters_dict = {"graph_id": graph_id}
     
@@ -392,39 +507,108 @@ def build_or_update_answer_group_from_data(current_participant: OntologyNode, ma
     
     answer_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Antwort")
     Answer = answer_node.node_class
-        
     
-    #current_answer_group = # NOTE: try to get current answer group based on fragebogen, participant and row id
-    answer_group = None
+    # NOTE: without a given unit of work, the answer group is written immediately
+    commit = uow is None
+    uow = uow or UnitOfWork()
     
-    if answer_group:
-        # TODO: update existing answer group
-        pass
+    if stored_answer_group:
+        # only answers whose value differs from the stored one are written. The current value stays until the review is accepted,
+        # it's moved to PREVIOUS by set_in_review_data_to_current_for_subgraph. An older upload that is still in review is replaced.
+        answer_group = NodeHandle(AnswerGroup, stored_answer_group.uuid)
         
+        for column, cell in enumerate(data_row):
+            current_item = index.item(mapping_row[column]) if index else get_item_by_feldname(graph_id = graph_id, field_name = mapping_row[column])
+            stored_answer = stored_answer_group.answers.get(current_item.uuid)
+            
+            if stored_answer and stored_answer.matches(str(cell)):
+                continue
+            
+            if stored_answer:
+                answer = NodeHandle(Answer, stored_answer.uuid)
+                uow.move_data(answer, ["in_review"], "previous_data")
+            else:
+                answer = uow.create(Answer, {**data_graph_parameters_dict})
+                uow.connect(answer_group, "hat_antwort", answer, data_graph_parameters_dict)
+                uow.connect(current_item, "hat_antwort", answer, data_graph_parameters_dict)
+            
+            uow.add_data(answer, str(cell), data_graph_parameters_dict, "in_review", column_types[column])
         
     else:
         # TODO: build new answer group and answers
-        answer_group = AnswerGroup.create({**data_graph_parameters_dict})[0]
-        answer_group_id = AnswerGroupID.create({**data_graph_parameters_dict})[0]
-        current_fragebogen = get_fragebogen_by_id(graph_id = graph_id, fragebogen_id = codebook_id)
+        answer_group = uow.create(AnswerGroup, {**data_graph_parameters_dict, "row_idx": int(row_id)})
+        answer_group_id = uow.create(AnswerGroupID, {**data_graph_parameters_dict})
+        if index:
+            current_fragebogen = index.questionnaire(codebook_id)
+        else:
+            current_fragebogen = get_fragebogen_by_id(graph_id = graph_id, fragebogen_id = codebook_id)
         
-        answer_group_id_data_node = DataNode.create({**data_graph_parameters_dict, "value": str(row_id)})[0]
+        uow.connect(current_participant, "gibt_antwortgruppe", answer_group, data_graph_parameters_dict)
+        uow.connect(answer_group, "hat_reihenid", answer_group_id, data_graph_parameters_dict)
+        uow.connect(current_fragebogen, "hat_antwortgruppe", answer_group, data_graph_parameters_dict)
         
-        current_participant.gibt_antwortgruppe.connect(answer_group, data_graph_parameters_dict)
-        answer_group.hat_reihenid.connect(answer_group_id, data_graph_parameters_dict)
-        current_fragebogen.hat_antwortgruppe.connect(answer_group, data_graph_parameters_dict)
+        uow.add_data(answer_group_id, str(row_id), data_graph_parameters_dict, "in_review", "integer")
         
-        answer_group_id.in_review.connect(answer_group_id_data_node, data_graph_parameters_dict)
-        
-        for index, cell in enumerate(data_row):
-            answer = Answer.create({**data_graph_parameters_dict})[0]
-            answer_data_node = DataNode.create({**data_graph_parameters_dict, "value": str(cell)})[0]
-            current_item = get_item_by_feldname(graph_id = graph_id, field_name = mapping_row[index])
+        for column, cell in enumerate(data_row):
+            answer = uow.create(Answer, {**data_graph_parameters_dict})
+            current_item = index.item(mapping_row[column]) if index else get_item_by_feldname(graph_id = graph_id, field_name = mapping_row[column])
             
-            answer_group.hat_antwort.connect(answer, data_graph_parameters_dict)
-            current_item.hat_antwort.connect(answer, data_graph_parameters_dict)
-            answer.in_review.connect(answer_data_node, data_graph_parameters_dict)
+            uow.connect(answer_group, "hat_antwort", answer, data_graph_parameters_dict)
+            uow.connect(current_item, "hat_antwort", answer, data_graph_parameters_dict)
+            uow.add_data(answer, str(cell), data_graph_parameters_dict, "in_review", column_types[column])
         
+    if commit:
+        uow.commit()
+
+
+def load_stored_answer_groups(fragebogen: KnowledgeNode, rows: list[tuple[KnowledgeNode | NodeHandle, int]]) -> dict[tuple[str, int], StoredAnswerGroup]:
+    """
+    Loads the answer groups of a Fragebogen for (participant, row id) pairs together with the values of their answers in one query.
+    In review values take precedence over current ones, since they are the latest upload. Returns {(participant uuid, row id): group}.
+    """
+    classes = {}
+    for tag in ("Teilnehmer", "Fragebogen", "Antwortgruppe", "ReihenID", "Antwort", "Item"):
+        ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = tag)
+        if not ontology_node:
+            raise HttpError(404, f"Ontology node '{tag}' not found")
+        classes[tag] = ontology_node.node_class
+    Participant, AnswerGroup, Item = classes["Teilnehmer"], classes["Antwortgruppe"], classes["Item"]
+    
+    query = (
+        "UNWIND $rows AS row "
+        "MATCH (:KnowledgeNode {uuid: row.participant})-[:$($gibt_antwortgruppe)]->(answer_group:$($answer_group_label))"
+        "<-[:$($hat_antwortgruppe)]-(:KnowledgeNode {uuid: $fragebogen}) "
+        "MATCH (answer_group)-[:$($hat_reihenid)]->(:$($row_id_label))-[r]->(row_id:DataNode {value: toString(row.row_id)}) "
+        "WHERE type(r) IN [$current, $in_review] "
+        "OPTIONAL MATCH (answer_group)-[:$($hat_antwort)]->(answer:$($answer_label))<-[:$($item_hat_antwort)]-(item:$($item_label)) "
+        "OPTIONAL MATCH (answer)-[v]->(value:DataNode) WHERE type(v) IN [$current, $in_review] "
+        "WITH row, answer_group, item, answer, value ORDER BY type(v) = $in_review "
+        "RETURN row.participant, row.row_id, answer_group.uuid, collect([item.uuid, answer.uuid, value.value, value.value_hash])"
+    )
+    results, _ = db.cypher_query(query, {
+        "rows": [{"participant": participant.uuid, "row_id": row_id} for participant, row_id in rows],
+        "fragebogen": fragebogen.uuid,
+        "gibt_antwortgruppe": relationship_definition(Participant, "gibt_antwortgruppe")["relation_type"],
+        "hat_antwortgruppe": relationship_definition(classes["Fragebogen"], "hat_antwortgruppe")["relation_type"],
+        "hat_reihenid": relationship_definition(AnswerGroup, "hat_reihenid")["relation_type"],
+        "hat_antwort": relationship_definition(AnswerGroup, "hat_antwort")["relation_type"],
+        "item_hat_antwort": relationship_definition(Item, "hat_antwort")["relation_type"],
+        "answer_group_label": AnswerGroup.__label__,
+        "row_id_label": classes["ReihenID"].__label__,
+        "answer_label": classes["Antwort"].__label__,
+        "item_label": Item.__label__,
+        "current": relationship_definition(LeafNode, "current_data")["relation_type"],
+        "in_review": relationship_definition(LeafNode, "in_review")["relation_type"],
+    })
+    
+    stored_answer_groups = {}
+    for participant, row_id, answer_group, answers in results:
+        stored_answer_group = stored_answer_groups.setdefault((participant, row_id), StoredAnswerGroup(answer_group, {}))
+        for item, answer, value, value_hash in answers:
+            if item and answer:
+                # in review values are ordered last and overwrite current ones
+                stored_answer_group.answers[item] = StoredAnswer(answer, value, value_hash)
+    return stored_answer_groups
 
 
 # TODO: get the item node of a specific graph by value oif the feldname metadata node
@@ -447,63 +631,143 @@ def get_item_by_feldname(graph_id: int, field_name: str) -> OntologyNode:
 def get_fragebogen_by_id(graph_id: int, fragebogen_id: int) -> KnowledgeNode:
     
     
-    fragebogen_ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Fragebogen")
-    Fragebogen = fragebogen_ontology_node.node_class
+    current_fragebogen = get_fragebogen_node(fragebogen_id, graph_id = graph_id)
     
-    current_fragebogen = Fragebogen.nodes.first_or_none(hat_fragebogenid__current_data__value = str(fragebogen_id), graph_id = graph_id)[0]
+    if current_fragebogen is None:
+        raise HttpError(404, f"Knowledge node 'Fragebogen' for codebook {fragebogen_id} not found")
     
     return current_fragebogen
+
+
+def find_nodes_by_leaf_value(NodeClass: type, path: list[tuple[str, str]], value: str, graph_id: int | None = None) -> list[KnowledgeNode]:
+    """
+    Returns the nodes of NodeClass whose leaf at the end of path (relationship field and tag of every step, empty for the leaves themselves)
+    has value, either as current data node or as inline value (see knowledge.models.InlineData).
+    Replaces traversal filters like Studie.nodes.filter(hat_studieninformationen__hat_studienid__current_data__value = value),
+    which don't find inline values.
+    """
+    classes = {tag: OntologyNode.nodes.get(tag = tag).node_class for _, tag in path}
+    parameters = {"value": value, "graph_id": graph_id}
+    
+    # n -[field]-> tag -[field]-> ... -> leaf, without a path n is the leaf
+    # The labels are literals, so the start node seeks the KnowledgeNode graph_id index of a study or the label index across studies.
+    if graph_id is None:
+        pattern = f"(n:{escape_label(NodeClass.__label__)})"
+    else:
+        pattern = f"(n:KnowledgeNode:{escape_label(NodeClass.__label__)} {{graph_id: $graph_id}})"
+    LeafClass = NodeClass
+    for index, (field_name, tag) in enumerate(path):
+        parameters[f"type_{index}"] = relationship_definition(LeafClass, field_name)["relation_type"]
+        variable = "leaf" if index == len(path) - 1 else ""
+        pattern += f"-[:$($type_{index})]->({variable}:{escape_label(classes[tag].__label__)})"
+        LeafClass = classes[tag]
+    leaf = "leaf" if path else "n"
+    parameters["current"] = relationship_definition(LeafClass, "current_data")["relation_type"]
+    
+    query = (
+        f"MATCH {pattern} "
+        f"WHERE {leaf}.value = $value OR EXISTS {{ ({leaf})-[:$($current)]->(:DataNode {{value: $value}}) }} "
+        "RETURN DISTINCT n"
+    )
+    results, _ = db.cypher_query(query, parameters, resolve_objects = True)
+    return [node for node, in results]
     
 
 
 
-# Add new Patient to a study, return the Teilnehmer node
-def add_new_patient_to_study(patient_id: str, graph_id: int) -> OntologyNode:
-    
+def get_patient_node_classes() -> dict[str, type]:
+    """Returns the knowledge node classes of the patient subgraph (Patient, PatientID, PatientIDAT, Teilnehmer) by tag."""
+    classes = {}
+    for tag in ("Patient", "PatientID", "PatientIDAT", "Teilnehmer"):
+        ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = tag)
+        if not ontology_node:
+            raise HttpError(404, f"Ontology node '{tag}' not found")
+        classes[tag] = ontology_node.node_class
+    return classes
+
+
+def build_patient_subgraph(uow: UnitOfWork, patient_id: str, graph_id: int, classes: dict[str, type]) -> NodeHandle:
+    """Adds Patient, PatientID, PatientIDAT with their in review data and the Teilnehmer node to uow and returns the Teilnehmer."""
     data_graph_parameters_dict = {"graph_id": graph_id}
     
-    patient_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Patient")
-    Patient = patient_node.node_class
-    
-    # maybe combine with or in the filtering
-    current_patient_current = Patient.nodes.first_or_none(hat_patientid__current_data__value = patient_id, graph_id = graph_id)
-    current_patient_in_review = Patient.nodes.first_or_none(hat_patientid__in_review__value = patient_id, graph_id = graph_id)
-    
-    if current_patient_current or current_patient_in_review:
-        raise HttpError(400, f"Patient with id {patient_id} already exists in the graph database.")
-        
-    new_patient = Patient.create({**data_graph_parameters_dict, "stakeholder_id": patient_id})[0]
+    new_patient = uow.create(classes["Patient"], {**data_graph_parameters_dict, "stakeholder_id": patient_id})
     
     # Create patient ids
-    patient_idat_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "PatientIDAT")
-    PatientIDAT = patient_idat_node.node_class
+    new_patient_id = uow.create(classes["PatientID"], {**data_graph_parameters_dict})
+    new_patient_idat = uow.create(classes["PatientIDAT"], {**data_graph_parameters_dict})
     
-    patient_id_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "PatientID")
-    PatientID = patient_id_node.node_class
+    new_patient_id_data = uow.create(DataNode, {**data_graph_parameters_dict, "value": patient_id})
+    new_patient_idat_data = uow.create(DataNode, {**data_graph_parameters_dict, "value": patient_id})
     
-    new_patient_id = PatientID.create({**data_graph_parameters_dict})[0]
-    new_patient_idat = PatientIDAT.create({**data_graph_parameters_dict})[0]
+    # Connect patient ids
+    uow.connect(new_patient, "hat_patientid", new_patient_id, data_graph_parameters_dict)
+    uow.connect(new_patient, "hat_patientidat", new_patient_idat, data_graph_parameters_dict)
     
-    new_patient_id_data = DataNode.create({**data_graph_parameters_dict, "value": patient_id})[0]
-    new_patient_idat_data = DataNode.create({**data_graph_parameters_dict, "value": patient_id})[0]
+    uow.connect(new_patient_id, "in_review", new_patient_id_data, data_graph_parameters_dict)
+    uow.connect(new_patient_idat, "in_review", new_patient_idat_data, data_graph_parameters_dict)
     
-    # Connect patient ids
-    new_patient.hat_patientid.connect(new_patient_id, data_graph_parameters_dict)
-    new_patient.hat_patientidat.connect(new_patient_idat, data_graph_parameters_dict)
+    # create new participant and connect it to patient
+    new_participant = uow.create(classes["Teilnehmer"], {**data_graph_parameters_dict})
+    uow.connect(new_patient, "ist_teilnehmer", new_participant, data_graph_parameters_dict)
     
-    new_patient_id.in_review.connect(new_patient_id_data, data_graph_parameters_dict)
-    new_patient_idat.in_review.connect(new_patient_idat_data, data_graph_parameters_dict)
+    return new_participant
+
+
+def resolve_participants(current_study: KnowledgeNode, patient_ids: list[str], graph_id: int, uow: UnitOfWork) -> dict[str, KnowledgeNode | NodeHandle]:
+    """
+    Returns the Teilnehmer node for every patient id of an upload.
+    Existing patients (current or in review PatientID) are resolved with a single query, the subgraphs of all missing patients
+    are added to uow and connected to the study. New participants are returned as handles, which can be connected within uow.
+    """
+    classes = get_patient_node_classes()
+    Patient, PatientID = classes["Patient"], classes["PatientID"]
+    patient_ids = list(dict.fromkeys(str(patient_id) for patient_id in patient_ids))
+    
+    # NOTE: if a patient has both a current and an in review id, the in review one wins like in the per row lookup before
+    # the labels are literal, so the patients are found with the graph_id index of KnowledgeNode (see knowledge.indexes)
+    query = (
+        f"MATCH (patient:KnowledgeNode:{escape_label(Patient.__label__)} {{graph_id: $graph_id}})"
+        f"-[:$($hat_patientid)]->(:{escape_label(PatientID.__label__)})-[r]->(data:DataNode) "
+        "WHERE type(r) IN [$current, $in_review] AND data.value IN $patient_ids "
+        "MATCH (patient)-[:$($ist_teilnehmer)]->(participant) "
+        "RETURN data.value, participant ORDER BY type(r) = $in_review"
+    )
+    results, _ = db.cypher_query(query, {
+        "graph_id": graph_id,
+        "patient_ids": patient_ids,
+        "hat_patientid": relationship_definition(Patient, "hat_patientid")["relation_type"],
+        "ist_teilnehmer": relationship_definition(Patient, "ist_teilnehmer")["relation_type"],
+        "current": relationship_definition(PatientID, "current_data")["relation_type"],
+        "in_review": relationship_definition(PatientID, "in_review")["relation_type"],
+    }, resolve_objects = True)
+    participants = {patient_id: participant for patient_id, participant in results}
+    
+    # TODO: assumption: all in review data of this study for the current study graph was deleted
+    for patient_id in patient_ids:
+        if patient_id not in participants:
+            participants[patient_id] = build_patient_subgraph(uow, patient_id, graph_id, classes)
+            uow.connect(current_study, "hat_teilnehmer", participants[patient_id], {"graph_id": graph_id})
+    
+    return participants
+
+
+# Add new Patient to a study, return the Teilnehmer node
+def add_new_patient_to_study(patient_id: str, graph_id: int) -> OntologyNode:
+    
+    classes = get_patient_node_classes()
+    Patient = classes["Patient"]
     
-    participant_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = "Teilnehmer")
-    Participant = participant_node.node_class
+    # maybe combine with or in the filtering
+    current_patient_current = Patient.nodes.first_or_none(hat_patientid__current_data__value = patient_id, graph_id = graph_id)
+    current_patient_in_review = Patient.nodes.first_or_none(hat_patientid__in_review__value = patient_id, graph_id = graph_id)
     
-    # create new participant
-    new_participant = Participant.create({**data_graph_parameters_dict})[0]
+    if current_patient_current or current_patient_in_review:
+        raise HttpError(400, f"Patient with id {patient_id} already exists in the graph database.")
     
-    # connect participant to patient
-    new_patient.ist_teilnehmer.connect(new_participant, data_graph_parameters_dict)
+    with UnitOfWork() as uow:
+        new_participant = build_patient_subgraph(uow, patient_id, graph_id, classes)
     
-    return new_participant
+    return new_participant.node
     
     
 
@@ -558,58 +822,61 @@ def build_and_attach_quality_check_subgraph(
     
     logger.info(f"Quality check ontology nodes found")
     
+    uow = UnitOfWork()
+    
     # create the KnowledgeNodes for the quality check subgraph
-    quality_check = Quality_check.create(data_graph_parameters_dict)[0]
-    data_type = Data_type.create(data_graph_parameters_dict)[0]
-    minimum = Minimum.create(data_graph_parameters_dict)[0]
-    maximum = Maximum.create(data_graph_parameters_dict)[0]
-    options = Options.create(data_graph_parameters_dict)[0]
-    options_separator = Options_separator.create(data_graph_parameters_dict)[0]
-    answers_separator = Answers_separator.create(data_graph_parameters_dict)[0]
-    needs_quality_check = Needs_quality_check.create(data_graph_parameters_dict)[0]
-    empty_values = Empty_values.create(data_graph_parameters_dict)[0]
-    empty_rows = Empty_rows.create(data_graph_parameters_dict)[0]
-    empty_columns = Empty_columns.create(data_graph_parameters_dict)[0]
+    quality_check = uow.create(Quality_check, data_graph_parameters_dict)
+    data_type = uow.create(Data_type, data_graph_parameters_dict)
+    minimum = uow.create(Minimum, data_graph_parameters_dict)
+    maximum = uow.create(Maximum, data_graph_parameters_dict)
+    options = uow.create(Options, data_graph_parameters_dict)
+    options_separator = uow.create(Options_separator, data_graph_parameters_dict)
+    answers_separator = uow.create(Answers_separator, data_graph_parameters_dict)
+    needs_quality_check = uow.create(Needs_quality_check, data_graph_parameters_dict)
+    empty_values = uow.create(Empty_values, data_graph_parameters_dict)
+    empty_rows = uow.create(Empty_rows, data_graph_parameters_dict)
+    empty_columns = uow.create(Empty_columns, data_graph_parameters_dict)
     
     # create the DataNodes for the quality check information
-    data_type_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_TYPE})[0]
-    minimum_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_RANGE_MIN})[0]
-    maximum_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_RANGE_MAX})[0]
-    options_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_MAPPING})[0]
-    options_separator_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.mappingSeparator})[0]
-    answers_separator_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.answerSeparator})[0]
-    needs_quality_check_data_node = DataNode.create({**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_REQUIRED})[0]
-    empty_values_data_node = DataNode.create({**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_VALUES)})[0]
-    empty_rows_data_node = DataNode.create({**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_ROWS)})[0]
-    empty_columns_data_node = DataNode.create({**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_COLUMNS)})[0]
+    data_type_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_TYPE})
+    minimum_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_RANGE_MIN})
+    maximum_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_RANGE_MAX})
+    options_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_MAPPING})
+    options_separator_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.mappingSeparator})
+    answers_separator_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.answerSeparator})
+    needs_quality_check_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": data_qualitycheck_config.VALUE_REQUIRED})
+    empty_values_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_VALUES)})
+    empty_rows_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_ROWS)})
+    empty_columns_data_node = uow.create(DataNode, {**data_graph_parameters_dict, "value": str(data_qualitycheck_config.EMPTY_COLUMNS)})
     
     # connect leaf nodes to connective node (quality check)    
-    quality_check.hat_datentyp.connect(data_type, data_graph_parameters_dict)
-    quality_check.hat_minimum.connect(minimum, data_graph_parameters_dict)
-    quality_check.hat_maximum.connect(maximum, data_graph_parameters_dict)
-    quality_check.hat_auswahlmoeglichkeiten.connect(options, data_graph_parameters_dict)
-    quality_check.hat_trennzeichenauswahlmoeglichkeiten.connect(options_separator, data_graph_parameters_dict)
-    quality_check.hat_trennzeichenantworten.connect(answers_separator, data_graph_parameters_dict)
-    quality_check.hat_benoetigtqualitaetspruefung.connect(needs_quality_check, data_graph_parameters_dict)
-    quality_check.hat_leerewerte.connect(empty_values, data_graph_parameters_dict)
-    quality_check.hat_leerezeilen.connect(empty_rows, data_graph_parameters_dict)
-    quality_check.hat_leerespalten.connect(empty_columns, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_datentyp", data_type, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_minimum", minimum, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_maximum", maximum, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_auswahlmoeglichkeiten", options, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_trennzeichenauswahlmoeglichkeiten", options_separator, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_trennzeichenantworten", answers_separator, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_benoetigtqualitaetspruefung", needs_quality_check, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_leerewerte", empty_values, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_leerezeilen", empty_rows, data_graph_parameters_dict)
+    uow.connect(quality_check, "hat_leerespalten", empty_columns, data_graph_parameters_dict)
     
     # connect data nodes to leaf nodes
-    data_type.in_review.connect(data_type_data_node, data_graph_parameters_dict)
-    minimum.in_review.connect(minimum_data_node, data_graph_parameters_dict)
-    maximum.in_review.connect(maximum_data_node, data_graph_parameters_dict)
-    options.in_review.connect(options_data_node, data_graph_parameters_dict)
-    options_separator.in_review.connect(options_separator_data_node, data_graph_parameters_dict)
-    answers_separator.in_review.connect(answers_separator_data_node, data_graph_parameters_dict)
-    needs_quality_check.in_review.connect(needs_quality_check_data_node, data_graph_parameters_dict)
-    empty_values.in_review.connect(empty_values_data_node, data_graph_parameters_dict)
-    empty_rows.in_review.connect(empty_rows_data_node, data_graph_parameters_dict)
-    empty_columns.in_review.connect(empty_columns_data_node, data_graph_parameters_dict)
+    uow.connect(data_type, "in_review", data_type_data_node, data_graph_parameters_dict)
+    uow.connect(minimum, "in_review", minimum_data_node, data_graph_parameters_dict)
+    uow.connect(maximum, "in_review", maximum_data_node, data_graph_parameters_dict)
+    uow.connect(options, "in_review", options_data_node, data_graph_parameters_dict)
+    uow.connect(options_separator, "in_review", options_separator_data_node, data_graph_parameters_dict)
+    uow.connect(answers_separator, "in_review", answers_separator_data_node, data_graph_parameters_dict)
+    uow.connect(needs_quality_check, "in_review", needs_quality_check_data_node, data_graph_parameters_dict)
+    uow.connect(empty_values, "in_review", empty_values_data_node, data_graph_parameters_dict)
+    uow.connect(empty_rows, "in_review", empty_rows_data_node, data_graph_parameters_dict)
+    uow.connect(empty_columns, "in_review", empty_columns_data_node, data_graph_parameters_dict)
     
     # connect quality_check to Fragebogen based on the codebook id    
     current_fragebogen = get_fragebogen_by_id(graph_id = graph_id, fragebogen_id = codebook_id)
-    current_fragebogen.hat_qualitaetspruefung.connect(quality_check, data_graph_parameters_dict)
+    uow.connect(current_fragebogen, "hat_qualitaetspruefung", quality_check, data_graph_parameters_dict)
+    uow.commit()
     
 
 # TODO: change is_verfied from false to true for all nodes with is_verified = false and graph_id = graph_id
@@ -621,23 +888,176 @@ def set_current_data_nodes_to_previous_for_subgraph(graph_id: int):
     raise HttpError(501, f"set_current_data_nodes_to_previous not implemented")
 
 
-def set_in_review_data_to_current_for_subgraph(graph_id: int):
-    query = "MATCH (n:LeafNode {graph_id: $graph_id})-[r:IN_REVIEW]->(d:DataNode) CREATE (n)-[:CURRENT]->(d) DELETE r"
-    db.cypher_query(query, {"graph_id": graph_id})
+def set_in_review_data_to_current_for_subgraph(graph_id: int, batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Moves the data nodes of all leaf nodes with graph_id from IN_REVIEW to CURRENT in batches (see run_in_transactions).
+    The current data of leaves with data in review (e.g. answers changed by an update upload) is moved to PREVIOUS first.
+    Has to run outside of db.transaction and can be repeated after an interruption: leaves whose review data is already current
+    have no IN_REVIEW data anymore, so their new current data isn't moved again. Returns the number of moved data nodes.
+    """
+    # the verified answers change with every committed round, see knowledge.statistics
+    add_statistics = functools.partial(add_study_statistics, graph_id)
+    run_in_transactions(
+        f"MATCH {study_node_pattern('n', 'LeafNode', graph_id)}-[r:CURRENT]->(d:DataNode) WHERE EXISTS {{ (n)-[:IN_REVIEW]->(:DataNode) }}",
+        "CREATE (n)-[previous:PREVIOUS]->(d) SET previous = properties(r) DELETE r",
+        {"graph_id": graph_id},
+        batch_size,
+        progress,
+        PREVIOUS_SUMS,
+        add_statistics
+    )
+    return run_in_transactions(
+        f"MATCH {study_node_pattern('n', 'LeafNode', graph_id)}-[r:IN_REVIEW]->(d:DataNode)",
+        "CREATE (n)-[current:CURRENT]->(d) SET current = properties(r) DELETE r",
+        {"graph_id": graph_id},
+        batch_size,
+        progress,
+        PROMOTED_SUMS,
+        add_statistics
+    )
     
 
-def set_is_verified_for_subgraph(graph_id: int, is_verified: bool=True):
+def set_is_verified_for_subgraph(graph_id: int, is_verified: bool=True, batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Sets is_verified for all knowledge nodes with graph_id and the edges between them in batches (see run_in_transactions).
+    Has to run outside of db.transaction and can be repeated after an interruption. Returns the number of updated nodes and edges.
+    """
     # NOTE: set is_verified for all knowledge nodes of a  with graph_id = graph_id
-    query = "MATCH (n:KnowledgeNode {graph_id: $graph_id}) SET n.is_verified=$is_verified"
-    db.cypher_query(query, {
-        "graph_id": graph_id, 
-        "is_verified": is_verified})
+    nodes = run_in_transactions(
+        f"MATCH {study_node_pattern('n', 'KnowledgeNode', graph_id)} WHERE n.is_verified IS NULL OR n.is_verified <> $is_verified",
+        "SET n.is_verified = $is_verified",
+        {"graph_id": graph_id, "is_verified": is_verified},
+        batch_size,
+        progress,
+        VERIFIED_SUMS,
+        functools.partial(add_study_statistics, graph_id)
+    )
     
     # NOTE: set is_verified for all edges between KnowedgeNodes of a  with graph_id = graph_id
-    #query1 = "MATCH (n:KnowledgeNode {graph_id: $graph_id})-[r]->(m:KnowledgeNode) SET r.is_verified=$is_verified"
-    query2 = "MATCH (:KnowledgeNode {graph_id: $graph_id})-[r]->(:KnowledgeNode {graph_id: $graph_id}) SET r.is_verified=$is_verified"
-    db.cypher_query(query2, {
-        "graph_id": graph_id,         
-        "is_verified": is_verified})
+    # compact edges derive is_verified from their start node, so edges without the property are left as they are
+    missing = "false" if settings.GRAPH_COMPACT_RELATIONSHIPS else "r.is_verified IS NULL"
+    edges = run_in_transactions(
+        f"MATCH {study_node_pattern('', 'KnowledgeNode', graph_id)}-[r]->{study_node_pattern('', 'KnowledgeNode', graph_id)} "
+        f"WHERE {missing} OR r.is_verified <> $is_verified",
+        "SET r.is_verified = $is_verified",
+        {"graph_id": graph_id, "is_verified": is_verified},
+        batch_size,
+        progress
+    )
+
+    return nodes + edges
+
+
+def promote_study_data(graph_id: int, batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> None:
+    """
+    Accepts the reviewed data of a study graph: in review data becomes current and all nodes and edges are verified.
+    Both steps commit in batches and skip what is already done, so a failed promotion is continued by calling this again.
+    """
+    moved = set_in_review_data_to_current_for_subgraph(graph_id = graph_id, batch_size = batch_size, progress = progress)
+    logger.info(f"Moved {moved} data nodes of graph {graph_id} from IN_REVIEW to CURRENT")
     
+    verified = set_is_verified_for_subgraph(graph_id = graph_id, is_verified = True, batch_size = batch_size, progress = progress)
+    logger.info(f"Verified {verified} nodes and edges of graph {graph_id}")
+
+
+def get_study_graph_ids() -> list[int]:
+    """Returns the graph_ids of all study graphs in the knowledge graph."""
+    results, _ = db.cypher_query("MATCH (n:Studie) RETURN DISTINCT n.graph_id ORDER BY n.graph_id")
+    return [row[0] for row in results]
+
+
+def label_study_subgraph(graph_id: int, batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Adds the study label (see knowledge.partitions) to all knowledge and data nodes with graph_id that don't have it yet, in batches
+    (see run_in_transactions). Labels graphs that were built before settings.GRAPH_STUDY_LABELS was enabled. Returns the number of labelled nodes.
+    """
+    label = study_label(graph_id)
+    return sum(
+        run_in_transactions(
+            f"MATCH (n:{base} {{graph_id: $graph_id}}) WHERE NOT n:`{label}`",
+            f"SET n:`{label}`",
+            {"graph_id": graph_id},
+            batch_size,
+            progress
+        )
+        for base in ["KnowledgeNode", "DataNode"]
+    )
+
+
+def set_ordinal_properties_for_subgraph(graph_id: int, batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Sets row_idx of the answer groups and col_idx of the items with graph_id that don't have it yet from their ReihenID and SpaltenID leaves
+    in batches (see run_in_transactions). Needed for graphs that were built before the ordinal properties existed. Returns the number of updated nodes.
+    """
+    leaves = {"Antwortgruppe": ("hat_reihenid", "ReihenID"), "Item": ("hat_spaltenid", "SpaltenID")}
+    updated = 0
+    for tag, property_name in ORDINAL_PROPERTIES.items():
+        field_name, leaf_tag = leaves[tag]
+        NodeClass = OntologyNode.nodes.get(tag = tag).node_class
+        LeafClass = OntologyNode.nodes.get(tag = leaf_tag).node_class
+        # literal labels, so the nodes of the study are found with the KnowledgeNode graph_id index
+        updated += run_in_transactions(
+            f"MATCH (n:KnowledgeNode:{escape_label(NodeClass.__label__)} {{graph_id: $graph_id}})-[:$($type)]->(leaf:{escape_label(LeafClass.__label__)}) "
+            f"WHERE n.{property_name} IS NULL "
+            # the leaf value is stored inline or as data node, in review values are used for data that isn't accepted yet
+            "OPTIONAL MATCH (leaf)-[r]->(d:DataNode) WHERE type(r) IN [$current, $in_review] "
+            "WITH n, max(toInteger(coalesce(leaf.value, d.value))) AS idx WHERE idx IS NOT NULL",
+            f"SET n.{property_name} = idx",
+            {
+                "graph_id": graph_id,
+                "type": relationship_definition(NodeClass, field_name)["relation_type"],
+                "current": relationship_definition(LeafNode, "current_data")["relation_type"],
+                "in_review": relationship_definition(LeafNode, "in_review")["relation_type"],
+            },
+            batch_size,
+            progress
+        )
+    return updated
 
+
+def has_study_nodes(graph_id: int, label: str) -> bool:
+    """Returns whether the study graph graph_id contains a node with label, without loading the nodes."""
+    results, _ = db.cypher_query(f"MATCH {study_node_pattern('n', label, graph_id)} RETURN n.uuid LIMIT 1", {"graph_id": graph_id})
+    return len(results) > 0
+
+
+# Size of a property record in the Neo4j record store. A record holds four 8 byte property blocks; integers and booleans use one block,
+# the float timestamps two.
+PROPERTY_RECORD_BYTES = 41
+PROPERTY_BLOCKS = {"graph_id": 1, "is_verified": 1, "created_at": 2, "updated_at": 2}
+
+def get_compactable_relationships_filter() -> str:
+    """
+    Cypher condition for knowledge and data relationships r (with start node n) that still store properties a compact relationship
+    derives from its start node. Edges whose graph_id differs from the start node are kept, since it can't be derived for them.
+    """
+    return "any(key IN keys(r) WHERE key IN $keys) AND coalesce(r.graph_id, n.graph_id) = n.graph_id"
+
+
+def count_compactable_relationships() -> tuple[int, int, int]:
+    """
+    Returns the number of relationships and properties strip_relationship_properties() would remove
+    and the estimated number of bytes that frees in the property store.
+    """
+    results, _ = db.cypher_query(
+        f"MATCH (n:KnowledgeNode)-[r]->() WHERE {get_compactable_relationships_filter()} "
+        "WITH r, [key IN keys(r) WHERE key IN $keys] AS stripped "
+        "RETURN count(r), sum(size(stripped)), sum((reduce(blocks = 0, key IN stripped | blocks + $blocks[key]) + 3) / 4)",
+        {"keys": COMPACT_RELATIONSHIP_PROPERTIES, "blocks": PROPERTY_BLOCKS}
+    )
+    relationships, properties, records = results[0]
+    return relationships, properties or 0, (records or 0) * PROPERTY_RECORD_BYTES
+
+
+def strip_relationship_properties(batch_size: int | None = None, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Removes graph_id, is_verified and the timestamps from all knowledge and data relationships in batches (see run_in_transactions),
+    so existing edges match the ones written with settings.GRAPH_COMPACT_RELATIONSHIPS. Returns the number of stripped relationships.
+    """
+    return run_in_transactions(
+        f"MATCH (n:KnowledgeNode)-[r]->() WHERE {get_compactable_relationships_filter()}",
+        "REMOVE r.graph_id, r.is_verified, r.created_at, r.updated_at",
+        {"keys": COMPACT_RELATIONSHIP_PROPERTIES},
+        batch_size,
+        progress
+    )
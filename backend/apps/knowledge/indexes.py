@@ -0,0 +1,87 @@
+"""
+Indexes and constraints of the knowledge graph that neomodel can't derive from the node classes.
+install_all_labels only creates the uuid and tag constraints and single property indexes, the lookups of the backend
+(by graph_id, data value, stakeholder_id, ...) need the indexes declared here. All statements use IF NOT EXISTS, so they can be run repeatedly.
+"""
+from neomodel import db
+
+from dataclasses import dataclass
+from typing import Callable
+import time
+
+@dataclass
+class GraphIndex:
+    name: str
+    label: str
+    properties: list[str]
+    # RANGE, TEXT or UNIQUE (a uniqueness constraint, which is backed by a range index of the same name)
+    kind: str = "RANGE"
+
+    @property
+    def statement(self) -> str:
+        properties = ", ".join(f"n.{name}" for name in self.properties)
+        if self.kind == "UNIQUE":
+            return f"CREATE CONSTRAINT {self.name} IF NOT EXISTS FOR (n:{self.label}) REQUIRE ({properties}) IS UNIQUE"
+        return f"CREATE {self.kind} INDEX {self.name} IF NOT EXISTS FOR (n:{self.label}) ON ({properties})"
+
+# NOTE: Indexes only serve MATCH clauses on the same label, e.g. MATCH (n:LeafNode {graph_id: ...}) doesn't use the KnowledgeNode index.
+GRAPH_INDEXES = [
+    # study subgraphs: ingestion, verification, promotion and deletion
+    GraphIndex("knowledge_node_graph_id", "KnowledgeNode", ["graph_id"]),
+    GraphIndex("knowledge_node_graph_id_is_verified", "KnowledgeNode", ["graph_id", "is_verified"]),
+    GraphIndex("leaf_node_graph_id", "LeafNode", ["graph_id"]),
+    GraphIndex("stakeholder_node_stakeholder_id", "StakeholderNode", ["stakeholder_id"]),
+    # ordered reads of the rows and columns of a study, see knowledge.models.ORDINAL_PROPERTIES
+    GraphIndex("answer_group_row_idx", "Antwortgruppe", ["graph_id", "row_idx"]),
+    GraphIndex("item_col_idx", "Item", ["graph_id", "col_idx"]),
+    # data values: lookups by value within a study (e.g. StudienID, Feldname, ReihenID) and across studies
+    # NOTE: range indexes limit keys to about 8 kB, longer values are only covered by the text index.
+    GraphIndex("data_node_graph_id_value", "DataNode", ["graph_id", "value"]),
+    GraphIndex("data_node_value_text", "DataNode", ["value"], kind = "TEXT"),
+    # interned data nodes are merged against this constraint, see knowledge.models.InternedDataNode
+    GraphIndex("interned_data_node_value_hash", "InternedDataNode", ["graph_id", "value_hash"], kind = "UNIQUE"),
+]
+
+# Names of constraints that GRAPH_INDEXES replaced, they are dropped by install_graph_indexes.
+# interned_data_node_value failed on values above the 8 kB key limit, see knowledge.models.InternedDataNode
+DROPPED_GRAPH_INDEXES = ["interned_data_node_value"]
+
+
+def install_graph_indexes(progress: Callable[[str], None] | None = None) -> None:
+    """Creates all indexes and constraints of GRAPH_INDEXES that don't exist yet and drops the ones of DROPPED_GRAPH_INDEXES."""
+    for name in DROPPED_GRAPH_INDEXES:
+        db.cypher_query(f"DROP CONSTRAINT {name} IF EXISTS")
+    for index in GRAPH_INDEXES:
+        db.cypher_query(index.statement)
+        if progress:
+            progress(f"{index.name}: {index.statement}")
+
+
+def get_index_population() -> dict[str, tuple[str, float]]:
+    """Returns the state (ONLINE, POPULATING or FAILED) and population percentage of the indexes of GRAPH_INDEXES by name."""
+    results, _ = db.cypher_query(
+        "SHOW INDEXES YIELD name, state, populationPercent WHERE name IN $names RETURN name, state, populationPercent",
+        {"names": [index.name for index in GRAPH_INDEXES]}
+    )
+    return {name: (state, percent) for name, state, percent in results}
+
+
+def wait_for_graph_indexes(progress: Callable[[dict[str, tuple[str, float]]], None] | None = None, interval: float = 2, timeout: float | None = None) -> bool:
+    """
+    Waits until all indexes of GRAPH_INDEXES are online and calls progress with their population after every poll.
+    Returns False if the timeout (in seconds) is reached first, raises a RuntimeError if the population of an index failed.
+    """
+    started = time.monotonic()
+    while True:
+        population = get_index_population()
+        if progress:
+            progress(population)
+
+        failed = [name for name, (state, _) in population.items() if state == "FAILED"]
+        if failed:
+            raise RuntimeError(f"Population of the indexes {', '.join(failed)} failed")
+        if all(state == "ONLINE" for state, _ in population.values()):
+            return True
+        if timeout is not None and time.monotonic() - started > timeout:
+            return False
+        time.sleep(interval)
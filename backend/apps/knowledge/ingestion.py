@@ -0,0 +1,335 @@
+"""
+Helpers for the streaming ingestion of uploaded study data.
+Data rows are read lazily and written in chunks of DATA_INGESTION_CHUNK_SIZE answer groups. Every chunk is committed
+together with an IngestionCheckpoint, so an interrupted upload can be resumed after the last committed row.
+Large uploads are split into partitions that are written by a pool of DATA_INGESTION_WORKERS processes.
+Uploaded CSV and Parquet files are read with pandas in chunks of the same size, see DataFileRows.
+"""
+import django
+from django.conf import settings
+from django.db import transaction as django_transaction
+from django.utils import timezone
+from neo4j.exceptions import TransientError
+from neomodel import db
+from ninja.errors import HttpError
+
+from api import schema
+from graph_migrations.studies import generate_tag_name
+from knowledge.batch import NodeHandle, UnitOfWork, escape_label, relationship_definition
+from knowledge.models import IngestionCheckpoint, KnowledgeNode, load_all_knowledge_node_classes
+from knowledge.statistics import commit_with_statistics
+from ontology.models import OntologyNode
+from study.models import CodeBookColumn, CodeBookRow
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, BinaryIO
+import logging
+import multiprocessing
+import pandas as pd
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+def iter_data_rows(codebook_data: schema.StudyDataSubmissionSchema, start: int = 0) -> Iterator[tuple[int, list[str]]]:
+    """Yields (row id, row) for the data rows of a codebook upload, skipping the mapping row and the first start data rows."""
+    return enumerate(islice(codebook_data.values, 1 + start, None), start = start)
+
+class DataFileRows:
+    """
+    Lazy replacement for StudyDataSubmissionSchema.values that is backed by an uploaded CSV or Parquet file.
+    Like values, it yields the mapping row (the header of the file) followed by the data rows as lists of strings,
+    but it reads the file with pandas in chunks of DATA_INGESTION_CHUNK_SIZE rows, so the file never has to fit into memory.
+    """
+    FORMATS = ("csv", "parquet")
+
+    def __init__(self, file: BinaryIO, file_format: str, chunk_size: int | None = None):
+        if file_format not in self.FORMATS:
+            raise HttpError(400, f"Unsupported data file format '{file_format}', expected one of {', '.join(self.FORMATS)}")
+        self.file = file
+        self.file_format = file_format
+        self.chunk_size = chunk_size or settings.DATA_INGESTION_CHUNK_SIZE
+        self._header = None
+        self._length = None
+
+    def read_chunks(self) -> Iterator[pd.DataFrame]:
+        self.file.seek(0)
+        if self.file_format == "parquet":
+            # pyarrow is only needed for Parquet uploads
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(self.file).iter_batches(batch_size = self.chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(self.file, dtype = str, keep_default_na = False, chunksize = self.chunk_size)
+
+    @staticmethod
+    def to_row(values: Iterable[Any]) -> list[str]:
+        return ["" if pd.isna(value) else str(value) for value in values]
+
+    @property
+    def header(self) -> list[str]:
+        if self._header is None:
+            self.file.seek(0)
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                self._header = list(pq.ParquetFile(self.file).schema_arrow.names)
+            else:
+                self._header = list(pd.read_csv(self.file, dtype = str, nrows = 0).columns)
+        return self._header
+
+    def __iter__(self) -> Iterator[list[str]]:
+        yield self.header
+        for frame in self.read_chunks():
+            for values in frame.itertuples(index = False, name = None):
+                yield self.to_row(values)
+
+    def __getitem__(self, index: int) -> list[str]:
+        if index != 0:
+            raise IndexError("Only the mapping row of a data file can be accessed by index")
+        return self.header
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self.file.seek(0)
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                rows = pq.ParquetFile(self.file).metadata.num_rows
+            else:
+                rows = sum(len(frame) for frame in pd.read_csv(self.file, dtype = str, usecols = [0], chunksize = self.chunk_size))
+            self._length = 1 + rows
+        return self._length
+
+@dataclass
+class DataFileSubmission:
+    """File based counterpart of StudyDataSubmissionSchema that add_study_data_to_knowledge_graph accepts as well."""
+    code_book_id: int
+    data_quality_check_config: schema.DataQualityCheckConfig
+    values: DataFileRows
+
+def chunked(rows: Iterable, chunk_size: int | None = None) -> Iterator[list]:
+    """Splits rows into lists of at most chunk_size elements without materializing the whole iterable."""
+    chunk_size = chunk_size or settings.DATA_INGESTION_CHUNK_SIZE
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+def get_checkpoint(graph_id: int, codebook_id: int) -> IngestionCheckpoint | None:
+    return IngestionCheckpoint.nodes.first_or_none(graph_id = graph_id, codebook_id = codebook_id)
+
+def has_checkpoints(graph_id: int) -> bool:
+    return IngestionCheckpoint.nodes.first_or_none(graph_id = graph_id) is not None
+
+def save_checkpoint(graph_id: int, codebook_id: int, rows_done: int) -> IngestionCheckpoint:
+    checkpoint = get_checkpoint(graph_id, codebook_id) or IngestionCheckpoint(graph_id = graph_id, codebook_id = codebook_id)
+    checkpoint.rows_done = rows_done
+    checkpoint.updated_at = timezone.now()
+    return checkpoint.save()
+
+def delete_checkpoints(graph_id: int) -> None:
+    db.cypher_query("MATCH (c:IngestionCheckpoint {graph_id: $graph_id}) DELETE c", {"graph_id": graph_id})
+
+@contextmanager
+def chunk_transaction() -> Iterator[None]:
+    """
+    Commits the graph writes of a chunk together with its checkpoint.
+    Inside a request the transaction opened by the TransactionRouter is committed and replaced by a new one,
+    so the router still commits or rolls back the remaining work as usual. Elsewhere (jobs, management commands)
+    the chunk is written in a transaction of its own. The statistics of the chunk (see knowledge.statistics) are written
+    in a Django transaction around it, so they are rolled back if the graph commit fails.
+    """
+    with django_transaction.atomic():
+        if db._active_transaction is not None:
+            yield
+            db.commit()
+            db.begin()
+        else:
+            with db.transaction:
+                yield
+
+
+@dataclass
+class IngestionIndex:
+    """
+    Lookup of the codebook side of a study graph that is built once per upload:
+    Item nodes by the value of their Feldname and Fragebogen nodes by their codebook id (FragebogenID).
+    """
+    items: dict[str, KnowledgeNode] = field(default_factory = dict)
+    fragebogen: dict[str, KnowledgeNode] = field(default_factory = dict)
+
+    def item(self, field_name: str) -> KnowledgeNode:
+        item = self.items.get(str(field_name))
+        if not item:
+            raise HttpError(404, f"Knowledge node 'Item' for field name {field_name} not found")
+        return item
+
+    def questionnaire(self, codebook_id: int) -> KnowledgeNode:
+        fragebogen = self.fragebogen.get(str(codebook_id))
+        if not fragebogen:
+            raise HttpError(404, f"Knowledge node 'Fragebogen' for codebook id {codebook_id} not found")
+        return fragebogen
+
+def build_ingestion_index(graph_id: int) -> IngestionIndex:
+    """Loads all Items and Fragebogen nodes of a study graph with one query each."""
+    classes = {}
+    for tag in ("Item", "Metadaten", "Feldname", "Fragebogen", "FragebogenID"):
+        ontology_node: OntologyNode = OntologyNode.nodes.first_or_none(tag = tag)
+        if not ontology_node:
+            raise HttpError(404, f"Ontology node '{tag}' not found")
+        classes[tag] = ontology_node.node_class
+    
+    def lookup(start: str, middle: list[tuple[str, str]]) -> dict[str, KnowledgeNode]:
+        # start -[field]-> tag -[field]-> ... -[CURRENT]-> DataNode, returns {data value: start node}
+        # the last leaf may store its value inline instead, see knowledge.models.InlineData
+        # the labels are literal, so the start node is found with the graph_id index of KnowledgeNode (see knowledge.indexes)
+        path = ""
+        parameters = {"graph_id": graph_id}
+        NodeClass = classes[start]
+        for index, (field_name, tag) in enumerate(middle):
+            parameters[f"type_{index}"] = relationship_definition(NodeClass, field_name)["relation_type"]
+            variable = "leaf" if index == len(middle) - 1 else ""
+            path += f"-[:$($type_{index})]->({variable}:{escape_label(tag)} {{graph_id: $graph_id}})"
+            NodeClass = classes[tag]
+        parameters["current"] = relationship_definition(NodeClass, "current_data")["relation_type"]
+        query = (
+            f"MATCH (n:KnowledgeNode:{escape_label(start)} {{graph_id: $graph_id}}){path} "
+            "OPTIONAL MATCH (leaf)-[:$($current)]->(d:DataNode) "
+            "WITH n, coalesce(leaf.value, d.value) AS value WHERE value IS NOT NULL "
+            "RETURN value, n"
+        )
+        results, _ = db.cypher_query(query, parameters, resolve_objects = True)
+        return {value: node for value, node in results}
+    
+    return IngestionIndex(
+        items = lookup("Item", [("hat_metadaten", "Metadaten"), ("hat_feldname", "Feldname")]),
+        fragebogen = lookup("Fragebogen", [("hat_fragebogenid", "FragebogenID")]),
+    )
+
+def get_item_data_types(codebook_id: int, value_type_column: str | None) -> dict[str, str]:
+    """
+    Returns the Datentyp of the items of a codebook by Feldname.
+    value_type_column is the codebook column holding it (VALUE_TYPE of the data quality check config), given by its header or meta tag.
+    """
+    if not value_type_column:
+        return {}
+    
+    columns = list(CodeBookColumn.objects.filter(codebook_id = codebook_id))
+    tags = [column.assigned_meta_tag or generate_tag_name(column.header) for column in columns]
+    type_index = next((index for index, column in enumerate(columns) if value_type_column in (column.header, tags[index])), None)
+    if type_index is None or "Feldname" not in tags:
+        return {}
+    field_name_index = tags.index("Feldname")
+    
+    return {
+        row.cells[field_name_index]: row.cells[type_index]
+        for row in CodeBookRow.objects.filter(codebook_id = codebook_id)
+        if len(row.cells) > max(type_index, field_name_index) and row.cells[type_index]
+    }
+
+
+@dataclass
+class Partition:
+    """
+    Data rows of one codebook that are written by a worker process in its own Neo4j transaction.
+    Nodes of the study graph are passed by uuid, because the workers don't share the session of the request.
+    """
+    graph_id: int
+    codebook_id: int
+    mapping_row: list[str]
+    rows: list[tuple[int, list[str]]]
+    participants: dict[str, str]
+    fragebogen: str
+    items: dict[str, str]
+    update: bool = False
+    column_types: list[str | None] | None = None
+
+    @property
+    def start(self) -> int:
+        return self.rows[0][0]
+
+def init_worker() -> None:
+    django.setup()
+    load_all_knowledge_node_classes()
+
+# Partitions share the Fragebogen and Item nodes they connect to, so concurrent workers can run into lock conflicts and deadlocks.
+# Neo4j reports them as TransientError, the partition is then rolled back and written again after a backoff.
+PARTITION_RETRIES = 5
+PARTITION_RETRY_BACKOFF = 0.5
+
+def ingest_partition(partition: Partition) -> int:
+    """
+    Writes the answer groups of a partition and returns the number of written rows. Runs in a worker process.
+    Transient errors (e.g. deadlocks with other workers) are retried up to PARTITION_RETRIES times with exponential backoff.
+    """
+    for attempt in range(PARTITION_RETRIES + 1):
+        try:
+            return write_partition(partition)
+        except TransientError as error:
+            if attempt == PARTITION_RETRIES:
+                raise
+            delay = PARTITION_RETRY_BACKOFF * 2 ** attempt * (1 + random.random())
+            logger.warning(f"Writing rows {partition.rows[0][0]}-{partition.rows[-1][0]} of codebook {partition.codebook_id} failed ({error.code}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def write_partition(partition: Partition) -> int:
+    # graph_functions imports this module, so it's imported here to avoid an import cycle
+    from knowledge.graph_functions import build_or_update_answer_group_from_data, load_stored_answer_groups
+    
+    Participant, Fragebogen, Item = (OntologyNode.nodes.get(tag = tag).node_class for tag in ("Teilnehmer", "Fragebogen", "Item"))
+    index = IngestionIndex(
+        items = {field_name: NodeHandle(Item, uuid) for field_name, uuid in partition.items.items()},
+        fragebogen = {str(partition.codebook_id): NodeHandle(Fragebogen, partition.fragebogen)},
+    )
+    
+    # the statistics are rolled back together with the graph writes, e.g. before a retry
+    with django_transaction.atomic(), db.transaction:
+        uow = UnitOfWork()
+        participants = {patient_id: NodeHandle(Participant, uuid) for patient_id, uuid in partition.participants.items()}
+        stored_answer_groups = {}
+        if partition.update:
+            stored_answer_groups = load_stored_answer_groups(index.questionnaire(partition.codebook_id), [(participants[str(row[0])], idx) for idx, row in partition.rows])
+        
+        for idx, row in partition.rows:
+            build_or_update_answer_group_from_data(current_participant = participants[str(row[0])], 
+                                                   mapping_row = partition.mapping_row, 
+                                                   row_id = idx, 
+                                                   data_row = row, 
+                                                   graph_id = partition.graph_id, 
+                                                   codebook_id = partition.codebook_id,
+                                                   uow = uow,
+                                                   index = index,
+                                                   stored_answer_group = stored_answer_groups.get((partition.participants[str(row[0])], idx)),
+                                                   column_types = partition.column_types
+                                                   )
+        commit_with_statistics(uow, partition.graph_id)
+    
+    return len(partition.rows)
+
+def run_partitions(partitions: Iterable[Partition], workers: int, on_done: Callable[[Partition], None]) -> None:
+    """
+    Writes the partitions with a pool of worker processes and calls on_done in this process for every finished partition.
+    The workers are spawned instead of forked, so each of them opens its own Neo4j driver.
+    Partitions are taken from the iterable only when a worker is about to become free, so at most two partitions
+    per worker are held in memory.
+    """
+    context = multiprocessing.get_context("spawn")
+    partitions = iter(partitions)
+    with ProcessPoolExecutor(max_workers = workers, mp_context = context, initializer = init_worker) as pool:
+        futures = {}
+        try:
+            while True:
+                for partition in islice(partitions, 2 * workers - len(futures)):
+                    futures[pool.submit(ingest_partition, partition)] = partition
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when = FIRST_COMPLETED)
+                for future in done:
+                    # errors of a worker, e.g. an HttpError for an unknown field name, are raised again here
+                    future.result()
+                    on_done(futures.pop(future))
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.anchors import anchor_study_graphs
+from knowledge.models import load_all_knowledge_node_classes
+
+class Command(BaseCommand):
+    help = "Records the anchors of study graphs that were built before the anchors existed (see knowledge.anchors)."
+
+    def handle(self, *args, **kwargs):
+        load_all_knowledge_node_classes()
+        self.stdout.write(
+            self.style.NOTICE('Anchoring the study graphs without anchor...')
+        )
+
+        def progress(study) -> None:
+            self.stdout.write(f'Anchored the graph of study {study.id}')
+
+        anchored = anchor_study_graphs(progress = progress)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully anchored {anchored} study graphs.')
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.graph_functions import count_compactable_relationships, strip_relationship_properties
+
+class Command(BaseCommand):
+    help = ("Removes graph_id, is_verified and the timestamps from knowledge and data relationships in batches "
+            "and reports the estimated bytes saved. Use together with GRAPH_COMPACT_RELATIONSHIPS=True.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Relationships per transaction (default: GRAPH_UPDATE_BATCH_SIZE)")
+        parser.add_argument("--report", action="store_true", help="Only report what would be removed")
+
+    def handle(self, *args, **kwargs):
+        relationships, properties, saved_bytes = count_compactable_relationships()
+        self.stdout.write(
+            self.style.NOTICE(f'{relationships} relationships store {properties} derivable properties, '
+                              f'stripping them saves about {saved_bytes / 1024**2:.1f} MiB ({saved_bytes} bytes).')
+        )
+        if kwargs["report"] or relationships == 0:
+            return
+
+        done = 0
+        def progress(rows: int) -> None:
+            nonlocal done
+            done += rows
+            self.stdout.write(f'{done}/{relationships} relationships stripped')
+
+        stripped = strip_relationship_properties(batch_size = kwargs["batch_size"], progress = progress)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully stripped {stripped} relationships, about {saved_bytes} bytes saved.')
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.graph_functions import get_study_graph_ids, label_study_subgraph
+from knowledge.partitions import study_label
+
+class Command(BaseCommand):
+    help = "Adds the study label G_<graph_id> to all nodes of the given (default: all) study graphs in batches. Run it before enabling GRAPH_STUDY_LABELS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("graph_ids", type=int, nargs="*", help="Graph ids (study ids) of the study graphs (default: all study graphs)")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per transaction (default: GRAPH_UPDATE_BATCH_SIZE)")
+
+    def handle(self, *args, **kwargs):
+        graph_ids = kwargs["graph_ids"] or get_study_graph_ids()
+        for graph_id in graph_ids:
+            self.stdout.write(
+                self.style.NOTICE(f'Labelling study graph {graph_id} with {study_label(graph_id)}...')
+            )
+
+            done = 0
+            def progress(rows: int) -> None:
+                nonlocal done
+                done += rows
+                self.stdout.write(f'{done} nodes labelled')
+
+            label_study_subgraph(graph_id = graph_id, batch_size = kwargs["batch_size"], progress = progress)
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully labelled study graph {graph_id} ({done} nodes labelled).')
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.graph_functions import promote_study_data
+from knowledge.models import load_all_knowledge_node_classes
+
+class Command(BaseCommand):
+    help = "Moves the in review data of a study graph to current and verifies it in batches. Continues an interrupted promotion."
+
+    def add_arguments(self, parser):
+        parser.add_argument("graph_id", type=int, help="Graph id (study id) of the study graph")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per transaction (default: GRAPH_UPDATE_BATCH_SIZE)")
+
+    def handle(self, *args, **kwargs):
+        graph_id = kwargs["graph_id"]
+        self.stdout.write(
+            self.style.NOTICE(f'Promoting the data of study graph {graph_id}...')
+        )
+        load_all_knowledge_node_classes()
+
+        done = 0
+        def progress(rows: int) -> None:
+            nonlocal done
+            done += rows
+            self.stdout.write(f'{done} nodes and relationships updated')
+
+        promote_study_data(graph_id = graph_id, batch_size = kwargs["batch_size"], progress = progress)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully promoted the data of study graph {graph_id} ({done} nodes and relationships updated).')
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.graph_functions import get_study_graph_ids, set_ordinal_properties_for_subgraph
+from knowledge.models import load_all_knowledge_node_classes
+
+class Command(BaseCommand):
+    help = "Sets row_idx of answer groups and col_idx of items from their ReihenID and SpaltenID in the given (default: all) study graphs in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("graph_ids", type=int, nargs="*", help="Graph ids (study ids) of the study graphs (default: all study graphs)")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per transaction (default: GRAPH_UPDATE_BATCH_SIZE)")
+
+    def handle(self, *args, **kwargs):
+        load_all_knowledge_node_classes()
+        graph_ids = kwargs["graph_ids"] or get_study_graph_ids()
+        for graph_id in graph_ids:
+            self.stdout.write(
+                self.style.NOTICE(f'Setting the row and column indexes of study graph {graph_id}...')
+            )
+
+            done = 0
+            def progress(rows: int) -> None:
+                nonlocal done
+                done += rows
+                self.stdout.write(f'{done} nodes updated')
+
+            set_ordinal_properties_for_subgraph(graph_id = graph_id, batch_size = kwargs["batch_size"], progress = progress)
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully set the row and column indexes of study graph {graph_id} ({done} nodes updated).')
+            )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from knowledge.graph_functions import get_study_graph_ids
+from knowledge.statistics import update_study_statistics
+
+class Command(BaseCommand):
+    help = "Recounts the statistics (StudyStatistics) of the given (default: all) study graphs, e.g. for graphs that changed before the table existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("graph_ids", type=int, nargs="*", help="Graph ids (study ids) of the study graphs (default: all study graphs)")
+
+    def handle(self, *args, **kwargs):
+        graph_ids = kwargs["graph_ids"] or get_study_graph_ids()
+        for graph_id in graph_ids:
+            statistics = update_study_statistics(graph_id)
+            self.stdout.write(
+                self.style.SUCCESS(f'Study graph {graph_id}: {statistics.questionnaires} questionnaires, {statistics.items} items, '
+                                   f'{statistics.participants} participants, {statistics.answers} answers ({statistics.verified_answers} verified).')
+            )
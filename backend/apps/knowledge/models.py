@@ -1,12 +1,18 @@
 import neomodel
 from neomodel import db
+from neomodel.properties import Property, validator
 
 from django.utils import timezone
+from knowledge.blobs import load_blob
+from knowledge.partitions import install_partition_aware_registry
 from ontology.models import OntologyNode, OntologyNodeTypes
 from ontology.utils import get_all_outgoing_relationships
 from typing import List, Type
 import sys
 
+# Nodes with a study label must resolve to the class of their other labels, see knowledge.partitions.
+install_partition_aware_registry()
+
 class KnowledgeNode(neomodel.StructuredNode):
     # The tag property is added dynamically during the creation of knowledge node classes.
     # This allows us to pre-fill it with a default value so that we don't have to specify the tag for every knowledge node we create.
@@ -17,12 +23,43 @@ class KnowledgeNode(neomodel.StructuredNode):
     created_at = neomodel.DateTimeProperty(default = timezone.now)
     updated_at = neomodel.DateTimeProperty(default = timezone.now)
 
-class KnowledgeRelationship(neomodel.StructuredRel):
+class CompactRelationship(neomodel.StructuredRel):
+    """
+    Relationship whose properties are copies of its start node's properties.
+    With settings.GRAPH_COMPACT_RELATIONSHIPS they aren't stored on the edge (see knowledge.batch.relationship_properties);
+    properties missing on an edge are derived from its start node when it is inflated. Queries that read many relationships
+    should also return their start node (e.g. RETURN n1, n2, r, see ontology.utils.get_linked_nodes), otherwise it's loaded
+    by its element id with one query per relationship.
+    """
+    @classmethod
+    def inflate(cls, rel):
+        srel = super().inflate(rel)
+        properties = cls.defined_properties(aliases = False, rels = False)
+        missing = [name for name in properties if name not in rel]
+        if missing and rel.start_node is not None:
+            start_node = rel.start_node
+            if not len(start_node):
+                # the start node isn't part of the query result (e.g. an ad-hoc query or a relationship manager)
+                results, _ = db.cypher_query("MATCH (n) WHERE elementId(n) = $element_id RETURN n", {"element_id": start_node.element_id})
+                start_node = results[0][0] if results else {}
+            for name in missing:
+                if name in start_node:
+                    setattr(srel, name, properties[name].inflate(start_node[name]))
+        return srel
+
+class KnowledgeRelationship(CompactRelationship):
     graph_id = neomodel.IntegerProperty(default=0)
     is_verified = neomodel.BooleanProperty(default = False)
     created_at = neomodel.DateTimeProperty(default = timezone.now)
     updated_at = neomodel.DateTimeProperty(default = timezone.now)
 
+# Integer copies of the ReihenID of answer groups and the SpaltenID of items, which are written at ingestion so that
+# rows and columns can be ordered in Cypher without reading their leaves (see knowledge.indexes).
+ORDINAL_PROPERTIES = {"Antwortgruppe": "row_idx", "Item": "col_idx"}
+
+# Properties of knowledge and data relationships that compact relationships leave off the edge
+COMPACT_RELATIONSHIP_PROPERTIES = ["graph_id", "is_verified", "created_at", "updated_at"]
+
 # These are the three possible knowledge node base classes.
 # They're all abstract and are just used as base classes for node classes generated dynamically by create_knowledge_node_class.
 # The relationships between them are therefore also defined dynamically by create_knowledge_node_class.
@@ -35,23 +72,99 @@ class StakeholderNode(KnowledgeNode):
 class ConnectiveNode(KnowledgeNode):
     pass
 
-class DataRelationship(neomodel.StructuredRel):
+class DataRelationship(CompactRelationship):
     graph_id = neomodel.IntegerProperty(default=0)
 
+class InlineData:
+    """
+    Stands in for the current_data relationship manager of leaves that store their value inline (OntologyNode.is_inline).
+    Returns an unsaved DataNode with the value, so leaf.current_data.get().value works for both kinds of leaves.
+    """
+    def __init__(self, leaf: "LeafNode"):
+        self.leaf = leaf
+
+    def get(self, **kwargs) -> "DataNode":
+        return DataNode(value = self.leaf.value, graph_id = self.leaf.graph_id)
+
+    get_or_none = single = get
+
+    def all(self) -> list["DataNode"]:
+        return [self.get()]
+
+    def __len__(self) -> int:
+        return 1
+
+    def __bool__(self) -> bool:
+        return True
+
 class LeafNode(KnowledgeNode):
+    # Set from the ontology node of the leaf class, see InternedDataNode and InlineData.
+    is_categorical = False
+    is_inline = False
+    
+    # Value of an inline leaf, which doesn't have data nodes
+    value = neomodel.StringProperty(max_length = 256*256)
+
     # Only leaf nodes can have connection to data nodes. There are three categories of data:
     current_data = neomodel.RelationshipTo("DataNode", "CURRENT", cardinality = neomodel.ZeroOrOne, model = DataRelationship)
     previous_data = neomodel.RelationshipTo("DataNode", "PREVIOUS", model = DataRelationship)
     # NOTE: Report specifies cardinality for in_review as 0-1, but can't multiple data requests be in review at the same time?
     in_review = neomodel.RelationshipTo("DataNode", "IN_REVIEW", model = DataRelationship)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.value is not None:
+            self.current_data = InlineData(self)
+
+class NativeDateProperty(Property):
+    """Stores a date as Neo4j date instead of the ISO string of neomodel.DateProperty, so Cypher can compare it and use date functions."""
+    form_field_class = "DateField"
+
+    @validator
+    def inflate(self, value):
+        return value.to_native() if hasattr(value, "to_native") else value
+
+    @validator
+    def deflate(self, value):
+        return value
+
 class DataNode(neomodel.StructuredNode):
     uuid = neomodel.UniqueIdProperty()
     graph_id = neomodel.IntegerProperty(default=0)
     value = neomodel.StringProperty(max_length = 256*256)
+    # Large values are kept in the blob store instead of value (see knowledge.blobs), use resolved_value to read them.
+    value_hash = neomodel.StringProperty(index = True)
+    value_length = neomodel.IntegerProperty()
+    # Typed copies of value for numeric and date leaves (see knowledge.batch.typed_value_properties).
+    # The range indexes allow filtering and ordering by them in Cypher.
+    num_value = neomodel.FloatProperty(index = True)
+    date_value = NativeDateProperty(index = True)
     created_at = neomodel.DateTimeProperty(default = timezone.now)
     updated_at = neomodel.DateTimeProperty(default = timezone.now)
 
+    @property
+    def resolved_value(self) -> str | None:
+        """The value of this data node. Values in the blob store are only read when this is accessed."""
+        if self.value is None and self.value_hash:
+            return load_blob(self.value_hash)
+        return self.value
+
+class InternedDataNode(DataNode):
+    """
+    Data node that is shared by all leaves with the same categorical value in a graph, i.e. values of categorical leaf classes
+    (OntologyNode.is_categorical) and answers of items with a categorical Datentyp (see knowledge.batch.interns_values).
+    Written with MERGE against a unique constraint on (graph_id, value_hash) (see knowledge.indexes) if settings.GRAPH_INTERN_CATEGORICAL_VALUES is enabled.
+    The constraint is on the hash, because range indexes limit keys to about 8 kB.
+    """
+    pass
+
+class IngestionCheckpoint(neomodel.StructuredNode):
+    """Number of data rows of a codebook that the streaming data ingestion has committed for a study graph."""
+    graph_id = neomodel.IntegerProperty(index = True)
+    codebook_id = neomodel.IntegerProperty()
+    rows_done = neomodel.IntegerProperty(default = 0)
+    updated_at = neomodel.DateTimeProperty(default = timezone.now)
+
 def load_knowledge_node_class(ontology_node: OntologyNode, force_reload: bool = False) -> Type[neomodel.StructuredNode]:
     """
     Dynamically creates a StructuredNode sub-class for a specific ontology node.
@@ -77,6 +190,13 @@ def load_knowledge_node_class(ontology_node: OntologyNode, force_reload: bool =
         # The tag property is added dynamically so that the default can be set based on the ontology node.
         "tag": neomodel.StringProperty(default = ontology_node.tag),
         
+        # Plain class attributes, only used by leaf classes.
+        "is_categorical": bool(ontology_node.is_categorical),
+        "is_inline": bool(ontology_node.is_inline),
+        
+        # The row or column index of answer groups and items, see ORDINAL_PROPERTIES.
+        **({ORDINAL_PROPERTIES[ontology_node.tag]: neomodel.IntegerProperty()} if ontology_node.tag in ORDINAL_PROPERTIES else {}),
+        
         # NOTE: Test to get name from ontology node into knowledge nodes.
         #"name": neomodel.StringProperty(default = ontology_node.name)
     }
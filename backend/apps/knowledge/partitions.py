@@ -0,0 +1,57 @@
+"""
+Per-study partition labels of the knowledge graph.
+With settings.GRAPH_STUDY_LABELS, every knowledge and data node of a study graph also gets the label G_<graph_id> (see study_label),
+so per-study queries can start from a label scan of that study instead of filtering graph_id across all studies.
+Graphs built before the setting was enabled are labelled with manage.py label_study_graphs.
+"""
+from django.conf import settings
+from neomodel.sync_.core import Database
+
+STUDY_LABEL_PREFIX = "G_"
+
+def study_label(graph_id: int) -> str:
+    """Returns the partition label of the study graph graph_id, e.g. G_42 (or G_-1 for the example graph)."""
+    return f"{STUDY_LABEL_PREFIX}{int(graph_id)}"
+
+
+def study_labels(graph_id: int) -> list[str]:
+    """Returns the partition labels that are added to new nodes of the study graph graph_id."""
+    return [study_label(graph_id)] if settings.GRAPH_STUDY_LABELS and graph_id is not None else []
+
+
+def study_node_pattern(variable: str, label: str, graph_id: int) -> str:
+    """
+    Returns a Cypher node pattern for the nodes with label of the study graph graph_id, e.g. (n:`G_42`:LeafNode).
+    Without study labels the pattern filters on the graph_id property instead and expects the query parameter $graph_id.
+    """
+    if settings.GRAPH_STUDY_LABELS:
+        # graph_id is converted to an int by study_label, so the label can't be used for injection
+        return f"({variable}:`{study_label(graph_id)}`:{label})"
+    return f"({variable}:{label} {{graph_id: $graph_id}})"
+
+
+class PartitionAwareRegistry(dict):
+    """
+    Node class registry of neomodel that ignores partition labels.
+    neomodel resolves nodes by the exact set of their labels, which would fail for nodes that also have their study label.
+    """
+    @staticmethod
+    def strip(labels):
+        if isinstance(labels, frozenset):
+            return frozenset(label for label in labels if not label.startswith(STUDY_LABEL_PREFIX))
+        return labels
+
+    def __contains__(self, labels) -> bool:
+        return super().__contains__(self.strip(labels))
+
+    def __getitem__(self, labels):
+        return super().__getitem__(self.strip(labels))
+
+    def get(self, labels, default = None):
+        return super().get(self.strip(labels), default)
+
+
+def install_partition_aware_registry() -> None:
+    """Replaces the node class registry shared by all threads (it's a class attribute of the thread local Database) with a PartitionAwareRegistry."""
+    if not isinstance(Database._NODE_CLASS_REGISTRY, PartitionAwareRegistry):
+        Database._NODE_CLASS_REGISTRY = PartitionAwareRegistry(Database._NODE_CLASS_REGISTRY)
@@ -0,0 +1,134 @@
+"""
+Per-study statistics of the knowledge graph in the StudyStatistics table.
+The row of a study is created with the study. Writes add the change of the counts instead of recounting the graph: building a study
+graph and every committed chunk of an upload add the nodes they created (see created_statistics), verifying and promoting a graph add
+the sums of their batches (see VERIFIED_SUMS, PREVIOUS_SUMS and PROMOTED_SUMS). Graph migrations that delete counted nodes clear the
+counts of every graph without counting (see clear_deleted_statistics). Readers like the study list and the system stats only read the
+table. The graphs are only recounted from their own nodes (see knowledge.partitions) by manage.py update_study_statistics, e.g. for
+graphs that changed before the table existed.
+"""
+from django.db import transaction as django_transaction
+from django.db.models import F, Sum
+from neomodel import db
+
+from knowledge.batch import GraphLayer, UnitOfWork, relationship_definition
+from knowledge.models import LeafNode
+from knowledge.partitions import study_node_pattern
+from study.models import StudyStatistics
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Statistics by the tag of the nodes they count
+COUNTED_TAGS = {
+    "Fragebogen": ["questionnaires"],
+    "Item": ["items"],
+    "Teilnehmer": ["participants"],
+    "Antwort": ["answers", "verified_answers"],
+}
+
+# Change of the verified counts by a node n of set_is_verified_for_subgraph, evaluated before is_verified is set to $is_verified
+VERIFIED_CHANGE = "CASE WHEN n.is_verified = $is_verified THEN 0 WHEN $is_verified THEN 1 WHEN n.is_verified THEN -1 ELSE 0 END"
+VERIFIED_SUMS = {
+    "questionnaires": f"CASE WHEN n:Fragebogen THEN {VERIFIED_CHANGE} ELSE 0 END",
+    "items": f"CASE WHEN n:Item THEN {VERIFIED_CHANGE} ELSE 0 END",
+    "participants": f"CASE WHEN n:Teilnehmer THEN {VERIFIED_CHANGE} ELSE 0 END",
+    "verified_answers": f"CASE WHEN n:Antwort AND EXISTS {{ (n)-[:CURRENT]->(:DataNode) }} THEN {VERIFIED_CHANGE} ELSE 0 END",
+}
+# Change of the verified answers by the leaves n of set_in_review_data_to_current_for_subgraph, which first moves the current data
+# of leaves with data in review to PREVIOUS and then their data in review to CURRENT
+PREVIOUS_SUMS = {"verified_answers": "CASE WHEN n:Antwort AND n.is_verified THEN -1 ELSE 0 END"}
+PROMOTED_SUMS = {"verified_answers": "CASE WHEN n:Antwort AND n.is_verified AND NOT EXISTS { (n)-[:CURRENT]->(:DataNode) } THEN 1 ELSE 0 END"}
+
+def count_study_statistics(graph_id: int) -> dict[str, int]:
+    """Counts the verified questionnaires, items and participants and all and verified answers (with current data) of a study graph."""
+    # one pass over the knowledge nodes of the study, which are found with the KnowledgeNode graph_id index (or the study label)
+    query = (
+        f"MATCH {study_node_pattern('n', 'KnowledgeNode', graph_id)} "
+        "RETURN count(CASE WHEN n:Fragebogen AND n.is_verified THEN n END) AS questionnaires, "
+        "count(CASE WHEN n:Item AND n.is_verified THEN n END) AS items, "
+        "count(CASE WHEN n:Teilnehmer AND n.is_verified THEN n END) AS participants, "
+        "count(CASE WHEN n:Antwort THEN n END) AS answers, "
+        "count(CASE WHEN n:Antwort AND n.is_verified AND EXISTS { (n)-[:CURRENT]->(:DataNode) } THEN n END) AS verified_answers"
+    )
+    results, columns = db.cypher_query(query, {"graph_id": graph_id})
+    return dict(zip(columns, results[0]))
+
+
+def update_study_statistics(graph_id: int) -> StudyStatistics:
+    """
+    Recounts the statistics of the study graph graph_id and stores them. The cached system stats are invalidated once they are committed.
+    Reads the whole graph, so it's only used by manage.py update_study_statistics.
+    """
+    # NOTE: api.system_stats reads the totals of this module
+    from api.system_stats import invalidate_system_cache
+    statistics, _ = StudyStatistics.objects.update_or_create(graph_id = graph_id, defaults = count_study_statistics(graph_id))
+    django_transaction.on_commit(invalidate_system_cache)
+    logger.info(f"Updated the statistics of study graph {graph_id}: {statistics.answers} answers, {statistics.verified_answers} verified")
+    return statistics
+
+
+def add_study_statistics(graph_id: int, changes: dict[str, int]) -> None:
+    """
+    Adds the changes of the statistics of the study graph graph_id by name, e.g. the nodes written by a chunk of an upload.
+    The cached system stats are invalidated once they are committed.
+    """
+    from api.system_stats import invalidate_system_cache
+    changes = {name: change for name, change in changes.items() if change}
+    if changes:
+        StudyStatistics.objects.filter(graph_id = graph_id).update(**{name: F(name) + change for name, change in changes.items()})
+        django_transaction.on_commit(invalidate_system_cache)
+
+
+def created_statistics(*layers: GraphLayer) -> dict[str, int]:
+    """Returns the changes of the statistics by the nodes that layers create, it has to be called before they are written."""
+    current = relationship_definition(LeafNode, "current_data")["relation_type"]
+    current_leaves = {data["leaf"] for layer in layers for data in layer.data if data["type"] == current}
+    changes = dict.fromkeys([name for names in COUNTED_TAGS.values() for name in names], 0)
+    for node in (node for layer in layers for node in layer.nodes):
+        verified = bool(node["properties"].get("is_verified"))
+        if "Antwort" in node["labels"]:
+            changes["answers"] += 1
+            if verified and node["properties"]["uuid"] in current_leaves:
+                changes["verified_answers"] += 1
+        for tag in ("Fragebogen", "Item", "Teilnehmer"):
+            if verified and tag in node["labels"]:
+                changes[COUNTED_TAGS[tag][0]] += 1
+    return changes
+
+
+def commit_with_statistics(uow: UnitOfWork, graph_id: int) -> None:
+    """Commits uow and adds the nodes it created to the statistics of the study graph graph_id, within the transaction of the caller."""
+    changes = created_statistics(uow.layer)
+    uow.commit()
+    add_study_statistics(graph_id, changes)
+
+
+def clear_deleted_statistics(tags: list[str]) -> None:
+    """
+    Sets the statistics that count nodes with one of tags to 0 for every study graph, after all of these nodes were deleted by a graph migration
+    (see GraphMigration.deleted_tags). Unlike update_study_statistics, this doesn't read the graphs.
+    """
+    from api.system_stats import invalidate_system_cache
+    cleared = {name: 0 for tag in tags for name in COUNTED_TAGS.get(tag, [])}
+    if cleared:
+        StudyStatistics.objects.update(**cleared)
+        django_transaction.on_commit(invalidate_system_cache)
+        logger.info(f"Cleared the statistics {', '.join(cleared)} of all study graphs")
+
+
+def get_study_statistics(graph_id: int) -> StudyStatistics:
+    """Returns the statistics of a study graph without writing them, graphs without statistics have empty (unsaved) statistics."""
+    return StudyStatistics.objects.filter(graph_id = graph_id).first() or StudyStatistics(graph_id = graph_id)
+
+
+def get_total_statistics() -> dict[str, int]:
+    """Returns the sums of the statistics over all study graphs."""
+    totals = StudyStatistics.objects.aggregate(
+        questionnaires = Sum("questionnaires"),
+        items = Sum("items"),
+        participants = Sum("participants"),
+        answers = Sum("answers"),
+        verified_answers = Sum("verified_answers"),
+    )
+    return {key: value or 0 for key, value in totals.items()}
@@ -0,0 +1,46 @@
+import pytest
+import os
+import datetime
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure():
+    if not os.getenv("ENABLE_UNIT_TESTS"):
+        pytest.exit("ERROR: Unit tests are disabled. Please make sure that you're not trying to run unit tests on a production system!\n" \
+                    "You can enable unit tests by setting ENABLE_UNIT_TESTS=1.", returncode=1)
+
+@pytest.fixture(autouse = True, scope = "session")
+def setup_database():
+    """This fixture is called exactly once at the beginning of the test session."""
+    from neomodel.sync_.core import db
+    from ontology.data_requests import create_baseline_ontology
+    db.cypher_query("MATCH (n) DETACH DELETE n")
+    # The study graphs and the data ingestion need the full ontology, not only the example ontology of the ontology tests.
+    create_baseline_ontology()
+
+@pytest.fixture
+def study(db):
+    """A study with one codebook of the items "Trustcenter-ID" and "Alter" and its knowledge graph. The graph is deleted afterwards."""
+    from authentication.models import CustomUser
+    from study.models import Study, StudyStatistics, CodeBook, CodeBookColumn, CodeBookRow, Purpose
+    from knowledge.graph_functions import build_study_codebook_knowledge_graph
+    from .decorators import delete_study_graph
+
+    submitter = CustomUser.objects.create_user(email = "submitter@example.com", password = "password")
+    study = Study.objects.create(
+        submitter = submitter,
+        name = "Teststudie",
+        purpose = Purpose.DATA_COLLECTION,
+        date_start = datetime.date(2024, 1, 1),
+        date_end = datetime.date(2024, 12, 31),
+        drks_id = "DRKS00000000",
+        description = "Studie der Unit Tests",
+    )
+    StudyStatistics.objects.create(graph_id = study.id)
+    codebook = CodeBook.objects.create(study = study, name = "Testfragebogen")
+    CodeBookColumn.objects.create(codebook = codebook, idx = 0, header = "Feldname", assigned_meta_tag = "Feldname")
+    for row_id, field_name in enumerate(["Trustcenter-ID", "Alter"]):
+        CodeBookRow.objects.create(codebook = codebook, row_id = row_id, cells = [field_name])
+
+    build_study_codebook_knowledge_graph(study)
+    yield study
+    delete_study_graph(study.id)
@@ -0,0 +1,17 @@
+from neomodel.sync_.core import db
+import functools
+
+def neo4j_test(func):
+    """Runs a function inside a Neo4j transaction and rolls back afterwards."""
+    @functools.wraps(func)
+    def run_and_roll_back(*args, **kwargs):
+        db.begin()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            db.rollback()
+    return run_and_roll_back
+
+def delete_study_graph(graph_id: int):
+    """Deletes the nodes of a study graph that were written outside of a rolled back transaction."""
+    db.cypher_query("MATCH (n) WHERE n.graph_id = $graph_id DETACH DELETE n", {"graph_id": graph_id})
@@ -0,0 +1,35 @@
+from neomodel.sync_.core import db
+from api import schema
+
+MAPPING_ROW = ["Trustcenter-ID", "Alter"]
+
+QUALITY_CHECK_CONFIG = schema.DataQualityCheckConfig(
+    value_type = None,
+    value_range_min = None,
+    value_range_max = None,
+    value_mapping = None,
+    value_required = None,
+    empty_values = True,
+    empty_rows = False,
+    empty_columns = True,
+    mapping_separator = None,
+    answer_separator = None,
+)
+
+def data_upload(study, rows):
+    return schema.StudyDataSubmissionSchema(
+        code_book_id = study.codebooks.get().id,
+        data_quality_check_config = QUALITY_CHECK_CONFIG,
+        values = [MAPPING_ROW, *rows],
+    )
+
+def answer_values(graph_id, relationship_type):
+    results, _ = db.cypher_query(
+        f"MATCH (a:Antwort {{graph_id: $graph_id}})-[:{relationship_type}]->(d:DataNode) RETURN d.value ORDER BY d.value",
+        {"graph_id": graph_id}
+    )
+    return [row[0] for row in results]
+
+def count_nodes(graph_id, label):
+    results, _ = db.cypher_query(f"MATCH (n:{label} {{graph_id: $graph_id}}) RETURN count(n)", {"graph_id": graph_id})
+    return results[0][0]
@@ -0,0 +1,27 @@
+from study.models import CodeBookGraphAnchor, StudyGraphAnchor
+from ..anchors import anchor_study_graphs, get_fragebogen_node, get_study_node
+
+def remove_anchors(study):
+    anchor = StudyGraphAnchor.objects.get(study = study)
+    fragebogen_uuid = CodeBookGraphAnchor.objects.get(codebook__study = study).fragebogen_uuid
+    CodeBookGraphAnchor.objects.filter(codebook__study = study).delete()
+    anchor.delete()
+    return anchor.studie_uuid, fragebogen_uuid
+
+def test_lookups_of_graphs_without_anchor_are_read_only(study):
+    studie_uuid, fragebogen_uuid = remove_anchors(study)
+    codebook = study.codebooks.get()
+
+    assert get_study_node(study.id).uuid == studie_uuid
+    assert get_fragebogen_node(codebook.id, graph_id = study.id).uuid == fragebogen_uuid
+    assert not StudyGraphAnchor.objects.filter(study = study).exists()
+    assert not CodeBookGraphAnchor.objects.filter(codebook = codebook).exists()
+
+def test_graphs_without_anchor_are_anchored(study):
+    studie_uuid, fragebogen_uuid = remove_anchors(study)
+
+    assert anchor_study_graphs() == 1
+    assert StudyGraphAnchor.objects.get(study = study).studie_uuid == studie_uuid
+    assert CodeBookGraphAnchor.objects.get(codebook__study = study).fragebogen_uuid == fragebogen_uuid
+    # anchored graphs are skipped
+    assert anchor_study_graphs() == 0
@@ -0,0 +1,56 @@
+import pytest
+from django.test import override_settings
+from neomodel.sync_.core import db
+from .decorators import neo4j_test
+from .helpers import data_upload
+from ontology.models import OntologyNode
+from ..batch import UnitOfWork
+from ..blobs import blob_hash, blob_path, is_blob_value, load_blob, store_blob
+from ..graph_functions import add_study_data_to_knowledge_graph
+
+LONG_VALUE = "Freitext " * 10
+
+@pytest.fixture
+def blob_store(tmp_path):
+    with override_settings(GRAPH_BLOB_THRESHOLD = 20, GRAPH_BLOB_DIRECTORY = str(tmp_path)):
+        yield tmp_path
+
+def test_blobs_are_stored_by_their_hash(blob_store):
+    value_hash = store_blob(LONG_VALUE)
+
+    assert value_hash == blob_hash(LONG_VALUE)
+    assert blob_path(value_hash).parent.parent == blob_store
+    assert load_blob(value_hash) == LONG_VALUE
+    # equal values share their file
+    assert store_blob(LONG_VALUE) == value_hash
+    assert len(list(blob_store.rglob("*"))) == 2
+
+def test_only_values_above_the_threshold_are_blobs(blob_store):
+    assert is_blob_value(LONG_VALUE)
+    assert not is_blob_value("kurz")
+    assert not is_blob_value(None)
+    with override_settings(GRAPH_BLOB_THRESHOLD = 0):
+        assert not is_blob_value(LONG_VALUE)
+
+@neo4j_test
+def test_data_nodes_reference_their_blob(blob_store):
+    Antwort = OntologyNode.nodes.get(tag = "Antwort").node_class
+    with UnitOfWork() as uow:
+        answer = uow.create(Antwort, {"graph_id": 1000})
+        uow.add_data(answer, LONG_VALUE, {"graph_id": 1000}, "in_review")
+
+    results, _ = db.cypher_query("MATCH (:KnowledgeNode {uuid: $uuid})-->(d:DataNode) RETURN d", {"uuid": answer.uuid}, resolve_objects = True)
+    data = results[0][0]
+
+    assert data.value is None
+    assert data.value_hash == blob_hash(LONG_VALUE)
+    assert data.resolved_value == LONG_VALUE
+
+@pytest.mark.django_db
+def test_unchanged_blob_answers_are_not_written_again(study, blob_store):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", LONG_VALUE]])])
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", LONG_VALUE]])], update = True)
+
+    results, _ = db.cypher_query("MATCH (d:DataNode {graph_id: $graph_id}) WHERE d.value_hash IS NOT NULL RETURN count(d)", {"graph_id": study.id})
+    assert results[0][0] == 1
@@ -0,0 +1,49 @@
+import pytest
+from django.test import override_settings
+from neomodel.sync_.core import db
+from .decorators import neo4j_test
+from ontology.models import OntologyNode
+from ..batch import UnitOfWork
+from ..models import COMPACT_RELATIONSHIP_PROPERTIES, KnowledgeRelationship
+
+GRAPH_ID = 1000
+PARAMETERS = {"graph_id": GRAPH_ID, "is_verified": True}
+
+def create_item():
+    Item, Metadaten = (OntologyNode.nodes.get(tag = tag).node_class for tag in ("Item", "Metadaten"))
+    with override_settings(GRAPH_COMPACT_RELATIONSHIPS = True):
+        with UnitOfWork() as uow:
+            item = uow.create(Item, PARAMETERS)
+            metadaten = uow.create(Metadaten, PARAMETERS)
+            uow.connect(item, "hat_metadaten", metadaten, PARAMETERS)
+    return item, metadaten
+
+@neo4j_test
+def test_compact_relationships_store_no_copied_properties():
+    item, _ = create_item()
+
+    results, _ = db.cypher_query("MATCH (:KnowledgeNode {uuid: $uuid})-[r]->() RETURN keys(r)", {"uuid": item.uuid})
+
+    assert not set(results[0][0]) & set(COMPACT_RELATIONSHIP_PROPERTIES)
+
+@neo4j_test
+@pytest.mark.parametrize("returned", ["n, r", "r"])
+def test_compact_relationships_derive_their_properties(returned):
+    item, _ = create_item()
+
+    # without the start node in the result, it's loaded by its element id
+    results, _ = db.cypher_query(f"MATCH (n:KnowledgeNode {{uuid: $uuid}})-[r]->() RETURN {returned}", {"uuid": item.uuid})
+    relationship = KnowledgeRelationship.inflate(results[0][-1])
+
+    assert relationship.graph_id == GRAPH_ID
+    assert relationship.is_verified
+    assert relationship.created_at == item.node.created_at
+
+@neo4j_test
+def test_relationship_manager_derives_compact_properties():
+    item, metadaten = create_item()
+
+    relationship = item.node.hat_metadaten.relationship(metadaten.node)
+
+    assert relationship.graph_id == GRAPH_ID
+    assert relationship.is_verified
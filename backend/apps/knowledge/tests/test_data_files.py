@@ -0,0 +1,47 @@
+import io
+import pytest
+from ninja.errors import HttpError
+from .helpers import MAPPING_ROW, QUALITY_CHECK_CONFIG, answer_values
+from ..graph_functions import add_study_data_to_knowledge_graph
+from ..ingestion import DataFileRows, DataFileSubmission
+
+CSV = b"Trustcenter-ID,Alter\n100,35\n101,\n102,050\n"
+
+def parquet_file():
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    file = io.BytesIO()
+    pd.DataFrame({"Trustcenter-ID": ["100", "101", "102"], "Alter": ["35", None, "50"]}).to_parquet(file)
+    return file
+
+def test_csv_rows_are_read_as_strings_in_chunks():
+    rows = DataFileRows(io.BytesIO(CSV), "csv", chunk_size = 2)
+
+    assert rows[0] == MAPPING_ROW
+    assert len(rows) == 4
+    assert list(rows) == [MAPPING_ROW, ["100", "35"], ["101", ""], ["102", "050"]]
+    # the file can be read again, e.g. by the partitions of a large upload
+    assert list(rows)[1:] == [["100", "35"], ["101", ""], ["102", "050"]]
+
+def test_parquet_rows_are_read_as_strings():
+    rows = DataFileRows(parquet_file(), "parquet", chunk_size = 2)
+
+    assert len(rows) == 4
+    assert list(rows) == [MAPPING_ROW, ["100", "35"], ["101", ""], ["102", "50"]]
+
+def test_unknown_file_formats_are_rejected():
+    with pytest.raises(HttpError) as error:
+        DataFileRows(io.BytesIO(CSV), "xlsx")
+    assert error.value.status_code == 400
+
+@pytest.mark.django_db
+def test_csv_upload_is_ingested(study):
+    upload = DataFileSubmission(
+        code_book_id = study.codebooks.get().id,
+        data_quality_check_config = QUALITY_CHECK_CONFIG,
+        values = DataFileRows(io.BytesIO(CSV), "csv"),
+    )
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [upload], chunk_size = 2)
+
+    assert answer_values(study.id, "IN_REVIEW") == ["", "050", "100", "101", "102", "35"]
@@ -0,0 +1,17 @@
+from ..indexes import GRAPH_INDEXES, GraphIndex, get_index_population, install_graph_indexes, wait_for_graph_indexes
+
+def test_index_statements():
+    assert GraphIndex("item_col_idx", "Item", ["graph_id", "col_idx"]).statement == \
+        "CREATE RANGE INDEX item_col_idx IF NOT EXISTS FOR (n:Item) ON (n.graph_id, n.col_idx)"
+    assert GraphIndex("value_text", "DataNode", ["value"], kind = "TEXT").statement == \
+        "CREATE TEXT INDEX value_text IF NOT EXISTS FOR (n:DataNode) ON (n.value)"
+    assert GraphIndex("value_hash", "InternedDataNode", ["graph_id", "value_hash"], kind = "UNIQUE").statement == \
+        "CREATE CONSTRAINT value_hash IF NOT EXISTS FOR (n:InternedDataNode) REQUIRE (n.graph_id, n.value_hash) IS UNIQUE"
+
+def test_indexes_can_be_installed_repeatedly():
+    # schema changes can't run inside the transaction of neo4j_test
+    install_graph_indexes()
+    install_graph_indexes()
+
+    assert wait_for_graph_indexes(timeout = 60)
+    assert set(get_index_population()) == {index.name for index in GRAPH_INDEXES}
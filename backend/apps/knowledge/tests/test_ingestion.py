@@ -0,0 +1,95 @@
+import pytest
+from .helpers import MAPPING_ROW, data_upload, answer_values, count_nodes
+from study.staging import stage_study_data, get_staged_data_rows, has_staged_data, materialize_staged_data
+from ..graph_functions import add_study_data_to_knowledge_graph, promote_study_data, has_study_nodes
+from ..ingestion import chunked, save_checkpoint
+from ..statistics import get_study_statistics
+
+@pytest.mark.django_db
+def test_ingestion_writes_answers_in_review(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+
+    assert answer_values(study.id, "IN_REVIEW") == ["100", "101", "18", "35"]
+    assert answer_values(study.id, "CURRENT") == []
+    assert count_nodes(study.id, "Antwortgruppe") == 2
+    assert count_nodes(study.id, "IngestionCheckpoint") == 0
+
+def test_chunked_splits_lazily():
+    rows = iter(range(5))
+    chunks = chunked(rows, 2)
+
+    assert next(chunks) == [0, 1]
+    # the remaining rows haven't been read yet
+    assert next(rows) == 2
+    assert list(chunks) == [[3, 4]]
+
+@pytest.mark.django_db
+def test_progress_is_reported_per_committed_chunk(study):
+    progress = []
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"], ["102", "50"]])],
+                                      chunk_size = 2, progress = progress.append)
+
+    assert progress == [2, 1]
+    assert count_nodes(study.id, "Antwortgruppe") == 3
+
+@pytest.mark.django_db
+def test_resume_skips_the_rows_before_the_checkpoint(study):
+    save_checkpoint(study.id, study.codebooks.get().id, 2)
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"], ["102", "50"]])], resume = True)
+
+    assert answer_values(study.id, "IN_REVIEW") == ["102", "50"]
+    assert count_nodes(study.id, "IngestionCheckpoint") == 0
+
+@pytest.mark.django_db
+def test_resume_upserts_rows_after_the_checkpoint(study):
+    upload = data_upload(study, [["100", "35"], ["101", "18"], ["102", "50"]])
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [upload], chunk_size = 1)
+    # The partitions of the process pool are committed in any order, so the checkpoint can lag behind rows in the graph.
+    save_checkpoint(study.id, upload.code_book_id, 1)
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [upload], resume = True, chunk_size = 1)
+
+    assert count_nodes(study.id, "Antwortgruppe") == 3
+    assert answer_values(study.id, "IN_REVIEW") == ["100", "101", "102", "18", "35", "50"]
+    assert count_nodes(study.id, "Qualitaetspruefung") == 1
+    assert count_nodes(study.id, "IngestionCheckpoint") == 0
+
+@pytest.mark.django_db
+def test_update_keeps_current_answers_until_promotion(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    promote_study_data(graph_id = study.id)
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "35"]
+
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "36"], ["101", "18"]])], update = True)
+
+    # Only the changed answer is written, the existing answer groups are updated instead of duplicated.
+    assert answer_values(study.id, "IN_REVIEW") == ["36"]
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "35"]
+    assert count_nodes(study.id, "Antwortgruppe") == 2
+    assert count_nodes(study.id, "Qualitaetspruefung") == 1
+
+    promote_study_data(graph_id = study.id)
+
+    assert answer_values(study.id, "IN_REVIEW") == []
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "36"]
+    assert answer_values(study.id, "PREVIOUS") == ["35"]
+
+    statistics = get_study_statistics(study.id)
+    assert statistics.answers == 4
+    assert statistics.verified_answers == 4
+
+@pytest.mark.django_db
+def test_materialize_writes_and_promotes_staged_data(study):
+    stage_study_data(study, study.submitter, [data_upload(study, [["100", "35"], ["101", "18"]])])
+
+    assert get_staged_data_rows(study.codebooks.get()) == [MAPPING_ROW, ["100", "35"], ["101", "18"]]
+    assert not has_study_nodes(study.id, "Antwort")
+
+    materialize_staged_data(study.id)
+
+    assert not has_staged_data(study)
+    assert answer_values(study.id, "IN_REVIEW") == []
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "35"]
+    assert get_study_statistics(study.id).verified_answers == 4
@@ -0,0 +1,24 @@
+import pytest
+from ninja.errors import HttpError
+from .helpers import MAPPING_ROW
+from ..ingestion import build_ingestion_index
+
+@pytest.mark.django_db
+def test_index_finds_items_and_questionnaires(study):
+    index = build_ingestion_index(study.id)
+
+    assert set(index.items) == set(MAPPING_ROW)
+    assert index.item("Alter").graph_id == study.id
+    assert index.questionnaire(study.codebooks.get().id).graph_id == study.id
+
+@pytest.mark.django_db
+def test_index_rejects_unknown_field_names(study):
+    index = build_ingestion_index(study.id)
+
+    with pytest.raises(HttpError) as error:
+        index.item("Gewicht")
+    assert error.value.status_code == 404
+
+@pytest.mark.django_db
+def test_index_only_contains_its_own_graph(study):
+    assert build_ingestion_index(study.id + 1).items == {}
@@ -0,0 +1,27 @@
+import pytest
+from neomodel.sync_.core import db
+from .helpers import data_upload
+from ..graph_functions import add_study_data_to_knowledge_graph, set_ordinal_properties_for_subgraph
+
+def ordinals(graph_id, label, property_name):
+    results, _ = db.cypher_query(f"MATCH (n:{label} {{graph_id: $graph_id}}) RETURN n.{property_name} ORDER BY n.{property_name}", {"graph_id": graph_id})
+    return [row[0] for row in results]
+
+@pytest.mark.django_db
+def test_rows_and_columns_get_their_ordinals(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+
+    assert ordinals(study.id, "Item", "col_idx") == [0, 1]
+    assert ordinals(study.id, "Antwortgruppe", "row_idx") == [0, 1]
+
+@pytest.mark.django_db
+def test_ordinals_are_set_from_the_leaves_of_older_graphs(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    db.cypher_query("MATCH (n {graph_id: $graph_id}) WHERE n:Item OR n:Antwortgruppe REMOVE n.col_idx, n.row_idx", {"graph_id": study.id})
+
+    assert set_ordinal_properties_for_subgraph(study.id, batch_size = 1) == 4
+
+    assert ordinals(study.id, "Item", "col_idx") == [0, 1]
+    assert ordinals(study.id, "Antwortgruppe", "row_idx") == [0, 1]
+    # nodes with ordinals are skipped
+    assert set_ordinal_properties_for_subgraph(study.id) == 0
@@ -0,0 +1,26 @@
+import pytest
+from ..anchors import get_study_node
+from ..batch import NodeHandle, UnitOfWork
+from ..graph_functions import add_study_data_to_knowledge_graph, resolve_participants
+from .helpers import count_nodes, data_upload
+
+@pytest.mark.django_db
+def test_patients_are_created_once_per_upload(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["100", "36"], ["101", "18"]])], chunk_size = 1)
+
+    assert count_nodes(study.id, "Teilnehmer") == 2
+    assert count_nodes(study.id, "Antwortgruppe") == 3
+
+@pytest.mark.django_db
+def test_existing_patients_are_resolved(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"]])])
+    uow = UnitOfWork()
+
+    participants = resolve_participants(get_study_node(study.id), ["100", "101", 101], study.id, uow)
+
+    assert set(participants) == {"100", "101"}
+    # only the missing patient is created
+    assert not isinstance(participants["100"], NodeHandle)
+    assert isinstance(participants["101"], NodeHandle)
+    uow.commit()
+    assert count_nodes(study.id, "Teilnehmer") == 2
@@ -0,0 +1,42 @@
+import pytest
+from django.test import override_settings
+from neomodel.sync_.core import db
+from .helpers import answer_values, data_upload
+from ..graph_functions import add_study_data_to_knowledge_graph, label_study_subgraph, promote_study_data
+from ..partitions import PartitionAwareRegistry, study_label, study_node_pattern
+
+def count_unlabelled(graph_id):
+    results, _ = db.cypher_query(
+        f"MATCH (n {{graph_id: $graph_id}}) WHERE (n:KnowledgeNode OR n:DataNode) AND NOT n:`{study_label(graph_id)}` RETURN count(n)",
+        {"graph_id": graph_id}
+    )
+    return results[0][0]
+
+def test_study_node_pattern():
+    with override_settings(GRAPH_STUDY_LABELS = False):
+        assert study_node_pattern("n", "LeafNode", 42) == "(n:LeafNode {graph_id: $graph_id})"
+    with override_settings(GRAPH_STUDY_LABELS = True):
+        assert study_node_pattern("n", "LeafNode", 42) == "(n:`G_42`:LeafNode)"
+        assert study_node_pattern("n", "LeafNode", -1) == "(n:`G_-1`:LeafNode)"
+
+def test_registry_ignores_study_labels():
+    registry = PartitionAwareRegistry({frozenset(["KnowledgeNode", "Item"]): "Item"})
+
+    assert frozenset(["KnowledgeNode", "Item", "G_42"]) in registry
+    assert registry[frozenset(["KnowledgeNode", "Item", "G_42"])] == "Item"
+    assert registry.get(frozenset(["KnowledgeNode", "Antwort", "G_42"])) is None
+
+@pytest.mark.django_db
+def test_labelled_graphs_are_ingested_and_promoted(study):
+    # the graph of the fixture was built without study labels
+    assert label_study_subgraph(study.id, batch_size = 10) > 0
+    assert count_unlabelled(study.id) == 0
+
+    with override_settings(GRAPH_STUDY_LABELS = True):
+        add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+        promote_study_data(graph_id = study.id)
+
+    assert count_unlabelled(study.id) == 0
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "35"]
+    # labelling is repeatable
+    assert label_study_subgraph(study.id) == 0
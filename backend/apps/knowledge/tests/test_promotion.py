@@ -0,0 +1,41 @@
+import pytest
+from neomodel.sync_.core import db
+from .decorators import neo4j_test
+from .helpers import answer_values, count_nodes, data_upload
+from ..batch import run_in_transactions
+from ..graph_functions import add_study_data_to_knowledge_graph, promote_study_data, set_in_review_data_to_current_for_subgraph
+
+def count_unverified(graph_id):
+    results, _ = db.cypher_query("MATCH (n:KnowledgeNode {graph_id: $graph_id}) WHERE NOT coalesce(n.is_verified, false) RETURN count(n)", {"graph_id": graph_id})
+    return results[0][0]
+
+@pytest.mark.django_db
+def test_promotion_commits_in_batches(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    progress = []
+
+    promote_study_data(graph_id = study.id, batch_size = 1, progress = progress.append)
+
+    assert answer_values(study.id, "IN_REVIEW") == []
+    assert answer_values(study.id, "CURRENT") == ["100", "101", "18", "35"]
+    assert count_unverified(study.id) == 0
+    # rounds of ten batches of one row
+    assert progress and max(progress) <= 10
+
+@pytest.mark.django_db
+def test_promotion_can_be_repeated(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"]])])
+    promote_study_data(graph_id = study.id)
+
+    # an interrupted promotion is continued by running it again, data that is already current isn't moved
+    assert set_in_review_data_to_current_for_subgraph(graph_id = study.id) == 0
+    promote_study_data(graph_id = study.id)
+
+    assert answer_values(study.id, "CURRENT") == ["100", "35"]
+    assert answer_values(study.id, "PREVIOUS") == []
+    assert count_nodes(study.id, "Antwortgruppe") == 1
+
+@neo4j_test
+def test_batches_need_an_implicit_transaction():
+    with pytest.raises(RuntimeError):
+        run_in_transactions("MATCH (n:KnowledgeNode {graph_id: $graph_id})", "SET n.is_verified = true", {"graph_id": 0})
@@ -0,0 +1,40 @@
+import pytest
+from django.forms.models import model_to_dict
+from .helpers import data_upload
+from ..graph_functions import add_study_data_to_knowledge_graph, promote_study_data, set_is_verified_for_subgraph
+from ..statistics import count_study_statistics, get_study_statistics
+
+def stored_statistics(study):
+    statistics = model_to_dict(get_study_statistics(study.id))
+    return {name: statistics[name] for name in ("questionnaires", "items", "participants", "answers", "verified_answers")}
+
+@pytest.mark.django_db
+def test_graph_build_counts_the_codebook(study):
+    assert stored_statistics(study) == count_study_statistics(study.id)
+    assert stored_statistics(study)["items"] == 2
+
+@pytest.mark.django_db
+def test_ingestion_and_promotion_add_their_changes(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])], chunk_size = 1)
+    assert stored_statistics(study) == count_study_statistics(study.id)
+    assert stored_statistics(study)["answers"] == 4
+
+    promote_study_data(graph_id = study.id)
+    assert stored_statistics(study) == count_study_statistics(study.id)
+    assert stored_statistics(study)["verified_answers"] == 4
+
+    # an update that changes a verified answer and adds a participant
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "36"], ["102", "50"]])], update = True)
+    promote_study_data(graph_id = study.id)
+    assert stored_statistics(study) == count_study_statistics(study.id)
+    assert stored_statistics(study)["participants"] == 3
+
+@pytest.mark.django_db
+def test_unverifying_subtracts_the_verified_counts(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"]])])
+    promote_study_data(graph_id = study.id)
+
+    set_is_verified_for_subgraph(graph_id = study.id, is_verified = False)
+
+    assert stored_statistics(study) == count_study_statistics(study.id)
+    assert stored_statistics(study)["verified_answers"] == 0
@@ -0,0 +1,32 @@
+import datetime
+import pytest
+from neomodel.sync_.core import db
+from .decorators import neo4j_test
+from ontology.models import OntologyNode
+from ..batch import UnitOfWork, typed_value_properties
+
+@pytest.mark.parametrize("value, data_type, properties", [
+    ("42", "integer", {"num_value": 42.0}),
+    ("3,5", "Zahl", {"num_value": 3.5}),
+    ("nan", "number", {}),
+    ("unbekannt", "integer", {}),
+    ("2024-03-01", "date_dmy", {"date_value": datetime.date(2024, 3, 1)}),
+    ("01.03.2024", "Datum", {"date_value": datetime.date(2024, 3, 1)}),
+    ("03/01/2024", "date_mdy", {"date_value": datetime.date(2024, 3, 1)}),
+    ("42", "text", {}),
+    ("42", None, {}),
+    ("", "integer", {}),
+])
+def test_typed_value_properties(value, data_type, properties):
+    assert typed_value_properties(value, data_type) == properties
+
+@neo4j_test
+def test_data_nodes_carry_their_typed_value():
+    Antwort = OntologyNode.nodes.get(tag = "Antwort").node_class
+    with UnitOfWork() as uow:
+        answer = uow.create(Antwort, {"graph_id": 1000})
+        uow.add_data(answer, "42", {"graph_id": 1000}, "in_review", "integer")
+
+    results, _ = db.cypher_query("MATCH (:KnowledgeNode {uuid: $uuid})-->(d:DataNode) RETURN d.value, d.num_value", {"uuid": answer.uuid})
+
+    assert results == [["42", 42.0]]
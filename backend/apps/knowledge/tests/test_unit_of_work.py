@@ -0,0 +1,106 @@
+import pytest
+from django.test import override_settings
+from neomodel.sync_.core import db
+from .decorators import neo4j_test
+from ontology.models import OntologyNode
+from ..batch import UnitOfWork
+from ..blobs import blob_hash
+
+GRAPH_ID = 1000
+PARAMETERS = {"graph_id": GRAPH_ID}
+
+def node_class(tag):
+    return OntologyNode.nodes.get(tag = tag).node_class
+
+def data_values(leaf, relationship_type):
+    results, _ = db.cypher_query(
+        f"MATCH (:KnowledgeNode {{uuid: $uuid}})-[:{relationship_type}]->(d:DataNode) RETURN d.value ORDER BY d.value",
+        {"uuid": leaf.uuid}
+    )
+    return [row[0] for row in results]
+
+@neo4j_test
+def test_commit_writes_nodes_relationships_and_data():
+    with UnitOfWork() as uow:
+        item = uow.create(node_class("Item"), PARAMETERS)
+        metadaten = uow.create(node_class("Metadaten"), PARAMETERS)
+        feldname = uow.create(node_class("Feldname"), PARAMETERS)
+        uow.connect(item, "hat_metadaten", metadaten, PARAMETERS)
+        uow.connect(metadaten, "hat_feldname", feldname, PARAMETERS)
+        uow.add_data(feldname, "Alter", PARAMETERS)
+
+    assert item.node.graph_id == GRAPH_ID
+    assert item.node.hat_metadaten.single().uuid == metadaten.uuid
+    assert metadaten.node.hat_feldname.single().uuid == feldname.uuid
+    assert feldname.node.current_data.get().value == "Alter"
+
+@neo4j_test
+def test_commit_starts_over():
+    uow = UnitOfWork()
+    uow.create(node_class("Item"), PARAMETERS)
+    assert len(uow) == 1
+
+    uow.commit()
+    assert len(uow) == 0
+
+@neo4j_test
+def test_inline_data_is_stored_on_the_leaf():
+    with UnitOfWork() as uow:
+        spalten_id = uow.create(node_class("SpaltenID"), PARAMETERS)
+        uow.add_data(spalten_id, "3", PARAMETERS)
+
+    assert spalten_id.node.value == "3"
+    assert spalten_id.node.current_data.get().value == "3"
+    assert data_values(spalten_id, "CURRENT") == []
+
+@neo4j_test
+def test_move_data_keeps_the_previous_value():
+    Antwort = node_class("Antwort")
+    with UnitOfWork() as uow:
+        antwort = uow.create(Antwort, PARAMETERS)
+        uow.add_data(antwort, "35", PARAMETERS)
+
+    with UnitOfWork() as uow:
+        uow.move_data(antwort, ["current_data"], "previous_data")
+        uow.add_data(antwort, "36", PARAMETERS)
+
+    assert data_values(antwort, "CURRENT") == ["36"]
+    assert data_values(antwort, "PREVIOUS") == ["35"]
+
+@neo4j_test
+@pytest.mark.parametrize("interned, data_type, data_nodes", [(False, "radio", 2), (True, "radio", 1), (True, None, 2), (True, "text", 2)])
+def test_categorical_answers_are_interned(interned, data_type, data_nodes):
+    Antwort = node_class("Antwort")
+    with override_settings(GRAPH_INTERN_CATEGORICAL_VALUES = interned):
+        with UnitOfWork() as uow:
+            antworten = [uow.create(Antwort, PARAMETERS) for _ in range(2)]
+            for antwort in antworten:
+                uow.add_data(antwort, "ja", PARAMETERS, data_type = data_type)
+
+    results, _ = db.cypher_query(
+        "MATCH (a:Antwort)-[:CURRENT]->(d:DataNode) WHERE a.uuid IN $uuids RETURN DISTINCT d",
+        {"uuids": [antwort.uuid for antwort in antworten]}
+    )
+    assert len(results) == data_nodes
+    assert all(data_node["value"] == "ja" for data_node, in results)
+    if data_nodes == 1:
+        assert results[0][0]["value_hash"] == blob_hash("ja")
+
+@neo4j_test
+def test_values_of_categorical_leaf_classes_are_interned():
+    Studienzweck = node_class("Studienzweck")
+    with override_settings(GRAPH_INTERN_CATEGORICAL_VALUES = True):
+        Studienzweck.is_categorical = True
+        try:
+            with UnitOfWork() as uow:
+                leaves = [uow.create(Studienzweck, PARAMETERS) for _ in range(2)]
+                for leaf in leaves:
+                    uow.add_data(leaf, "PILOT_STUDY", PARAMETERS)
+        finally:
+            Studienzweck.is_categorical = False
+
+    results, _ = db.cypher_query(
+        "MATCH (l:Studienzweck)-[:CURRENT]->(d:InternedDataNode) WHERE l.uuid IN $uuids RETURN count(DISTINCT d)",
+        {"uuids": [leaf.uuid for leaf in leaves]}
+    )
+    assert results[0][0] == 1
@@ -115,6 +115,8 @@ def get_ontology_triplets(transform=True, nodes = None):
         elif(n.node_type==OntologyNodeTypes.LEAF): 
             entity.properties["is_stakeholder"]= "false"
             entity.properties["is_leaf"] = "true"
+        entity.properties["is_categorical"] = "true" if n.is_categorical else "false"
+        entity.properties["is_inline"] = "true" if n.is_inline else "false"
         entity.properties["updated_at"]=n.updated_at
         entity.properties["created_at"]=n.created_at
         entity.properties["tag"]=n.tag
@@ -179,6 +181,8 @@ def get_codebooks_for_rdf(study: Study):
          entity_node.id = str(node_id_counter+i)
          entity_node.properties["is_stakeholder"]= "false"
          entity_node.properties["is_leaf"] = "true"
+         entity_node.properties["is_categorical"] = "true" if m.new_node.properties.get("is_categorical") else "false"
+         entity_node.properties["is_inline"] = "true" if m.new_node.properties.get("is_inline") else "false"
          entity_node.properties["updated_at"]=datetime.now().isoformat()
          entity_node.properties["created_at"]=datetime.now().isoformat()
          entity_node.properties["tag"]=normalize_string(m.new_node.properties["tag"])
@@ -255,19 +259,19 @@ def create_baseline_ontology():
     studieninformationen: OntologyNode = OntologyNode(tag="Studieninformationen", name="Studieninformationen", node_type=OntologyNodeTypes.CONNECTIVE).save()
     startdatum: OntologyNode = OntologyNode(tag="Startdatum", name="Startdatum", node_type=OntologyNodeTypes.LEAF).save()
     enddatum: OntologyNode = OntologyNode(tag="Enddatum", name="Enddatum", node_type=OntologyNodeTypes.LEAF).save()
-    studien_id: OntologyNode = OntologyNode(tag="StudienID", name="Studien-ID", node_type=OntologyNodeTypes.LEAF).save()
-    studienname: OntologyNode = OntologyNode(tag="Studienname", name="Studienname", node_type=OntologyNodeTypes.LEAF).save()
+    studien_id: OntologyNode = OntologyNode(tag="StudienID", name="Studien-ID", node_type=OntologyNodeTypes.LEAF, is_inline=True).save()
+    studienname: OntologyNode = OntologyNode(tag="Studienname", name="Studienname", node_type=OntologyNodeTypes.LEAF, is_inline=True).save()
     beschreibungstext: OntologyNode = OntologyNode(tag="Beschreibungstext", name="Beschreibungstext", node_type=OntologyNodeTypes.LEAF).save()
-    drks_id: OntologyNode = OntologyNode(tag="DRKSID", name="DRKS-ID", node_type=OntologyNodeTypes.LEAF).save()
+    drks_id: OntologyNode = OntologyNode(tag="DRKSID", name="DRKS-ID", node_type=OntologyNodeTypes.LEAF, is_inline=True).save()
     studienzweck: OntologyNode = OntologyNode(tag="Studienzweck", name="Studienzweck", node_type=OntologyNodeTypes.LEAF).save()
     
     datenerhebung: OntologyNode = OntologyNode(tag="Datenerhebung", name="Datenerhebung", node_type=OntologyNodeTypes.CONNECTIVE).save()
     fragebogen: OntologyNode = OntologyNode(tag="Fragebogen", name="Fragebogen", node_type=OntologyNodeTypes.CONNECTIVE).save()
-    fragebogen_id: OntologyNode = OntologyNode(tag="FragebogenID", name="Fragebogen-ID", node_type=OntologyNodeTypes.LEAF).save()
+    fragebogen_id: OntologyNode = OntologyNode(tag="FragebogenID", name="Fragebogen-ID", node_type=OntologyNodeTypes.LEAF, is_inline=True).save()
     fragebogen_name: OntologyNode = OntologyNode(tag="Fragebogenname", name="Fragebogenname", node_type=OntologyNodeTypes.LEAF).save()
     antwortgruppe: OntologyNode = OntologyNode(tag="Antwortgruppe", name="Antwortgruppe", node_type=OntologyNodeTypes.CONNECTIVE).save()
     reihen_id: OntologyNode = OntologyNode(tag="ReihenID", name="Reihen ID", node_type=OntologyNodeTypes.LEAF).save()
-    spalten_id: OntologyNode = OntologyNode(tag="SpaltenID", name="Spalten ID", node_type=OntologyNodeTypes.LEAF).save()
+    spalten_id: OntologyNode = OntologyNode(tag="SpaltenID", name="Spalten ID", node_type=OntologyNodeTypes.LEAF, is_inline=True).save()
     
     qualitätsprüfung: OntologyNode = OntologyNode(tag="Qualitaetspruefung", name="Qualitätsprüfung", node_type=OntologyNodeTypes.CONNECTIVE).save()
     datentyp : OntologyNode = OntologyNode(tag="Datentyp", name="Datentyp", node_type=OntologyNodeTypes.LEAF).save()
@@ -57,6 +57,8 @@ class Entity:
                 "name": node.name,
                 "is_leaf": node.node_type == OntologyNodeTypes.LEAF,
                 "is_stakeholder": node.node_type == OntologyNodeTypes.STAKEHOLDER,
+                "is_categorical": node.is_categorical,
+                "is_inline": node.is_inline,
             }
         )
     
@@ -81,10 +83,13 @@ class Entity:
             else:
                 node_type = OntologyNodeTypes.CONNECTIVE
 
+            # RDF files exported before these flags existed don't contain them
             return OntologyNode(
                 tag = self.properties["tag"],
                 name = self.properties["name"],
-                node_type = node_type
+                node_type = node_type,
+                is_categorical = is_true(self.properties.get("is_categorical", False)),
+                is_inline = is_true(self.properties.get("is_inline", False))
             )
         elif self.is_relationship:
             return OntologyRelationship(
@@ -101,6 +106,10 @@ class Entity:
     def __eq__(self, other):
         return self.name == other.name
 
+def is_true(value: bool|str) -> bool:
+    """Boolean properties are bools for entities created from nodes and "true"/"false" for entities loaded from RDF."""
+    return value is True or value == "true"
+
 def remove_prefix(text: str, delimiter: str = "/"):
     """Removes unnecessary trash from the RDF elements."""
     last_occurence = text.rfind(delimiter) + 1
@@ -198,6 +207,10 @@ def annotate_new_and_modified_nodes(entities: dict[str, Entity]):
             logger.debug(f"node ist {node.name} and is leaf is {node_is_leaf}, entity is {entity.name} and entity is leaf {entity_is_leaf}")
             if node_is_leaf != entity_is_leaf:
                 modified_fields.append("is_leaf")
+
+            for flag in ("is_categorical", "is_inline"):
+                if getattr(node, flag) != is_true(entity.properties.get(flag, False)):
+                    modified_fields.append(flag)
             
             if modified_fields:
                 logger.debug(f"modiefied fields are {modified_fields} for node {node.name}")
@@ -297,7 +310,7 @@ def add_property_types(name, graph, entity,NOD,PRO,value):
     if(name=="created" or name=="last_updated"):
         graph.add((NOD[entity.id], PRO[name], rdflib.Literal(value, datatype=XSD.dateTime)))
     elif(name=="is_stakeholder" or name=="verified" or name=="is_leaf" or name=="added"
-         or name=="deleted"):
+         or name=="deleted" or name=="is_categorical" or name=="is_inline"):
         graph.add((NOD[entity.id], PRO[name], rdflib.Literal(value, datatype=XSD.boolean)))
     else:
         graph.add((NOD[entity.id], PRO[name], rdflib.Literal(value)))
@@ -111,9 +111,9 @@ def fetch_data_for_export(itemstring: str, identificator: str):
                 row_identificator = next((rel.end_node for rel in meta_data_rels if rel.end_node.tag == identificator), None).current_data.get().value
                 
             if(row_identificator in answergroups):
-                answergroups[row_identificator].append(antwort.current_data.get().value)
+                answergroups[row_identificator].append(antwort.current_data.get().resolved_value)
             else:
-                answergroups[row_identificator]=[antwort.current_data.get().value]
+                answergroups[row_identificator]=[antwort.current_data.get().resolved_value]
 
         for key in sorted(answergroups.keys()):
             if key in data:
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from knowledge.indexes import GRAPH_INDEXES, install_graph_indexes, wait_for_graph_indexes
+
+class Command(BaseCommand):
+    help = "Creates the indexes and constraints of the knowledge graph that don't exist yet and reports their population."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-wait", action="store_true", help="Don't wait until the indexes are populated")
+        parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait for the population at most")
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(
+            self.style.NOTICE(f'Creating {len(GRAPH_INDEXES)} knowledge graph indexes and constraints...')
+        )
+        install_graph_indexes(lambda message: self.stdout.write(message))
+        if kwargs["no_wait"]:
+            return
+
+        def progress(population: dict) -> None:
+            states = ", ".join(f"{name} {state} {percent:.0f}%" for name, (state, percent) in sorted(population.items()))
+            self.stdout.write(states)
+
+        try:
+            online = wait_for_graph_indexes(progress, timeout = kwargs["timeout"])
+        except RuntimeError as error:
+            raise CommandError(str(error))
+
+        if not online:
+            self.stdout.write(
+                self.style.WARNING('Timeout reached, the remaining indexes are populated in the background.')
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS('Successfully installed all knowledge graph indexes.')
+        )
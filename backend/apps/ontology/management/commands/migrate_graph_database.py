@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from neomodel import db
 
+from knowledge.indexes import install_graph_indexes
 from knowledge.models import load_all_knowledge_node_classes
 
 class Command(BaseCommand):
@@ -17,6 +18,8 @@ class Command(BaseCommand):
         )
 
         db.install_all_labels(self.stdout)
+        # the indexes and constraints neomodel doesn't know about, see install_graph_indexes for waiting on their population
+        install_graph_indexes()
         self.stdout.write(
             self.style.SUCCESS('Successfully installed all labels.')
         )
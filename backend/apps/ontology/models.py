@@ -56,6 +56,11 @@ class OntologyNode(neomodel.StructuredNode):
     name: str = neomodel.StringProperty(required = True)
     tag: str = neomodel.StringProperty(required = True, unique_index = True)
     node_type: OntologyNodeTypes = neomodel.StringProperty(required = True, choices = OntologyNodeTypes.choices)
+    # Leaves with few distinct values (e.g. a study purpose) share one data node per value and graph if value interning is enabled.
+    # Answers are interned by the Datentyp of their item instead, see knowledge.batch.interns_values.
+    is_categorical: bool = neomodel.BooleanProperty(default = False)
+    # Leaves with exactly one value that is never reviewed (e.g. ids and names) store it as property instead of a data node.
+    is_inline: bool = neomodel.BooleanProperty(default = False)
 
     created_at: timezone.datetime = neomodel.DateTimeProperty(default = timezone.now)
     updated_at: timezone.datetime = neomodel.DateTimeProperty(default = timezone.now)
@@ -90,6 +95,8 @@ class OntologyNode(neomodel.StructuredNode):
             "name": self.name,
             "tag": self.tag,
             "node_type": self.node_type,
+            "is_categorical": self.is_categorical,
+            "is_inline": self.is_inline,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -101,6 +108,8 @@ class OntologyNode(neomodel.StructuredNode):
             "name": self.name,
             "tag": self.tag,
             "node_type": self.node_type,
+            "is_categorical": self.is_categorical,
+            "is_inline": self.is_inline,
         }
 
     @classmethod
@@ -108,7 +117,9 @@ class OntologyNode(neomodel.StructuredNode):
         return cls(
             name = settings["name"],
             tag = settings["tag"],
-            node_type = settings["node_type"]
+            node_type = settings["node_type"],
+            is_categorical = settings.get("is_categorical", False),
+            is_inline = settings.get("is_inline", False)
         )
     
     def __hash__(self):
@@ -0,0 +1,44 @@
+import pytest
+from .decorators import neo4j_test
+from ontology.models import OntologyNode
+from ..data_requests import get_ontology_triplets
+from ..diff import entities_to_rdf, load_entities, annotate_new_and_modified_nodes
+
+FLAGS = ["is_categorical", "is_inline"]
+
+@neo4j_test
+@pytest.mark.parametrize("flag", FLAGS)
+def test_flag_round_trip(flag):
+    node = OntologyNode.nodes.get(tag = "Feldname")
+    setattr(node, flag, True)
+    node.save()
+
+    rdf = entities_to_rdf(get_ontology_triplets(nodes = [node]))
+    restored = load_entities(rdf)["Feldname"].to_node_or_relationship()
+
+    for name in FLAGS:
+        assert getattr(restored, name) == (name == flag)
+
+@neo4j_test
+@pytest.mark.parametrize("flag", FLAGS)
+def test_changed_flag_is_modified(flag):
+    node = OntologyNode.nodes.get(tag = "Feldname")
+    rdf = entities_to_rdf(get_ontology_triplets(nodes = [node]))
+    setattr(node, flag, True)
+    node.save()
+
+    entities = load_entities(rdf)
+    annotate_new_and_modified_nodes(entities)
+
+    assert entities["Feldname"].diff["modified"] == [flag]
+
+@neo4j_test
+def test_unchanged_flags_are_not_modified():
+    node = OntologyNode.nodes.get(tag = "Antwort")
+    node.is_categorical = True
+    node.save()
+
+    entities = load_entities(entities_to_rdf(get_ontology_triplets(nodes = [node])))
+    annotate_new_and_modified_nodes(entities)
+
+    assert "modified" not in entities["Antwort"].diff
@@ -1,74 +1,102 @@
+from django.utils import timezone
+from neomodel import db
+
+from authentication.models import CustomUser
+from knowledge.anchors import get_fragebogen_node
+from knowledge.batch import relationship_definition
+from knowledge.models import LeafNode
 from ontology.models import OntologyNode
-from study.models import CodeBook
+from reviewer.models import Feedback, Review, ReviewDetails, StatusChoices, UploadTypeChoices
+from study.documents import data_value
+from study.models import CodeBook, Study
+
+def review_value(variable: str) -> str:
+    """Cypher expression for the data of a leaf node in a review: its inline value or the data in review, falling back to its current data."""
+    return (
+        f"CASE WHEN {variable}.value IS NOT NULL THEN {{value: {variable}.value}} "
+        f"ELSE coalesce(head([({variable})-[r]->(d:DataNode) WHERE type(r) = $in_review | d {{.value, .value_hash}}]), "
+        f"head([({variable})-[c]->(d:DataNode) WHERE type(c) = $current | d {{.value, .value_hash}}])) END"
+    )
+
 
 def get_data_rows_for_codebook(codebook: CodeBook):
-    ontology_study_id = OntologyNode.nodes.first_or_none(tag="StudienID")
-    study_id = ontology_study_id.node_class.nodes.get(current_data__value = str(codebook.study.id))[0]
-    ontology_answer_group = OntologyNode.nodes.first_or_none(tag="Antwortgruppe")
-    answer_groups = ontology_answer_group.node_class.nodes.filter(graph_id=study_id.graph_id)
-    
-    data_rows = []
+    """
+    Returns the Feldname row and the data rows of a codebook for the feedback of a data upload. Answers in review are preferred over
+    their current data. The rows are read with one query ordered by the row_idx and col_idx ordinals, one result per answer. Answer groups of
+    different participants can share a row_idx after an update upload, so the rows are the answer groups.
+    """
+    # NOTE: uploads in the staging tables (see study.staging) haven't been written to the graph yet
+    from study.staging import get_staged_data_rows
+    staged_rows = get_staged_data_rows(codebook)
+    if staged_rows is not None:
+        return staged_rows
+
+    fragebogen = get_fragebogen_node(codebook.id, graph_id = codebook.study_id)
+    if fragebogen is None:
+        return []
 
-    unordered_answers = []
-    unordered_column_names = []
-    for answer_group in answer_groups:
-        ontology_codebook = OntologyNode.nodes.first_or_none(tag="Fragebogen")
-        knowledge_codebooks = ontology_codebook.node_class.nodes.all()
-        
-        found_codebook = None
-        for cb in knowledge_codebooks:
-            if cb.hat_fragebogenid.get_or_none(tag="FragebogenID").current_data.get().value == str(codebook.id):
-                found_codebook = cb
-                break
-        
-        items = found_codebook.hat_item.all()
-        answers = list(answer_group.hat_antwort.filter(tag="Antwort"))
-        answer_uuids = {answer.uuid for answer in answers}
-        mapped_answers = list()
-        
-        for item in items:
-            all_answers = item.hat_antwort.all() 
-            idx = int(item.hat_spaltenid.get(tag="SpaltenID").current_data.get().value)
-            
-            mapped_answers.append(dict(
-                idx=idx,
-                answers=[answer for answer in all_answers if answer.uuid in answer_uuids]
-            ))
-            
-            unordered_column_names.append(dict(
-                idx=idx,
-                name= item.hat_metadaten.get().hat_feldname.get().current_data.get().value,
-            ))
-        
-        sorted_answers = sorted(mapped_answers, key=lambda x: x['idx'])
-        
-        try:
-            idx = int(answer_group.hat_reihenid.get().in_review.get().value)
-        except:
-            idx = int(answer_group.hat_reihenid.get().current_data.get().value)
-        
-        try:
-            answers = [answer.in_review.get().value for item in sorted_answers for answer in item['answers']]
-        except:
-            answers = [answer.current_data.get().value for item in sorted_answers for answer in item['answers']]
-        
-        unordered_answers.append(dict(
-            idx=idx,
-            answers=answers
-        ))
+    Item, AnswerGroup, Metadata = (OntologyNode.nodes.get(tag = tag).node_class for tag in ("Item", "Antwortgruppe", "Metadaten"))
+    Fragebogen = type(fragebogen)
+    # Items without answers only contribute their Feldname to the header, their answer, answer group and value are null.
+    query = (
+        "MATCH (fragebogen:KnowledgeNode {uuid: $fragebogen})-[:$($hat_item)]->(item:$($item_label)) "
+        "WITH fragebogen, item, CASE WHEN item.col_idx IS NOT NULL THEN item.col_idx "
+        f"ELSE toInteger(head([(item)-[s]->(leaf:LeafNode) WHERE type(s) = $hat_spaltenid | {review_value('leaf')}]).value) END AS col_idx "
+        "WITH fragebogen, item, col_idx, head([(item)-[m]->()-[f]->(leaf:LeafNode) WHERE type(m) = $hat_metadaten AND type(f) = $hat_feldname "
+        f"| {review_value('leaf')}]).value AS name "
+        "OPTIONAL MATCH (item)-[:$($item_hat_antwort)]->(answer)<-[:$($hat_antwort)]-(answer_group:$($answer_group_label))<-[:$($hat_antwortgruppe)]-(fragebogen) "
+        "WITH col_idx, name, answer, answer_group, CASE WHEN answer_group.row_idx IS NOT NULL THEN answer_group.row_idx "
+        f"ELSE toInteger(head([(answer_group)-[i]->(leaf:LeafNode) WHERE type(i) = $hat_reihenid | {review_value('leaf')}]).value) END AS row_idx "
+        f"RETURN col_idx, name, answer_group.uuid AS answer_group, CASE WHEN answer IS NULL THEN NULL ELSE {review_value('answer')} END AS data "
+        "ORDER BY row_idx, answer_group, col_idx"
+    )
+    results, _ = db.cypher_query(query, {
+        "fragebogen": fragebogen.uuid,
+        "in_review": relationship_definition(LeafNode, "in_review")["relation_type"],
+        "current": relationship_definition(LeafNode, "current_data")["relation_type"],
+        "hat_item": relationship_definition(Fragebogen, "hat_item")["relation_type"],
+        "hat_antwortgruppe": relationship_definition(Fragebogen, "hat_antwortgruppe")["relation_type"],
+        "hat_spaltenid": relationship_definition(Item, "hat_spaltenid")["relation_type"],
+        "hat_metadaten": relationship_definition(Item, "hat_metadaten")["relation_type"],
+        "hat_feldname": relationship_definition(Metadata, "hat_feldname")["relation_type"],
+        "item_hat_antwort": relationship_definition(Item, "hat_antwort")["relation_type"],
+        "hat_reihenid": relationship_definition(AnswerGroup, "hat_reihenid")["relation_type"],
+        "hat_antwort": relationship_definition(AnswerGroup, "hat_antwort")["relation_type"],
+        "item_label": Item.__label__,
+        "answer_group_label": AnswerGroup.__label__,
+    })
+
+    column_names = {}
+    rows = {}
+    for col_idx, name, answer_group, data in results:
+        column_names.setdefault(col_idx, name)
+        # the answer group is null for items without answers, the results are ordered by row_idx, so the rows are added in their order
+        if answer_group is not None:
+            rows.setdefault(answer_group, {})[col_idx] = data_value(data)
+
+    # answers without data are empty cells, so the cells of every row line up with the header
+    column_ids = sorted(column_names, key = lambda col_idx: (col_idx is None, col_idx))
+    header = [column_names[col_idx] for col_idx in column_ids]
+    return [header, *(["" if cells.get(col_idx) is None else cells[col_idx] for col_idx in column_ids] for cells in rows.values())]
+
+
+def create_data_upload_review(study: Study, submitter: CustomUser) -> Review:
+    """Creates the open review with its details and feedback for a data upload."""
+    review_instance = Review.objects.create(
+        submitter=submitter,
+        submission_date=timezone.now(),
+        study=study,
+        submission_status=StatusChoices.STATUS_OPEN.value,
+        upload_type=UploadTypeChoices.UPLOAD_DATA.value 
+    )
+    
+    ReviewDetails.objects.create(
+        reviewer_details=review_instance,
+        status=None, 
+        comment=None,
+        modified_ontology="",
+    )
     
-    sorted_column_names = sorted(unordered_column_names, key=lambda x: x['idx'])
+    Feedback.objects.create(review=review_instance)
     
-    answers = []
-    seen = set()
-    for col in sorted_column_names:
-        name = col["name"]
-        if name not in seen:
-            answers.append(name)
-            seen.add(name)
-            
-    unordered_answers.append(dict(
-        idx=-1,
-        answers=answers
-    ))
-    return data_rows + [answers["answers"] for answers in sorted(unordered_answers, key=lambda x: x['idx'])]
\ No newline at end of file
+    return review_instance
@@ -0,0 +1,11 @@
+import pytest
+import os
+
+# The reviewer tests run against the same baseline ontology and study graph as the knowledge tests.
+from knowledge.tests.conftest import setup_database, study
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure():
+    if not os.getenv("ENABLE_UNIT_TESTS"):
+        pytest.exit("ERROR: Unit tests are disabled. Please make sure that you're not trying to run unit tests on a production system!\n" \
+                    "You can enable unit tests by setting ENABLE_UNIT_TESTS=1.", returncode=1)
@@ -0,0 +1,16 @@
+import pytest
+from knowledge.graph_functions import add_study_data_to_knowledge_graph, promote_study_data
+from knowledge.tests.helpers import MAPPING_ROW, data_upload
+from ..helper import get_data_rows_for_codebook
+
+@pytest.mark.django_db
+def test_data_rows_of_participants_with_the_same_row_idx(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    promote_study_data(graph_id = study.id)
+    # the new participant of the update upload gets the row_idx of the first row of the upload
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["102", "50"]])], update = True)
+
+    header, *rows = get_data_rows_for_codebook(study.codebooks.get())
+
+    assert header == MAPPING_ROW
+    assert sorted(rows) == [["100", "35"], ["101", "18"], ["102", "50"]]
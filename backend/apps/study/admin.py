@@ -5,3 +5,4 @@ admin.site.register(Study)
 admin.site.register(CodeBook)
 admin.site.register(CodeBookColumn)
 admin.site.register(CodeBookRow)
+admin.site.register(DataIngestionJob)
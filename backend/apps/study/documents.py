@@ -0,0 +1,233 @@
+"""
+Loader for the detailed study view (DetailedStudySchema).
+Instead of one neomodel traversal per codebook, column, row and cell, the codebooks of a study are fetched with two Cypher projections
+(codebooks and items of all codebooks) and their answers as AnswerMatrix (see load_answer_matrices), and assembled into CodeBookDocuments
+that the schema reads directly.
+"""
+from neomodel import db
+
+from knowledge.anchors import get_study_node
+from knowledge.batch import relationship_definition
+from knowledge.blobs import load_blob
+from knowledge.models import LeafNode
+from ontology.models import OntologyNode
+from study.models import CodeBook
+
+from dataclasses import dataclass, field
+
+# Keys of the data quality check config (see schema.DataQualityCheckConfig) by the tag of their leaf below the Qualitaetspruefung node
+DATA_QUALITY_CHECK_CONFIG_KEYS = {
+    "LeereSpalten": "empty_columns",
+    "LeereZeilen": "empty_rows",
+    "LeereWerte": "empty_values",
+    "Datentyp": "value_type",
+    "Minimum": "value_range_min",
+    "Maximum": "value_range_max",
+    "BenoetigtQualitaetspruefung": "value_required",
+    "Auswahlmoeglichkeiten": "value_mapping",
+    "TrennzeichenAuswahlmoeglichkeiten": "mapping_separator",
+    "TrennzeichenAntworten": "answer_separator",
+}
+
+@dataclass
+class ColumnDocument:
+    idx: int
+    column_name: str
+    item: dict
+    linked_item: dict | None = None
+
+@dataclass
+class RowDocument:
+    idx: int
+    cells: list[str]
+
+@dataclass
+class AnswerMatrix:
+    """The current answer values of a codebook as dense row-major matrix, values[i][j] is the answer of row row_ids[i] in column column_ids[j]."""
+    row_ids: list[int] = field(default_factory = list)
+    column_ids: list[int] = field(default_factory = list)
+    values: list[list[str | None]] = field(default_factory = list)
+
+    def rows(self) -> list[RowDocument]:
+        # answers without current data are empty cells, so every row has a cell for each of column_ids
+        return [RowDocument(idx = row_id, cells = ["" if value is None else value for value in values]) for row_id, values in zip(self.row_ids, self.values)]
+
+@dataclass
+class CodeBookDocument:
+    id: int
+    name: str
+    data_quality_check_config: dict | None
+    # the CodeBookColumns of the relational codebook
+    meta: list = field(default_factory = list)
+    columns: list[ColumnDocument] = field(default_factory = list)
+    answers: AnswerMatrix = field(default_factory = AnswerMatrix)
+
+
+def leaf_value(variable: str) -> str:
+    """Cypher expression for the data of a leaf node: its inline value or the value and hash of its current data node (see data_value)."""
+    return (
+        f"CASE WHEN {variable}.value IS NOT NULL THEN {{value: {variable}.value}} "
+        f"ELSE head([({variable})-[c]->(d:DataNode) WHERE type(c) = $current | d {{.value, .value_hash}}]) END"
+    )
+
+
+def data_value(data: dict | None) -> str | None:
+    """Returns the value of a leaf_value projection, values in the blob store (see knowledge.blobs) are read here."""
+    if not data:
+        return None
+    if data.get("value") is None and data.get("value_hash"):
+        return load_blob(data["value_hash"])
+    return data.get("value")
+
+
+def load_answer_matrices(fragebogen_uuids: list[str]) -> dict[str, AnswerMatrix]:
+    """
+    Loads the answers of the Fragebogen nodes fragebogen_uuids by uuid with one query that returns (row, column, value) ordered by the
+    row_idx of their answer group and the col_idx of their item (or the ReihenID and SpaltenID of graphs without these properties).
+    The columns are the items of a Fragebogen, items without (current) answers are empty columns. The rows are the answer groups, answer
+    groups of different participants can share a row_idx after an update upload.
+    """
+    Fragebogen, Item, AnswerGroup = (OntologyNode.nodes.get(tag = tag).node_class for tag in ("Fragebogen", "Item", "Antwortgruppe"))
+    query = (
+        "UNWIND $fragebogen AS fragebogen_uuid "
+        "MATCH (fragebogen:KnowledgeNode {uuid: fragebogen_uuid})-[:$($hat_item)]->(item:$($item_label)) "
+        "WITH fragebogen_uuid, fragebogen, item, CASE WHEN item.col_idx IS NOT NULL THEN item.col_idx "
+        f"ELSE toInteger(head([(item)-[s]->(leaf:LeafNode) WHERE type(s) = $hat_spaltenid | {leaf_value('leaf')}]).value) END AS col_idx "
+        "OPTIONAL MATCH (item)-[:$($item_hat_antwort)]->(answer)<-[:$($hat_antwort)]-(answer_group:$($answer_group_label))<-[:$($hat_antwortgruppe)]-(fragebogen) "
+        "OPTIONAL MATCH (answer)-[:$($current)]->(data:DataNode) "
+        "WITH fragebogen_uuid, col_idx, answer_group, data, CASE WHEN answer_group IS NULL THEN null "
+        "WHEN answer_group.row_idx IS NOT NULL THEN answer_group.row_idx "
+        f"ELSE toInteger(head([(answer_group)-[i]->(leaf:LeafNode) WHERE type(i) = $hat_reihenid | {leaf_value('leaf')}]).value) END AS row_idx "
+        "RETURN fragebogen_uuid, answer_group.uuid, row_idx, col_idx, data.value, data.value_hash "
+        "ORDER BY fragebogen_uuid, row_idx, answer_group.uuid, col_idx"
+    )
+    results, _ = db.cypher_query(query, {
+        "fragebogen": fragebogen_uuids,
+        "current": relationship_definition(LeafNode, "current_data")["relation_type"],
+        "hat_item": relationship_definition(Fragebogen, "hat_item")["relation_type"],
+        "hat_antwortgruppe": relationship_definition(Fragebogen, "hat_antwortgruppe")["relation_type"],
+        "hat_spaltenid": relationship_definition(Item, "hat_spaltenid")["relation_type"],
+        "item_hat_antwort": relationship_definition(Item, "hat_antwort")["relation_type"],
+        "hat_reihenid": relationship_definition(AnswerGroup, "hat_reihenid")["relation_type"],
+        "hat_antwort": relationship_definition(AnswerGroup, "hat_antwort")["relation_type"],
+        "item_label": Item.__label__,
+        "answer_group_label": AnswerGroup.__label__,
+    })
+
+    columns = {uuid: set() for uuid in fragebogen_uuids}
+    # the cells of the answer groups by col_idx and the row_idx of the answer groups
+    cells = {uuid: {} for uuid in fragebogen_uuids}
+    row_ids = {uuid: {} for uuid in fragebogen_uuids}
+    for fragebogen, answer_group, row_idx, col_idx, value, value_hash in results:
+        columns[fragebogen].add(col_idx)
+        # items without answers only add their column, answers without current data are empty cells
+        if answer_group is None:
+            continue
+        # the results are ordered, so the answer groups are added in the order of their row_idx
+        row_ids[fragebogen].setdefault(answer_group, row_idx)
+        row = cells[fragebogen].setdefault(answer_group, {})
+        if value is not None or value_hash is not None or col_idx not in row:
+            row[col_idx] = data_value({"value": value, "value_hash": value_hash})
+
+    matrices = {}
+    for fragebogen, rows in cells.items():
+        column_ids = sorted(columns[fragebogen], key = lambda col_idx: (col_idx is None, col_idx))
+        matrices[fragebogen] = AnswerMatrix(
+            row_ids = list(row_ids[fragebogen].values()),
+            column_ids = column_ids,
+            values = [[row.get(col_idx) for col_idx in column_ids] for row in rows.values()],
+        )
+    return matrices
+
+
+def load_items(parameters: dict, fragebogen_uuids: list[str] | None = None, item_uuids: list[str] | None = None) -> dict[str, tuple[str | None, int | None, dict]]:
+    """
+    Loads the items of the Fragebogen nodes fragebogen_uuids and the items item_uuids by uuid with their column id and metadata.
+    Returns (fragebogen uuid, column id, metadata by tag) by item uuid, the fragebogen uuid of items loaded by uuid is None.
+    """
+    results, _ = db.cypher_query(
+        "CALL { "
+        "  UNWIND $fragebogen AS fragebogen_uuid "
+        "  MATCH (fragebogen:KnowledgeNode {uuid: fragebogen_uuid})-[r]->(item:KnowledgeNode) WHERE type(r) = $hat_item "
+        "  RETURN fragebogen_uuid, item "
+        "  UNION "
+        "  MATCH (item:KnowledgeNode) WHERE item.uuid IN $items "
+        "  RETURN null AS fragebogen_uuid, item "
+        "} "
+        "OPTIONAL MATCH (item)-[m]->(meta) WHERE type(m) = $hat_metadaten "
+        "RETURN fragebogen_uuid, item.uuid, "
+        f"coalesce(item.col_idx, toInteger(head([(item)-[s]->(leaf:LeafNode) WHERE type(s) = $hat_spaltenid | {leaf_value('leaf')}]).value)), "
+        f"[(meta)-->(leaf:LeafNode) | [leaf.tag, {leaf_value('leaf')}]]",
+        {**parameters, "fragebogen": fragebogen_uuids or [], "items": item_uuids or []}
+    )
+    return {
+        uuid: (fragebogen, col_idx, {"id": uuid, **{tag: data_value(data) for tag, data in metadata or []}})
+        for fragebogen, uuid, col_idx, metadata in results
+    }
+
+
+def load_code_book_documents(study_id: int) -> list[CodeBookDocument]:
+    """Loads all codebooks of the graph of a study with their columns and rows, ordered like the graph (by SpaltenID and ReihenID)."""
+    studie = get_study_node(study_id)
+    if studie is None:
+        return []
+
+    classes = {tag: OntologyNode.nodes.get(tag = tag).node_class for tag in ("Studie", "Datenerhebung", "Fragebogen", "Item", "Antwortgruppe")}
+    Fragebogen, Item = classes["Fragebogen"], classes["Item"]
+    parameters = {
+        "current": relationship_definition(LeafNode, "current_data")["relation_type"],
+        "hat_datenerhebung": relationship_definition(classes["Studie"], "hat_datenerhebung")["relation_type"],
+        "hat_fragebogen": relationship_definition(classes["Datenerhebung"], "hat_fragebogen")["relation_type"],
+        "hat_qualitaetspruefung": relationship_definition(Fragebogen, "hat_qualitaetspruefung")["relation_type"],
+        "hat_item": relationship_definition(Fragebogen, "hat_item")["relation_type"],
+        "hat_metadaten": relationship_definition(Item, "hat_metadaten")["relation_type"],
+        "hat_spaltenid": relationship_definition(Item, "hat_spaltenid")["relation_type"],
+    }
+
+    # 1. codebooks with their own leaves (FragebogenID, Fragebogenname) and the leaves of their data quality check
+    results, _ = db.cypher_query(
+        "MATCH (studie:KnowledgeNode {uuid: $studie})-[r1]->()-[r2]->(fragebogen:KnowledgeNode) "
+        "WHERE type(r1) = $hat_datenerhebung AND type(r2) = $hat_fragebogen "
+        f"RETURN fragebogen.uuid, [(fragebogen)-->(leaf:LeafNode) | [leaf.tag, {leaf_value('leaf')}]], "
+        f"[(fragebogen)-[q]->()-->(leaf:LeafNode) WHERE type(q) = $hat_qualitaetspruefung | [leaf.tag, {leaf_value('leaf')}]]",
+        {**parameters, "studie": studie.uuid}
+    )
+    codebooks = {}
+    for fragebogen, leaves, config in results:
+        leaves = {tag: data_value(data) for tag, data in leaves}
+        config = {DATA_QUALITY_CHECK_CONFIG_KEYS[tag]: data_value(data) for tag, data in config if tag in DATA_QUALITY_CHECK_CONFIG_KEYS}
+        codebooks[fragebogen] = CodeBookDocument(id = int(leaves.get("FragebogenID")), name = leaves.get("Fragebogenname"),
+                                                 data_quality_check_config = config or None)
+
+    # 2. items with their column id and metadata, linked items of other codebooks are loaded afterwards by their uuid
+    items = load_items(parameters, fragebogen_uuids = list(codebooks))
+    linked_uuids = {metadata["VerknuepftesItemID"] for _, _, metadata in items.values() if metadata.get("VerknuepftesItemID")}
+    linked_items = {uuid: metadata for uuid, (_, _, metadata) in items.items() if uuid in linked_uuids}
+    if linked_uuids - set(linked_items):
+        linked = load_items(parameters, item_uuids = list(linked_uuids - set(linked_items)))
+        linked_items.update({uuid: metadata for uuid, (_, _, metadata) in linked.items()})
+
+    for uuid, (fragebogen, col_idx, metadata) in items.items():
+        codebooks[fragebogen].columns.append(ColumnDocument(
+            idx = col_idx,
+            column_name = metadata.get("Feldname"),
+            item = metadata,
+            linked_item = linked_items.get(metadata.get("VerknuepftesItemID")),
+        ))
+
+    # 3. the answers of all codebooks, see CodeBook.resolve_rows
+    for fragebogen, answers in load_answer_matrices(list(codebooks)).items():
+        codebooks[fragebogen].answers = answers
+
+    # the codebook columns of the relational codebooks are prefetched with their rows, see study.helper.get_rows
+    documents = {codebook.id: codebook for codebook in codebooks.values()}
+    for relational_codebook in CodeBook.objects.filter(id__in = list(documents)).prefetch_related("columns", "rows"):
+        rows = list(relational_codebook.rows.all())
+        meta = list(relational_codebook.columns.all())
+        for column in meta:
+            column._rows = [row.cells[column.idx] for row in rows]
+        documents[relational_codebook.id].meta = meta
+
+    for codebook in codebooks.values():
+        codebook.columns.sort(key = lambda column: column.idx)
+    return list(codebooks.values())
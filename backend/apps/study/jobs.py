@@ -0,0 +1,121 @@
+"""
+Background worker for asynchronous study data uploads and the materialization and promotion of accepted study data.
+Jobs are stored in the DataIngestionJob table and run by a dedicated worker process (manage.py run_ingestion_worker, started next to
+the server by scripts/entrypoint.sh). It claims queued jobs with SELECT ... FOR UPDATE SKIP LOCKED, so several workers can share the
+table without running a job twice, and polls for new jobs every settings.DATA_INGESTION_POLL_INTERVAL seconds.
+While a job runs, its updated_at is refreshed as heartbeat. Jobs of a process that died keep their RUNNING status, the poll loop
+queues them again once their heartbeat is older than settings.DATA_INGESTION_JOB_TIMEOUT and they are continued from their checkpoints.
+"""
+from django.conf import settings
+from django.db import connections, transaction as django_transaction
+from django.utils import timezone
+
+from api import schema
+from knowledge.models import load_all_knowledge_node_classes
+from reviewer.helper import create_data_upload_review
+from knowledge.graph_functions import promote_study_data
+from study.models import DataIngestionJob, JobKind, JobStatus, Study
+from authentication.models import CustomUser
+from study.staging import materialize_staged_data, store_study_data
+
+from datetime import timedelta
+import threading
+import time
+import logging
+logger = logging.getLogger(__name__)
+
+def queue_promotion(study: Study, reviewer: CustomUser) -> DataIngestionJob:
+    """
+    Queues the promotion of the accepted data of a study. The promotion commits in batches after the review is committed, as job its
+    progress and a failure are recorded and an interrupted promotion is continued like other jobs.
+    """
+    return DataIngestionJob.objects.create(study = study, submitter = reviewer, kind = JobKind.PROMOTION)
+
+def queue_materialization(study: Study, reviewer: CustomUser) -> DataIngestionJob:
+    """Queues writing the accepted staged data of a study to the graph, which is promoted afterwards (see study.staging.materialize_staged_data)."""
+    return DataIngestionJob.objects.create(study = study, submitter = reviewer, kind = JobKind.MATERIALIZATION)
+
+def run_ingestion_worker(poll_interval: float | None = None) -> None:
+    """
+    Runs queued jobs until the process is stopped. Stale jobs are queued again on every poll, so jobs of a worker that died
+    are continued by the others. Errors of the poll loop (e.g. a lost database connection) are logged and retried after the interval.
+    """
+    poll_interval = poll_interval if poll_interval is not None else settings.DATA_INGESTION_POLL_INTERVAL
+    while True:
+        try:
+            requeue_stale_jobs()
+            while job := claim_next_job():
+                run_job(job)
+        except Exception:
+            logger.exception("Data ingestion worker failed")
+            connections.close_all()
+        time.sleep(poll_interval)
+
+def requeue_stale_jobs() -> int:
+    """Queues running jobs without a recent heartbeat again, their process died. Returns the number of queued jobs."""
+    stale = timezone.now() - timedelta(seconds = settings.DATA_INGESTION_JOB_TIMEOUT)
+    with django_transaction.atomic():
+        jobs = list(DataIngestionJob.objects.select_for_update(skip_locked = True).filter(status = JobStatus.RUNNING, updated_at__lt = stale))
+        for job in jobs:
+            logger.warning(f"Data ingestion job {job.id} has no heartbeat since {job.updated_at}, queueing it again")
+            job.status = JobStatus.QUEUED
+            # the committed chunks of the interrupted run are skipped, see knowledge.ingestion checkpoints
+            job.resume = True
+            job.errors = [*job.errors, f"Interrupted at {job.rows_processed} rows, continued by another run"]
+            job.save(update_fields = ["status", "resume", "errors", "updated_at"])
+    return len(jobs)
+
+def run_heartbeat(job: DataIngestionJob, stop: threading.Event) -> None:
+    try:
+        while not stop.wait(settings.DATA_INGESTION_JOB_TIMEOUT / 3):
+            DataIngestionJob.objects.filter(id = job.id).update(updated_at = timezone.now())
+    finally:
+        connections.close_all()
+
+def claim_next_job() -> DataIngestionJob | None:
+    with django_transaction.atomic():
+        job = DataIngestionJob.objects.select_for_update(skip_locked = True).filter(status = JobStatus.QUEUED).order_by("created_at").first()
+        if job:
+            job.status = JobStatus.RUNNING
+            job.started_at = timezone.now()
+            job.save(update_fields = ["status", "started_at"])
+        return job
+
+def run_job(job: DataIngestionJob) -> None:
+    """
+    Runs a job: an ingestion job writes its data to the knowledge graph and creates the data review once all rows are committed,
+    a materialization job writes the accepted staged data of its study to the graph and promotes it and a promotion job promotes the
+    accepted data of its study. Progress is saved outside of any transaction, so the status endpoint
+    sees it while the job is running.
+    """
+    def progress(rows: int) -> None:
+        job.rows_processed += rows
+        DataIngestionJob.objects.filter(id = job.id).update(rows_processed = job.rows_processed, updated_at = timezone.now())
+    
+    stop_heartbeat = threading.Event()
+    threading.Thread(target = run_heartbeat, args = (job, stop_heartbeat), name = f"data-ingestion-heartbeat-{job.id}", daemon = True).start()
+    try:
+        load_all_knowledge_node_classes()
+        match job.kind:
+            case JobKind.PROMOTION:
+                # the promotion commits in batches, so it runs outside of db.transaction
+                promote_study_data(graph_id = job.study_id, progress = progress)
+            case JobKind.MATERIALIZATION:
+                # commits per chunk and promotes in batches, so it runs outside of db.transaction as well
+                materialize_staged_data(job.study_id, progress = progress)
+            case _:
+                data = [schema.StudyDataSubmissionSchema(**codebook_data) for codebook_data in job.data]
+                # every chunk is committed in its own transaction together with its checkpoint, see knowledge.ingestion.chunk_transaction
+                store_study_data(job.study, job.submitter, data, resume = job.resume, update = job.update, progress = progress)
+                with django_transaction.atomic():
+                    create_data_upload_review(job.study, job.submitter)
+        job.status = JobStatus.DONE
+    except Exception as error:
+        logger.exception(f"{job.kind.capitalize()} job {job.id} failed")
+        job.status = JobStatus.FAILED
+        job.errors = [*job.errors, str(error)]
+    finally:
+        stop_heartbeat.set()
+    
+    job.finished_at = timezone.now()
+    job.save(update_fields = ["status", "errors", "finished_at", "rows_processed"])
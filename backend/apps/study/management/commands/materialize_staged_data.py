@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from study.staging import materialize_staged_data
+
+class Command(BaseCommand):
+    help = "Writes the staged data of an accepted study to the knowledge graph and promotes it. Continues an interrupted materialization."
+
+    def add_arguments(self, parser):
+        parser.add_argument("study_id", type=int, help="Id of the study")
+
+    def handle(self, *args, **kwargs):
+        study_id = kwargs["study_id"]
+        self.stdout.write(
+            self.style.NOTICE(f'Materializing the staged data of study {study_id}...')
+        )
+        materialize_staged_data(study_id)
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully materialized the staged data of study {study_id}.')
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from study.jobs import run_ingestion_worker
+
+class Command(BaseCommand):
+    help = "Runs queued data ingestion, materialization and promotion jobs until it is stopped. Continues jobs of workers that died."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between two polls for queued jobs (default: settings.DATA_INGESTION_POLL_INTERVAL)")
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(
+            self.style.NOTICE('Starting the data ingestion worker...')
+        )
+        run_ingestion_worker(poll_interval = kwargs["poll_interval"])
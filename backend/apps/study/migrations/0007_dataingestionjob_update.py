@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0006_dataingestionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataingestionjob',
+            name='update',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0007_dataingestionjob_update'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StagedDataUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('header', models.JSONField()),
+                ('data_quality_check_config', models.JSONField()),
+                ('update', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('codebook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_uploads', to='study.codebook')),
+                ('study', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_uploads', to='study.study')),
+                ('submitter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StagedDataRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_id', models.IntegerField()),
+                ('cells', models.JSONField()),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='study.stageddataupload')),
+            ],
+            options={
+                'ordering': ['upload', 'row_id'],
+                'constraints': [models.UniqueConstraint(fields=('upload', 'row_id'), name='unique_staged_data_row')],
+            },
+        ),
+    ]
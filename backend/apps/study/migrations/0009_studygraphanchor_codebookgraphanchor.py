@@ -0,0 +1,32 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0008_stageddataupload_stageddatarow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeBookGraphAnchor',
+            fields=[
+                ('codebook', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='graph_anchor', serialize=False, to='study.codebook')),
+                ('fragebogen_uuid', models.CharField(max_length=255)),
+                ('fragebogen_element_id', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudyGraphAnchor',
+            fields=[
+                ('study', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='graph_anchor', serialize=False, to='study.study')),
+                ('studie_uuid', models.CharField(max_length=255)),
+                ('studie_element_id', models.CharField(max_length=255)),
+                ('datenerhebung_uuid', models.CharField(blank=True, max_length=255, null=True)),
+                ('datenerhebung_element_id', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0009_studygraphanchor_codebookgraphanchor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyStatistics',
+            fields=[
+                ('graph_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('questionnaires', models.PositiveIntegerField(default=0)),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('participants', models.PositiveIntegerField(default=0)),
+                ('answers', models.PositiveIntegerField(default=0)),
+                ('verified_answers', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'study statistics',
+            },
+        ),
+    ]
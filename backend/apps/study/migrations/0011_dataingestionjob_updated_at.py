@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0010_studystatistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataingestionjob',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
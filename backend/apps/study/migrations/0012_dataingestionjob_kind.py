@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0011_dataingestionjob_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataingestionjob',
+            name='kind',
+            field=models.CharField(choices=[('INGESTION', 'INGESTION'), ('PROMOTION', 'PROMOTION')], default='INGESTION', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='dataingestionjob',
+            name='data',
+            field=models.JSONField(default=list),
+        ),
+    ]
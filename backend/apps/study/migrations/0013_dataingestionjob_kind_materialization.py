@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0012_dataingestionjob_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataingestionjob',
+            name='kind',
+            field=models.CharField(choices=[('INGESTION', 'INGESTION'), ('PROMOTION', 'PROMOTION'), ('MATERIALIZATION', 'MATERIALIZATION')], default='INGESTION', max_length=20),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 import pandas as pd
 from typing import List
 
@@ -60,3 +61,117 @@ class CodeBookRow(models.Model):
 
     def __str__(self):
         return f"Row in {self.codebook.name}"
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = 'QUEUED', 'QUEUED'
+    RUNNING = 'RUNNING', 'RUNNING'
+    DONE = 'DONE', 'DONE'
+    FAILED = 'FAILED', 'FAILED'
+
+class JobKind(models.TextChoices):
+    # writes uploaded data to the graph (or the staging tables)
+    INGESTION = 'INGESTION', 'INGESTION'
+    # promotes the accepted data of a study, see knowledge.graph_functions.promote_study_data
+    PROMOTION = 'PROMOTION', 'PROMOTION'
+    # writes the accepted staged data of a study to the graph and promotes it, see study.staging.materialize_staged_data
+    MATERIALIZATION = 'MATERIALIZATION', 'MATERIALIZATION'
+
+class DataIngestionJob(models.Model):
+    """Study data upload or promotion of accepted data that is run by the background worker in study.jobs."""
+    study = models.ForeignKey(Study, related_name='ingestion_jobs', on_delete=models.CASCADE)
+    submitter = models.ForeignKey(CustomUser, related_name='ingestion_jobs', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=JobKind.choices, default=JobKind.INGESTION)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    data = models.JSONField(default=list)
+    resume = models.BooleanField(default=False)
+    update = models.BooleanField(default=False)
+    rows_total = models.IntegerField(default=0)
+    rows_processed = models.IntegerField(default=0)
+    errors = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # heartbeat of the worker running the job, jobs whose heartbeat is too old are queued again (see study.jobs.requeue_stale_jobs)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def rows_per_second(self) -> float | None:
+        if not self.started_at:
+            return None
+        seconds = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return self.rows_processed / seconds if seconds > 0 else None
+
+    def __str__(self):
+        return f"Data ingestion job {self.id} for {self.study.name}"
+
+
+class StagedDataUpload(models.Model):
+    """
+    Data upload of a codebook that waits for its review in the staging tables instead of the knowledge graph, see study.staging.
+    header is the mapping row of the upload (the field names), its rows are stored as StagedDataRow.
+    """
+    study = models.ForeignKey(Study, related_name='staged_uploads', on_delete=models.CASCADE)
+    codebook = models.ForeignKey(CodeBook, related_name='staged_uploads', on_delete=models.CASCADE)
+    submitter = models.ForeignKey(CustomUser, related_name='staged_uploads', on_delete=models.CASCADE)
+    header = models.JSONField()
+    data_quality_check_config = models.JSONField()
+    update = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Staged data of {self.codebook.name}"
+
+class StagedDataRow(models.Model):
+    """Data row (answer group) of a StagedDataUpload with its cells in the column order of the upload."""
+    class Meta:
+        ordering = ["upload", "row_id"]
+        constraints = [models.UniqueConstraint(fields=["upload", "row_id"], name="unique_staged_data_row")]
+
+    upload = models.ForeignKey(StagedDataUpload, related_name='rows', on_delete=models.CASCADE)
+    row_id = models.IntegerField()
+    cells = models.JSONField()
+
+    def __str__(self):
+        return f"Staged row {self.row_id} of {self.upload.codebook.name}"
+
+
+class StudyGraphAnchor(models.Model):
+    """Studie and Datenerhebung node of the knowledge graph of a study, recorded by the graph build (see knowledge.anchors)."""
+    study = models.OneToOneField(Study, primary_key=True, related_name='graph_anchor', on_delete=models.CASCADE)
+    studie_uuid = models.CharField(max_length=255)
+    studie_element_id = models.CharField(max_length=255)
+    datenerhebung_uuid = models.CharField(max_length=255, null=True, blank=True)
+    datenerhebung_element_id = models.CharField(max_length=255, null=True, blank=True)
+
+    def __str__(self):
+        return f"Graph anchor of {self.study.name}"
+
+class CodeBookGraphAnchor(models.Model):
+    """Fragebogen node of a codebook in the knowledge graph of its study, recorded by the graph build (see knowledge.anchors)."""
+    codebook = models.OneToOneField(CodeBook, primary_key=True, related_name='graph_anchor', on_delete=models.CASCADE)
+    fragebogen_uuid = models.CharField(max_length=255)
+    fragebogen_element_id = models.CharField(max_length=255)
+
+    def __str__(self):
+        return f"Graph anchor of {self.codebook.name}"
+
+
+class StudyStatistics(models.Model):
+    """
+    Node counts of a study graph, kept up to date by the graph writes (see knowledge.statistics) so lists and system stats don't have to scan the graph.
+    Keyed by graph_id instead of the study, because graphs like the example graph have no study.
+    """
+    graph_id = models.IntegerField(primary_key=True)
+    questionnaires = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    participants = models.PositiveIntegerField(default=0)
+    answers = models.PositiveIntegerField(default=0)
+    verified_answers = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "study statistics"
+
+    def __str__(self):
+        return f"Statistics of study graph {self.graph_id}"
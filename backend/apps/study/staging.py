@@ -0,0 +1,114 @@
+"""
+Staging of uploaded study data until its review is accepted.
+With settings.DATA_STAGING, uploads are stored as StagedDataUpload with one StagedDataRow per data row instead of being written
+to the knowledge graph as in review data. The review reads the staged rows, accepting the review writes them to the graph
+(see materialize_staged_data) and declining it or asking for modifications discards them.
+"""
+from django.conf import settings
+from django.db import transaction as django_transaction
+
+from api import schema
+from authentication.models import CustomUser
+from knowledge.graph_functions import add_study_data_to_knowledge_graph, has_study_nodes, promote_study_data
+from knowledge.ingestion import DataFileSubmission, chunked, has_checkpoints, iter_data_rows
+from knowledge.models import load_all_knowledge_node_classes
+from study.models import CodeBook, StagedDataRow, StagedDataUpload, Study
+
+from typing import Callable, Iterator
+import logging
+logger = logging.getLogger(__name__)
+
+class StagedDataRows:
+    """Replacement for StudyDataSubmissionSchema.values that yields the mapping row and the rows of a StagedDataUpload from the database."""
+    def __init__(self, upload: StagedDataUpload):
+        self.upload = upload
+
+    def __iter__(self) -> Iterator[list[str]]:
+        yield self.upload.header
+        for cells in self.upload.rows.order_by("row_id").values_list("cells", flat = True).iterator(chunk_size = settings.DATA_INGESTION_CHUNK_SIZE):
+            yield cells
+
+    def __getitem__(self, index: int) -> list[str]:
+        if index != 0:
+            raise IndexError("Only the mapping row of staged data can be accessed by index")
+        return self.upload.header
+
+    def __len__(self) -> int:
+        return 1 + self.upload.rows.count()
+
+
+def has_staged_data(study: Study) -> bool:
+    return study.staged_uploads.exists()
+
+
+def store_study_data(study: Study, submitter: CustomUser, data: list, resume: bool = False, update: bool = False,
+                     progress: Callable[[int], None] | None = None) -> None:
+    """Stores uploaded study data in the staging tables if settings.DATA_STAGING is enabled and in the knowledge graph otherwise."""
+    if settings.DATA_STAGING:
+        stage_study_data(study, submitter, data, update, progress)
+    else:
+        add_study_data_to_knowledge_graph(study_id = study.id, data = data, resume = resume, update = update, progress = progress)
+
+
+def stage_study_data(study: Study, submitter: CustomUser, data: list, update: bool = False, progress: Callable[[int], None] | None = None) -> None:
+    """Stores the data of every codebook as StagedDataUpload, replacing staged data of the same codebook. Rows are inserted in chunks."""
+    for codebook_data in data:
+        codebook = CodeBook.objects.get(id = codebook_data.code_book_id, study = study)
+        StagedDataUpload.objects.filter(codebook = codebook).delete()
+        upload = StagedDataUpload.objects.create(
+            study = study,
+            codebook = codebook,
+            submitter = submitter,
+            header = list(codebook_data.values[0]),
+            data_quality_check_config = codebook_data.data_quality_check_config.dict(),
+            update = update,
+        )
+        for chunk in chunked(iter_data_rows(codebook_data)):
+            StagedDataRow.objects.bulk_create([StagedDataRow(upload = upload, row_id = row_id, cells = list(row)) for row_id, row in chunk])
+            if progress:
+                progress(len(chunk))
+
+
+def get_staged_data_rows(codebook: CodeBook) -> list[list[str]] | None:
+    """Returns the mapping row and the data rows of the staged upload of codebook, or None if it has no staged data."""
+    upload = codebook.staged_uploads.first()
+    if upload is None:
+        return None
+    return list(StagedDataRows(upload))
+
+
+def discard_staged_data(study: Study) -> None:
+    StagedDataUpload.objects.filter(study = study).delete()
+
+
+def materialize_staged_data(study_id: int, progress: Callable[[int], None] | None = None) -> None:
+    """
+    Writes the staged data of an accepted study to the knowledge graph, deletes it from the staging tables and promotes it to current data.
+    Runs outside of the request transaction as job (see study.jobs.queue_materialization). An interrupted write is continued by calling this
+    again (or with "manage.py materialize_staged_data <study id>"), rows that are already in the graph are upserted instead of written twice.
+    A failed promotion is continued with promote_study_data.
+    """
+    study = Study.objects.get(id = study_id)
+    uploads = list(study.staged_uploads.all())
+    if not uploads:
+        return
+
+    load_all_knowledge_node_classes()
+    data = [
+        DataFileSubmission(
+            code_book_id = upload.codebook_id,
+            data_quality_check_config = schema.DataQualityCheckConfig(**upload.data_quality_check_config),
+            values = StagedDataRows(upload),
+        )
+        for upload in uploads
+    ]
+    # answers in the graph are either accepted data of an update or the rows of an interrupted materialization
+    update = any(upload.update for upload in uploads) or has_study_nodes(study.id, "Antwort")
+    # every chunk is committed with its checkpoint, see knowledge.ingestion.chunk_transaction
+    add_study_data_to_knowledge_graph(study_id = study.id, data = data, resume = has_checkpoints(study.id), update = update, progress = progress)
+
+    with django_transaction.atomic():
+        discard_staged_data(study)
+    logger.info(f"Materialized the staged data of study {study.id} ({len(uploads)} codebooks)")
+
+    promote_study_data(graph_id = study.id, progress = progress)
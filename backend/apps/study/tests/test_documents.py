@@ -0,0 +1,60 @@
+import pytest
+from neomodel.sync_.core import db
+from knowledge.graph_functions import add_study_data_to_knowledge_graph, promote_study_data
+from knowledge.tests.helpers import data_upload
+from ..documents import load_answer_matrices, load_code_book_documents
+from ..models import CodeBookGraphAnchor
+
+def fragebogen_uuid(study):
+    return CodeBookGraphAnchor.objects.get(codebook__study = study).fragebogen_uuid
+
+@pytest.mark.django_db
+def test_code_book_documents_of_a_study(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"]])])
+    promote_study_data(graph_id = study.id)
+
+    [document] = load_code_book_documents(study.id)
+
+    assert (document.id, document.name) == (study.codebooks.get().id, "Testfragebogen")
+    assert [(column.idx, column.column_name) for column in document.columns] == [(0, "Trustcenter-ID"), (1, "Alter")]
+    assert document.data_quality_check_config["empty_values"] == "True"
+    assert [column.header for column in document.meta] == ["Feldname"]
+    assert [row.cells for row in document.answers.rows()] == [["100", "35"]]
+
+@pytest.mark.django_db
+def test_studies_without_graph_have_no_code_book_documents(study):
+    assert load_code_book_documents(study.id + 1) == []
+
+@pytest.mark.django_db
+def test_answer_matrix_has_a_column_for_each_item(study):
+    answers = load_answer_matrices([fragebogen_uuid(study)])[fragebogen_uuid(study)]
+
+    assert answers.column_ids == [0, 1]
+    assert answers.rows() == []
+
+@pytest.mark.django_db
+def test_answer_matrix_keeps_columns_without_current_answers(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    promote_study_data(graph_id = study.id)
+    # the answers of "Alter" lose their current data
+    db.cypher_query(
+        "MATCH (:Item {graph_id: $graph_id, col_idx: 1})-->(answer:Antwort)-[c:CURRENT]->(:DataNode) DELETE c",
+        {"graph_id": study.id}
+    )
+
+    answers = load_answer_matrices([fragebogen_uuid(study)])[fragebogen_uuid(study)]
+
+    assert answers.column_ids == [0, 1]
+    assert [row.cells for row in answers.rows()] == [["100", ""], ["101", ""]]
+
+@pytest.mark.django_db
+def test_answer_matrix_has_a_row_for_each_answer_group(study):
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["100", "35"], ["101", "18"]])])
+    promote_study_data(graph_id = study.id)
+    # the new participant gets the row_idx of the first row of the update upload
+    add_study_data_to_knowledge_graph(study_id = study.id, data = [data_upload(study, [["102", "50"]])], update = True)
+    promote_study_data(graph_id = study.id)
+
+    answers = load_answer_matrices([fragebogen_uuid(study)])[fragebogen_uuid(study)]
+
+    assert sorted(row.cells for row in answers.rows()) == [["100", "35"], ["101", "18"], ["102", "50"]]
@@ -0,0 +1,71 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from knowledge.tests.helpers import data_upload, answer_values
+from reviewer.models import Review, UploadTypeChoices
+from ..jobs import claim_next_job, requeue_stale_jobs, run_job
+from ..models import DataIngestionJob, JobStatus
+
+def queue_upload(study, rows):
+    return DataIngestionJob.objects.create(
+        study = study,
+        submitter = study.submitter,
+        data = [data_upload(study, rows).dict()],
+        rows_total = len(rows),
+    )
+
+@pytest.mark.django_db
+def test_claim_next_job_takes_the_oldest_queued_job(study):
+    first = queue_upload(study, [["100", "35"]])
+    second = queue_upload(study, [["101", "18"]])
+
+    assert claim_next_job().id == first.id
+    assert claim_next_job().id == second.id
+    assert claim_next_job() is None
+
+    first.refresh_from_db()
+    assert first.status == JobStatus.RUNNING
+    assert first.started_at is not None
+
+@pytest.mark.django_db
+def test_stale_jobs_are_queued_again(study):
+    stale = queue_upload(study, [["100", "35"]])
+    running = queue_upload(study, [["101", "18"]])
+    DataIngestionJob.objects.update(status = JobStatus.RUNNING)
+    # updated_at is the heartbeat, queryset updates don't touch it
+    DataIngestionJob.objects.filter(id = stale.id).update(updated_at = timezone.now() - timedelta(days = 1))
+
+    assert requeue_stale_jobs() == 1
+
+    stale.refresh_from_db()
+    running.refresh_from_db()
+    assert stale.status == JobStatus.QUEUED
+    assert stale.resume
+    assert running.status == JobStatus.RUNNING
+
+@pytest.mark.django_db
+def test_run_job_writes_the_upload_and_creates_its_review(study):
+    queue_upload(study, [["100", "35"], ["101", "18"]])
+    job = claim_next_job()
+
+    run_job(job)
+
+    job.refresh_from_db()
+    assert job.status == JobStatus.DONE
+    assert job.rows_processed == 2
+    assert job.finished_at is not None
+    assert answer_values(study.id, "IN_REVIEW") == ["100", "101", "18", "35"]
+    assert Review.objects.filter(study = study, upload_type = UploadTypeChoices.UPLOAD_DATA.value).exists()
+
+@pytest.mark.django_db
+def test_failed_job_records_its_error(study):
+    job = queue_upload(study, [["100", "35"]])
+    job.data[0]["values"][0] = ["Trustcenter-ID", "Unbekannt"]
+    job.save()
+
+    run_job(claim_next_job())
+
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED
+    assert job.errors
+    assert not Review.objects.filter(study = study).exists()
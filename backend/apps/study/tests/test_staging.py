@@ -0,0 +1,35 @@
+import pytest
+from django.test import override_settings
+from knowledge.graph_functions import has_study_nodes
+from knowledge.tests.helpers import MAPPING_ROW, answer_values, data_upload
+from reviewer.helper import get_data_rows_for_codebook
+from ..staging import discard_staged_data, get_staged_data_rows, has_staged_data, materialize_staged_data, store_study_data
+
+@pytest.mark.django_db
+@override_settings(DATA_STAGING = True)
+def test_uploads_are_staged_instead_of_written(study):
+    store_study_data(study, study.submitter, [data_upload(study, [["100", "35"]])])
+
+    assert not has_study_nodes(study.id, "Antwort")
+    # the feedback of the review shows the staged rows
+    assert get_data_rows_for_codebook(study.codebooks.get()) == [MAPPING_ROW, ["100", "35"]]
+
+@pytest.mark.django_db
+@override_settings(DATA_STAGING = True)
+def test_a_new_upload_replaces_the_staged_one(study):
+    store_study_data(study, study.submitter, [data_upload(study, [["100", "35"], ["101", "18"]])])
+
+    store_study_data(study, study.submitter, [data_upload(study, [["102", "50"]])])
+
+    assert get_staged_data_rows(study.codebooks.get()) == [MAPPING_ROW, ["102", "50"]]
+
+@pytest.mark.django_db
+@override_settings(DATA_STAGING = True)
+def test_discarded_data_is_not_materialized(study):
+    store_study_data(study, study.submitter, [data_upload(study, [["100", "35"]])])
+
+    discard_staged_data(study)
+    materialize_staged_data(study.id)
+
+    assert not has_staged_data(study)
+    assert answer_values(study.id, "CURRENT") == []
@@ -159,6 +159,44 @@ DATABASES = {
 # Neo4j
 config.DATABASE_URL = os.environ.get("NEO4J_BOLT_URL")
 
+# Data ingestion
+# Number of answer groups that are written and committed together when study data is uploaded
+DATA_INGESTION_CHUNK_SIZE = int(os.environ.get("DATA_INGESTION_CHUNK_SIZE", 1000))
+# Number of worker processes that write large uploads in parallel, 1 (the default) disables the process pool.
+# Every web or job process starts its own pool, so keep it small.
+DATA_INGESTION_WORKERS = int(os.environ.get("DATA_INGESTION_WORKERS", 1))
+# Seconds after which a running data ingestion job without heartbeat is considered dead and queued again
+DATA_INGESTION_JOB_TIMEOUT = int(os.environ.get("DATA_INGESTION_JOB_TIMEOUT", 300))
+# Seconds the ingestion worker (manage.py run_ingestion_worker) waits before it looks for queued jobs again
+DATA_INGESTION_POLL_INTERVAL = float(os.environ.get("DATA_INGESTION_POLL_INTERVAL", 5))
+# Keeps uploaded data in Postgres staging tables until its review is accepted instead of writing it to the graph right away
+DATA_STAGING = str_to_bool(os.environ.get("DATA_STAGING", "False"))
+# Number of rows that are committed together by large graph updates like accepting the data of a study
+GRAPH_UPDATE_BATCH_SIZE = int(os.environ.get("GRAPH_UPDATE_BATCH_SIZE", 10000))
+# Leaves graph_id, is_verified and the timestamps off knowledge and data relationships, they are derived from the start node
+GRAPH_COMPACT_RELATIONSHIPS = str_to_bool(os.environ.get("GRAPH_COMPACT_RELATIONSHIPS", "False"))
+# Leaves of categorical ontology nodes and answers of categorical items (e.g. radio) share one data node per graph and value
+GRAPH_INTERN_CATEGORICAL_VALUES = str_to_bool(os.environ.get("GRAPH_INTERN_CATEGORICAL_VALUES", "False"))
+# Adds the label G_<graph_id> to all nodes of a study graph, which per-study queries match on instead of graph_id
+GRAPH_STUDY_LABELS = str_to_bool(os.environ.get("GRAPH_STUDY_LABELS", "False"))
+# Data values longer than this many characters are stored in GRAPH_BLOB_DIRECTORY instead of the graph, 0 keeps all values in the graph
+GRAPH_BLOB_THRESHOLD = int(os.environ.get("GRAPH_BLOB_THRESHOLD", 0))
+GRAPH_BLOB_DIRECTORY = os.environ.get("GRAPH_BLOB_DIRECTORY", os.path.join(BASE_DIR, 'blobs'))
+
+# System stats
+# Seconds the public system stats and highlights are cached and refreshed in the background, 0 disables the cache
+SYSTEM_CACHE_TTL = int(os.environ.get("SYSTEM_CACHE_TTL", 300))
+# Number of highlighted studies that are cached, requests for more highlights are computed directly
+SYSTEM_HIGHLIGHTS_CACHE_SIZE = int(os.environ.get("SYSTEM_HIGHLIGHTS_CACHE_SIZE", 20))
+# The cache is shared by all backend processes, so an invalidation is seen by all of them. The default is the database cache
+# (created by manage.py createcachetable), another shared backend like Redis is configured with CACHE_BACKEND and CACHE_LOCATION.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "django_cache"),
+    }
+}
+
 
 
 
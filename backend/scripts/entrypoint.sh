@@ -17,10 +17,15 @@ echo "Neo4j has started."
 
 echo "Applying relational database migrations..."
 python manage.py migrate
+# The shared cache of the backend processes is the database cache by default (see settings.CACHES)
+python manage.py createcachetable
 
 echo "Applying graph database migrations..."
 python manage.py migrate_graph_database
 
+# Records the Postgres anchors of study graphs built before they existed, does nothing once all graphs are anchored.
+python manage.py anchor_study_graphs
+
 # Makes sure all constants like roles&scopes are created in the database.
 python manage.py load_constants
 python manage.py init_ontology
@@ -31,6 +36,13 @@ python manage.py collectstatic --no-input
 # echo "Compiling translations file..."
 # ./compilemessages.sh
 
+# Runs the queued data upload jobs, one worker process per container (see study.jobs)
+echo "Starting the data ingestion worker..."
+python manage.py run_ingestion_worker &
+
+# Keeps the public system stats cached for all backend processes (see api.system_stats)
+python manage.py run_system_cache_warmer &
+
 if [ "$DJANGO_DEBUG_MODE" = True ]
 then
     echo "Starting Django development server..."